@@ -1,33 +1,1131 @@
-import gradio as gr
 import string
-from collections import Counter
+from collections import Counter, namedtuple
 import re
+import os
 import json
-import pandas as pd
+import threading
 import numpy as np
+from time import perf_counter
 from datetime import datetime
-import os
-import tempfile
-from PIL import Image
-from doctr.io import DocumentFile
-from doctr.models import ocr_predictor
+from bisect import bisect_right
+from functools import cached_property
+from itertools import chain
+
+import metrics
+from documents import PageReader
+from metrics import instrument, timed, trace_request
+from ocr_cache import OcrCache, image_key
+from preprocess import PreprocessConfig, Preprocessor
+from records import FIELD_KEYS, FIELD_NAMES, MISSING_VALUES, PosterInfo, field_keys
+from writers import format_csv
+
+# The OCR predictor is created on first use by get_model(), and gradio,
+# torch and doctr are only imported where they are needed, so the
+# text extractors can be imported without loading the network.
+_model = None
+_model_lock = threading.Lock()
+
+# How the detection and recognition networks run on CPU: "eager" (the fp32
+# pretrained models as they are), "int8" (Linear and LSTM layers dynamically
+# quantized to int8) or "compile" (torch.compile). Set POSTER_OCR_MODE or
+# call configure_ocr_model().
+OCR_MODES = ('eager', 'int8', 'compile')
+OCR_MODE = os.environ.get('POSTER_OCR_MODE', 'eager')
+
+# Detection and recognition architectures. "balanced" is DocTR's default
+# pair; "fast" swaps in MobileNet backbones and "accurate" a ResNet-50
+# detector with the PARSeq transformer recognizer. Pick one with
+# POSTER_OCR_PROFILE. POSTER_DET_BATCH_SIZE and POSTER_RECO_BATCH_SIZE
+# override how many pages / word crops each network processes at once.
+OCR_PROFILES = {
+    'fast': {'det_arch': 'db_mobilenet_v3_large', 'reco_arch': 'crnn_mobilenet_v3_small'},
+    'balanced': {},
+    'accurate': {'det_arch': 'db_resnet50', 'reco_arch': 'parseq'},
+}
+OCR_PROFILE = os.environ.get('POSTER_OCR_PROFILE', 'balanced')
+OCR_DET_BATCH_SIZE = int(os.environ.get('POSTER_DET_BATCH_SIZE', 0)) or None
+OCR_RECO_BATCH_SIZE = int(os.environ.get('POSTER_RECO_BATCH_SIZE', 0)) or None
+
+
+def predictor_options(profile, det_batch_size=None, reco_batch_size=None):
+    """Keyword arguments for doctr's ocr_predictor"""
+    if profile not in OCR_PROFILES:
+        raise ValueError(f"Unknown OCR profile {profile!r}, expected one of {', '.join(OCR_PROFILES)}")
+    options = dict(OCR_PROFILES[profile])
+    if det_batch_size:
+        options['det_bs'] = det_batch_size
+    if reco_batch_size:
+        options['reco_bs'] = reco_batch_size
+    return options
+
+
+def optimize_predictor(predictor, mode):
+    """Replace the predictor's detection and recognition models for the given mode"""
+    if mode not in OCR_MODES:
+        raise ValueError(f"Unknown OCR mode {mode!r}, expected one of {', '.join(OCR_MODES)}")
+    if mode == 'eager':
+        return predictor
+    
+    import torch
+    for stage in (predictor.det_predictor, predictor.reco_predictor):
+        model = stage.model.eval()
+        if mode == 'int8':
+            # Convolutions are left in fp32; dynamic quantization only
+            # covers the dense and recurrent layers
+            stage.model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU}, dtype=torch.qint8
+            )
+        else:
+            stage.model = torch.compile(model)
+    return predictor
+
+
+def get_model():
+    """Return the shared DocTR OCR predictor, loading it on first call"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from doctr.models import ocr_predictor
+                options = predictor_options(OCR_PROFILE, OCR_DET_BATCH_SIZE, OCR_RECO_BATCH_SIZE)
+                _model = optimize_predictor(ocr_predictor(pretrained=True, **options), OCR_MODE)
+    return _model
+
+
+def configure_ocr_model(mode='eager', profile='balanced', det_batch_size=None, reco_batch_size=None):
+    """Switch the OCR inference mode and profile; the predictor is reloaded on next use"""
+    global _model, OCR_MODE, OCR_PROFILE, OCR_DET_BATCH_SIZE, OCR_RECO_BATCH_SIZE
+    if mode not in OCR_MODES:
+        raise ValueError(f"Unknown OCR mode {mode!r}, expected one of {', '.join(OCR_MODES)}")
+    predictor_options(profile)
+    with _model_lock:
+        OCR_MODE = mode
+        OCR_PROFILE = profile
+        OCR_DET_BATCH_SIZE = det_batch_size
+        OCR_RECO_BATCH_SIZE = reco_batch_size
+        _model = None
+
+
+# OCR results keyed on the decoded pixels. POSTER_OCR_CACHE_SIZE bounds the
+# in-memory LRU (0 disables it); POSTER_OCR_CACHE_PATH adds a SQLite file
+# that persists results across restarts and is shared with batch runs.
+OCR_CACHE_NAMESPACE = "doctr-pretrained"
+ocr_cache = OcrCache(
+    max_entries=int(os.environ.get('POSTER_OCR_CACHE_SIZE', 256)),
+    path=os.environ.get('POSTER_OCR_CACHE_PATH') or None,
+)
+
+
+def env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+# Preprocessing of decoded pages before OCR (see preprocess.py): set
+# POSTER_MAX_SIDE to downscale large photos, and POSTER_GRAYSCALE,
+# POSTER_NORMALIZE_CONTRAST, POSTER_CROP_BORDERS or POSTER_DESKEW to 1 to
+# enable those steps. Everything is off by default.
+preprocessor = Preprocessor(PreprocessConfig(
+    max_side=int(os.environ.get('POSTER_MAX_SIDE', 0)) or None,
+    grayscale=env_flag('POSTER_GRAYSCALE'),
+    normalize_contrast=env_flag('POSTER_NORMALIZE_CONTRAST'),
+    crop_borders=env_flag('POSTER_CROP_BORDERS'),
+    deskew=env_flag('POSTER_DESKEW'),
+))
+
+# Pages of a PDF or multi-page TIFF rendered and recognized per OCR forward
+# pass (see extract_document); only this many pages of pixels are in memory
+DOCUMENT_BATCH_SIZE = int(os.environ.get('POSTER_DOCUMENT_BATCH_SIZE', 4))
+
+# ---------------------------------------------------------------------------
+# Precompiled regex registry
+#
+# Every pattern used by the extractors is compiled once at import time and
+# shared, instead of being rebuilt from raw strings on every call and looked
+# up in the small `re` module cache.
+# ---------------------------------------------------------------------------
+
+WHITESPACE_RE = re.compile(r'\s+')
+DIGIT_RE = re.compile(r'\d')
+
+# Month and day names, including common abbreviations and misspellings
+MONTH_NAMES = r'(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)'
+DAY_NAMES = r'(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)'
+
+# Month name mappings for normalization
+MONTH_MAPPING = {
+    'jan': 'January', 'january': 'January',
+    'feb': 'February', 'february': 'February', 'feburary': 'February',  # Common misspelling
+    'mar': 'March', 'march': 'March',
+    'apr': 'April', 'april': 'April',
+    'may': 'May',
+    'jun': 'June', 'june': 'June',
+    'jul': 'July', 'july': 'July',
+    'aug': 'August', 'august': 'August',
+    'sep': 'September', 'september': 'September', 'sept': 'September',
+    'oct': 'October', 'october': 'October',
+    'nov': 'November', 'november': 'November',
+    'dec': 'December', 'december': 'December'
+}
+
+# Day name mappings
+DAY_MAPPING = {
+    'mon': 'Monday', 'monday': 'Monday',
+    'tue': 'Tuesday', 'tuesday': 'Tuesday', 'tues': 'Tuesday',
+    'wed': 'Wednesday', 'wednesday': 'Wednesday',
+    'thu': 'Thursday', 'thursday': 'Thursday', 'thur': 'Thursday', 'thurs': 'Thursday',
+    'fri': 'Friday', 'friday': 'Friday',
+    'sat': 'Saturday', 'saturday': 'Saturday',
+    'sun': 'Sunday', 'sunday': 'Sunday'
+}
+
+# Whole-word replacement pattern for every abbreviation in the mappings
+MONTH_ABBREV_PATTERNS = {
+    abbrev: re.compile(r'\b' + re.escape(abbrev) + r'\b', re.IGNORECASE)
+    for abbrev in MONTH_MAPPING
+}
+DAY_ABBREV_PATTERNS = {
+    abbrev: re.compile(r'\b' + re.escape(abbrev) + r'\b', re.IGNORECASE)
+    for abbrev in DAY_MAPPING
+}
+
+# --- Event name ------------------------------------------------------------
+
+# Common event title indicators
+EVENT_KEYWORDS = [
+    'conference', 'summit', 'workshop', 'seminar', 'symposium', 'expo',
+    'festival', 'concert', 'show', 'exhibition', 'fair', 'competition',
+    'championship', 'tournament', 'meetup', 'gathering', 'celebration',
+    'launch', 'presentation', 'webinar', 'bootcamp', 'hackathon',
+    'convention', 'forum', 'congress', 'colloquium', 'masterclass'
+]
+
+# Keywords used by the last-resort event name strategy
+FALLBACK_EVENT_KEYWORDS = [
+    'conference', 'summit', 'workshop', 'seminar', 'symposium', 'expo',
+    'festival', 'concert', 'show', 'exhibition', 'fair', 'competition',
+    'championship', 'tournament', 'meetup', 'gathering', 'celebration',
+    'launch', 'presentation', 'webinar', 'bootcamp', 'hackathon'
+]
+
+YEAR_RE = re.compile(r'\b20\d{2}\b')
+EDITION_RE = re.compile(r'\b(?:\d+(?:st|nd|rd|th)|first|second|third|annual)\b')
+
+# Common metadata patterns, combined into one alternation since any hit counts
+METADATA_RE = re.compile('|'.join('(?:%s)' % pattern for pattern in [
+    r'^\s*date\s*:',
+    r'^\s*time\s*:',
+    r'^\s*venue\s*:',
+    r'^\s*location\s*:',
+    r'^\s*contact\s*:',
+    r'^\s*phone\s*:',
+    r'^\s*email\s*:',
+    r'^\s*price\s*:',
+    r'^\s*fee\s*:',
+    r'^\s*register\s*:',
+    r'^\s*organised by',
+    r'^\s*organized by',
+    r'^\s*sponsored by',
+    r'^\s*presented by',
+    r'^\s*powered by',
+    r'^\s*in association with',
+    r'^\s*supported by',
+    r'www\.',
+    r'http[s]?://',
+    r'@\w+',  # Social media handles
+    r'^\s*follow us',
+    r'^\s*visit us',
+    r'^\s*call us',
+    r'^\s*whatsapp',
+    r'^\s*telegram',
+    r'^\s*facebook',
+    r'^\s*instagram',
+    r'^\s*twitter',
+    r'^\s*linkedin',
+    r'admission',
+    r'registration',
+    r'certificate',
+    r'refreshments',
+    r'lunch',
+    r'dinner',
+    r'breakfast',
+]))
+METADATA_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+METADATA_PHONE_RE = re.compile(r'(?:\+?\d[\d\s\-().]{7,}|\d{10,})')
+METADATA_ADDRESS_RE = re.compile(r'\b(?:street|road|avenue|lane|drive|plaza|building|floor)\b')
+
+# Very generic poster phrases
+GENERIC_PHRASES = [
+    'welcome', 'join us', 'dont miss', "don't miss", 'limited seats',
+    'hurry up', 'book now', 'register now', 'apply now', 'click here',
+    'for more information', 'terms and conditions', 'terms & conditions'
+]
+
+EVENT_TYPE_WORDS = r'(?:conference|workshop|seminar|symposium|summit|expo|festival|concert|show|exhibition|fair|competition|championship|tournament|meetup|gathering|celebration|launch|presentation|webinar|bootcamp|hackathon|convention|forum|congress|colloquium|masterclass)'
+
+# Each pattern comes with an optional linear prefilter. The lazy ".+?"
+# patterns run with DOTALL, so on text that lacks their keyword every start
+# position scans to the end of the text (quadratic); the prefilter skips
+# them unless a match is guaranteed from the first start position.
+EVENT_NAME_PATTERNS = [
+    (re.compile(pattern, re.MULTILINE | re.DOTALL), re.compile(prefilter, re.DOTALL) if prefilter else None)
+    for pattern, prefilter in [
+        # "Event Name: XYZ" or "Title: XYZ"
+        (r'(?i)(?:event\s*name|title|event\s*title|name\s*of\s*event)\s*[:\-–=]\s*(.+?)(?:\n|$)', None),
+        
+        # "Presenting XYZ" or "Announces XYZ"
+        (r'(?i)(?:presenting|announces?|invites?\s+you\s+to|proudly\s+presents?)\s+(.+?)(?:\s+(?:on|at|in)\s+\d|\n|$)', None),
+        
+        # "Join us for XYZ" or "Welcome to XYZ"
+        (r'(?i)(?:join\s+us\s+for|welcome\s+to|attend)\s+(.+?)(?:\s+(?:on|at|in)\s+\d|\n|$)', None),
+        
+        # "XYZ Conference/Workshop/etc."
+        (r'(?i)(.+?' + EVENT_TYPE_WORDS + r'(?:\s+20\d{2})?)', r'(?i).' + EVENT_TYPE_WORDS),
+        
+        # "Annual/1st/2nd XYZ"
+        (r'(?i)((?:annual|\d+(?:st|nd|rd|th)|first|second|third)\s+.+?)(?:\s+(?:on|at|in)\s+\d|\n|$)', None),
+        
+        # "XYZ 2024/2025" (event with year)
+        (r'(?i)(.+?\s+20\d{2})(?:\s|$)', r'.\s+20\d{2}(?:\s|$)'),
+    ]
+]
+
+# Common title prefixes removed from high-scoring lines
+TITLE_PREFIX_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(?i)^(?:the\s+)?(?:annual\s+)?\d+(?:st|nd|rd|th)\s+',
+    r'(?i)^(?:welcome\s+to\s+)?(?:the\s+)?',
+    r'(?i)^(?:join\s+us\s+for\s+)?(?:the\s+)?',
+    r'(?i)^(?:attend\s+)?(?:the\s+)?',
+]]
+TRAILING_YEAR_RE = re.compile(r'\s+20\d{2}$')
+NUMBERED_ITEM_RE = re.compile(r'^\d+\s*[.:]')
+NUMBERED_LINE_RE = re.compile(r'^\d+[.:]')
+
+# --- Date ------------------------------------------------------------------
+
+# Comprehensive date patterns (ordered by specificity), each with the token
+# kinds a match needs so patterns that cannot match are skipped
+DATE_PATTERNS = [(re.compile(pattern), frozenset(required)) for pattern, required in [
+    # Full date ranges: "January 18-19, 2025" or "18-19 January 2025"
+    (r'(?i)(?:date\s*:?\s*)?(\b' + MONTH_NAMES + r'\s+\d{1,2}(?:st|nd|rd|th)?\s*[-–]\s*\d{1,2}(?:st|nd|rd|th)?\s*,?\s*\d{4})\b', {'month', 'number'}),
+    
+    # Date ranges with month at end: "18-19 January 2025"
+    (r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)?\s*[-–]\s*\d{1,2}(?:st|nd|rd|th)?\s+' + MONTH_NAMES + r'\s+\d{4})\b', {'month', 'number'}),
+    
+    # Day name with date: "Saturday May 20th" or "SAT MAY20TH"
+    # (OCR can glue the day and month into one word, so only digits are required)
+    (r'(?i)(?:date\s*:?\s*)?(\b' + DAY_NAMES + r'\s*\.?\s*' + MONTH_NAMES + r'\s*\.?\s*\d{1,2}(?:st|nd|rd|th)?)\b', {'number'}),
+    
+    # Day name with numeric date: "THURSDAY 2/20"
+    (r'(?i)(?:date\s*:?\s*)?(\b' + DAY_NAMES + r'\s*\.?\s*\d{1,2}\s*[/\-]\s*\d{1,2})\b', {'day', 'number'}),
+    
+    # Standard formats with ordinals: "28th February 2025"
+    (r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)\s+' + MONTH_NAMES + r'\s+\d{4})\b', {'month', 'number'}),
+    
+    # Month Day, Year: "February 22-23, 2025"
+    (r'(?i)(?:date\s*:?\s*)?(\b' + MONTH_NAMES + r'\s+\d{1,2}(?:st|nd|rd|th)?\s*[-–]?\s*\d{0,2}(?:st|nd|rd|th)?\s*,?\s*\d{4})\b', {'month', 'number'}),
+    
+    # DD Month YYYY
+    (r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)?\s+' + MONTH_NAMES + r'\.?\s+\d{4})\b', {'month', 'number'}),
+    
+    # Numeric formats: DD/MM/YYYY, MM/DD/YYYY, DD-MM-YYYY
+    (r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}[./-]\d{1,2}[./-]\d{2,4})\b', {'number'}),
+    
+    # Year only in context: "2025"
+    (r'(?i)(?:date\s*:?\s*)?(\b(?:20)\d{2})\b', {'number'}),
+    
+    # Month and day without year: "May 20th", "20th May"
+    (r'(?i)(?:date\s*:?\s*)?(\b' + MONTH_NAMES + r'\s+\d{1,2}(?:st|nd|rd|th)?)\b', {'month', 'number'}),
+    (r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)?\s+' + MONTH_NAMES + r')\b', {'month', 'number'}),
+    
+    # Just month and year: "February 2025"
+    (r'(?i)(?:date\s*:?\s*)?(\b' + MONTH_NAMES + r'\s+\d{4})\b', {'month', 'number'}),
+]]
+
+# Isolated date components used when no full date pattern matches
+PARTIAL_MONTH_RE = re.compile(r'(?i)\b' + MONTH_NAMES + r'\b')
+PARTIAL_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+PARTIAL_DAY_RE = re.compile(r'\b(\d{1,2})(?:st|nd|rd|th)?\b')
+PARTIAL_DAY_NAME_RE = re.compile(r'(?i)\b' + DAY_NAMES + r'\b')
+
+LETTER_DIGIT_RE = re.compile(r'([a-zA-Z])(\d)')
+
+# --- Time ------------------------------------------------------------------
+
+# OCR clean-up applied before matching times, in order
+TIME_PREPROCESS_SUBS = [
+    # Replace common OCR misreadings
+    (re.compile(r'(?i)\b0(\d)\b'), r'\1'),  # "01.00" -> "1.00"
+    (re.compile(r'(?i)(\d)[oO](\d)'), r'\1:\2'),  # "1O:00" -> "1:00"
+    (re.compile(r'(?i)\.(?=\d{2}\s*(?:AM|PM|am|pm))'), ':'),  # "10.00 AM" -> "10:00 AM"
+    (re.compile(r'(?i)(\d)\s*[.,]\s*(\d{2})'), r'\1:\2'),  # "10.00" or "10, 00" -> "10:00"
+    
+    # Handle spacing issues around AM/PM
+    (re.compile(r'(?i)(\d)\s*(AM|PM)'), r'\1 \2'),  # "1PM" -> "1 PM"
+    (re.compile(r'(?i)(\d)\s*([AP])\s*[.,]?\s*M'), r'\1 \2M'),  # "1 P M" -> "1 PM"
+    
+    # Normalize dashes and time separators
+    (re.compile(r'[-–—−]+'), '-'),  # Normalize various dash types
+    (re.compile(r'\s*[-–—−]\s*'), ' - '),  # Normalize spacing around dashes
+    (re.compile(r'\s*=\s*'), ' - '),  # "10.00 AM = 01.00 PM" -> "10.00 AM - 01.00 PM"
+    (re.compile(r'\s*to\s*', re.IGNORECASE), ' - '),  # "to" -> "-"
+]
+
+# Comprehensive time patterns (ordered by complexity and specificity)
+TIME_PATTERNS = [re.compile(pattern) for pattern in [
+    # Complex time ranges with various separators
+    # "10:00 AM - 1:00 PM", "10.00 AM = 01.00 PM", "9AM-4PM"
+    r'(?i)(?:time\s*:?\s*)?(\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.)\s*[-–=]\s*\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
+    
+    # Time ranges without AM/PM on first time: "10:00 - 1:00 PM"
+    r'(?i)(?:time\s*:?\s*)?(\d{1,2}(?:[:.]\d{2})?\s*[-–=]\s*\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
+    
+    # Single time with AM/PM: "1PM", "10:00 AM", "10.00 AM"
+    r'(?i)(?:time\s*:?\s*)?(\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
+    
+    # Time ranges in 24-hour format: "10:00 - 13:00", "10.00-13.00"
+    r'(?i)(?:time\s*:?\s*)?(\d{1,2}[:.]\d{2}\s*[-–=]\s*\d{1,2}[:.]\d{2})',
+    
+    # Simple time ranges: "1-2PM", "9AM-4PM"
+    r'(?i)(?:time\s*:?\s*)?(\d{1,2}\s*(?:AM|PM|am|pm)?\s*[-–=]\s*\d{1,2}\s*(?:AM|PM|am|pm))',
+    
+    # Time with context words: "from 10AM to 2PM", "between 1PM and 3PM"
+    r'(?i)(?:from|between)\s+(\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm)?\s*(?:to|and|-)\s*\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm))',
+    
+    # Hours only with AM/PM: "1 PM", "10AM"
+    r'(?i)(?:time\s*:?\s*)?(\d{1,2}\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
+    
+    # 24-hour format: "13:00", "10.30"
+    r'(?i)(?:time\s*:?\s*)?((?:0?[0-9]|1[0-9]|2[0-3])[:.]\d{2})',
+    
+    # Partial times that might be cut off: just hours
+    r'(?i)(?:time\s*:?\s*)?(\d{1,2})(?=\s*(?:o\'clock|oclock|hours?))',
+]]
+
+# Fallback: Look for any time-like patterns in the text
+TIME_FALLBACK_PATTERNS = [re.compile(pattern) for pattern in [
+    # Any number followed by AM/PM
+    r'(?i)(\d{1,2}\s*(?:AM|PM|am|pm))',
+    # Any time-like number pattern
+    r'(\d{1,2}[:.]\d{2})',
+    # Just numbers that might be hours
+    r'(?i)(?:at|@)\s*(\d{1,2})',
+]]
+
+AMPM_RE = re.compile(r'(?i)\b([ap])\.?m\.?\b')
+TIME_LETTER_O_RE = re.compile(r'(?i)([0-9])[oO]([0-9])')
+TIME_DOT_AMPM_RE = re.compile(r'\.(\d{2}\s*(?:AM|PM))')
+SHORT_24H_RE = re.compile(r'^\d:\d{2}$')
+TIME_RANGE_SEP_RE = re.compile(r'\s*[-–=]\s*')
+
+# --- Venue -----------------------------------------------------------------
+
+VENUE_PREFIX_RE = re.compile(r'(?i)^(?:at|in|the|venue|location|place|address|held at|taking place at)[:.\s]*')
+TRAILING_PUNCTUATION_RE = re.compile(r'[,.:;!?]+$')
+NUMERIC_ONLY_RE = re.compile(r'^[\d\s\-/:.]+$')
+
+# Skip common false positives
+VENUE_FALSE_POSITIVES = [re.compile(pattern) for pattern in [
+    r'(?i)^(?:date|time|contact|phone|email|price|free|paid|registration)$',
+    r'(?i)^(?:am|pm|\d{1,2}:\d{2}|\d{4})$',
+    r'(?i)^(?:january|february|march|april|may|june|july|august|september|october|november|december)$'
+]]
+
+# Comprehensive venue extraction patterns (ordered by priority/specificity)
+VENUE_PATTERN_SOURCES = [
+    # Explicit venue/location labels
+    r'(?i)venue\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
+    r'(?i)location\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
+    r'(?i)place\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
+    r'(?i)address\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
+    r'(?i)where\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
+    r'(?i)held\s+at\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
+    r'(?i)taking\s+place\s+at\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
+    
+    # City, Country patterns (like your examples)
+    r'(?i)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # "Zurich, Switzerland"
+    
+    # "At" patterns with various venue types
+    r'(?i)at\s+([^|\n]*?(?:hall|center|centre|auditorium|stadium|arena|theater|theatre|hotel|conference|room|building|campus|university|college|school|library|museum|gallery|club|bar|restaurant|cafe|park|ground|complex|plaza|square|convention|expo|fairground|facility|institute|academy|church|temple|mosque|cathedral|chapel)(?:\s+[^|\n]*?)?)(?=\s*\||$|\n|[.,:;!?])',
+    
+    # Common venue types without "at"
+    r'(?i)\b([A-Z][^|\n]*?(?:hall|center|centre|auditorium|stadium|arena|theater|theatre|hotel|conference\s+(?:room|hall)|convention\s+(?:center|centre)|expo\s+(?:center|centre)|community\s+(?:center|centre|hall)|cultural\s+(?:center|centre)|sports\s+(?:center|centre|complex)|civic\s+(?:center|centre)|town\s+hall|city\s+hall))\b',
+    
+    # Educational institutions
+    r'(?i)\b([A-Z][^|\n]*?(?:university|college|school|institute|academy|campus)(?:\s+of\s+[^|\n]*?)?)\b',
+    
+    # Downtown/area patterns (like "DOWNTOWN PETERBOROUGH")
+    r'(?i)\b((?:downtown|uptown|central|north|south|east|west|upper|lower)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',
+    
+    # Hotel patterns
+    r'(?i)\b([A-Z][^|\n]*?hotel(?:\s+[^|\n]*?)?)\b',
+    
+    # Generic place names (proper nouns that could be venues)
+    r'(?i)\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}(?:\s+(?:Hall|Center|Centre|Building|Complex|Plaza|Square|Gardens?|Park)))\b',
+    
+    # Address-like patterns (numbers + street names)
+    r'(?i)\b(\d+\s+[A-Z][^|\n]*?(?:street|st|avenue|ave|road|rd|boulevard|blvd|lane|ln|drive|dr|way|place|pl|court|ct)(?:\s+[^|\n]*?)?)\b',
+    
+    # Venue names that end with common suffixes
+    r'(?i)\b([A-Z][^|\n]*?(?:centre|center|hall|arena|stadium|theater|theatre|auditorium|pavilion|complex|plaza|gardens?|park|ground|academy|institute|gallery|museum|library|club|lodge|manor|palace|castle|fort|tower|square))\b',
+    
+    # Room/Floor patterns
+    r'(?i)((?:room|floor|level|suite|block|wing|section)\s+[A-Z0-9][^|\n]*?)\b',
+    
+    # Generic proper noun patterns (2-4 words starting with capital letters)
+    # followed by a venue word on the same line. (Newlines are replaced with
+    # " | " before matching, so a ".*" lookahead would rescan the rest of the
+    # whole poster for every candidate.)
+    r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b(?=[^|\n]*(?:hall|center|centre|auditorium|stadium|arena|theater|theatre|hotel|conference|university|college|school|institute|academy|building|complex|plaza|square|park|ground|club|bar|restaurant|cafe|museum|gallery|library|church|temple|mosque|cathedral)|\s*[,.]|\s*$)',
+]
+
+
+def venue_pattern_confidence(pattern):
+    """Confidence given to venues found by a pattern, based on its type"""
+    # Higher confidence for explicit venue labels
+    if any(label in pattern for label in ['venue', 'location', 'address', 'place']):
+        return 1.0
+    # Medium confidence for "at" patterns and venue types
+    if 'at\\s+' in pattern or any(vtype in pattern for vtype in ['hall', 'center', 'hotel', 'university']):
+        return 0.8
+    # Lower confidence for generic patterns
+    return 0.6
+
+
+VENUE_PATTERNS = [
+    (re.compile(pattern), venue_pattern_confidence(pattern))
+    for pattern in VENUE_PATTERN_SOURCES
+]
+
+# Fallback: sequences of capitalized words (2-3 words) that might be venues
+VENUE_FALLBACK_RE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\b')
+MONTH_OR_DAY_NAME_RE = re.compile(r'(?i)^(?:january|february|march|april|may|june|july|august|september|october|november|december|monday|tuesday|wednesday|thursday|friday|saturday|sunday)$')
+
+# --- Profession ------------------------------------------------------------
+
+# Direct profession keywords and their mappings
+PROFESSION_KEYWORDS = {
+    'student': ['student', 'students', 'undergraduate', 'graduate', 'phd', 'doctoral', 'scholar', 'learner'],
+    'researcher': ['researcher', 'researchers', 'research', 'scientist', 'scientists', 'investigator', 'academic', 'academics'],
+    'professional': ['professional', 'professionals', 'practitioner', 'practitioners', 'expert', 'experts'],
+    'developer': ['developer', 'developers', 'programmer', 'programmers', 'coder', 'coders', 'engineer', 'engineers'],
+    'teacher': ['teacher', 'teachers', 'educator', 'educators', 'instructor', 'instructors', 'faculty'],
+    'doctor': ['doctor', 'doctors', 'physician', 'physicians', 'medical', 'healthcare'],
+    'artist': ['artist', 'artists', 'creative', 'creatives', 'designer', 'designers'],
+    'entrepreneur': ['entrepreneur', 'entrepreneurs', 'startup', 'business owner', 'founder'],
+    'manager': ['manager', 'managers', 'executive', 'executives', 'leader', 'leadership'],
+}
+
+# Extended patterns for profession extraction. Patterns flagged True start
+# with an unanchored lazy ".*?", which on its own rescans every line from
+# each position; they are run with iter_line_anchored instead of finditer.
+PROFESSION_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE | re.MULTILINE), line_anchored)
+    for pattern, line_anchored in [
+        # Direct targeting patterns
+        (r'(?i)(?:for|targeting|aimed\s+at|intended\s+for|designed\s+for)\s+(.*?(?:students?|researchers?|professionals?|developers?|engineers?|doctors?|teachers?|artists?|musicians?|entrepreneurs?|designers?|managers?|executives?|academics?|scholars?|practitioners?|scientists?))', False),
+        
+        # Invitation patterns
+        (r'(?i)(.*?(?:students?|researchers?|professionals?|developers?|engineers?|doctors?|teachers?|artists?|musicians?|entrepreneurs?|designers?|managers?|executives?|academics?|scholars?|practitioners?|scientists?))\s+(?:are\s+)?(?:invited|welcome|encouraged|requested)', True),
+        
+        # Call for participation patterns
+        (r'(?i)(?:call\s+for|seeking|inviting|looking\s+for)\s+(.*?(?:students?|researchers?|professionals?|paper\s+submission|abstract\s+submission|presentation))', False),
+        
+        # Paper submission patterns (indicating academic/research context)
+        (r'(?i)(paper\s+submission|abstract\s+submission|research\s+paper|manuscript\s+submission|call\s+for\s+papers)', False),
+        
+        # Registration patterns
+        (r'(?i)(?:registration\s+(?:open\s+)?for|register\s+(?:now\s+)?for)\s+(.*?(?:students?|researchers?|professionals?|participants?))', False),
+        
+        # General audience patterns
+        (r'(?i)(?:open\s+to\s+all|all\s+are\s+welcome|everyone\s+welcome)\s*(.*?)(?:\n|$|\.)', False),
+        
+        # Context-based patterns (conference, workshop, etc.)
+        (r'(?i)(?:conference|workshop|seminar|symposium|congress)\s+(?:for|on)\s+(.*?)(?:\n|$|\.)', False),
+        
+        # Membership or association patterns
+        (r'(?i)(?:member|members)\s+of\s+(.*?)(?:\n|$|\.)', False),
+        
+        # Experience level patterns
+        (r'(?i)(?:beginner|intermediate|advanced|expert)\s+(.*?)(?:\n|$|\.)', False),
+        
+        # Discipline-specific patterns
+        (r'(?i)(?:computer\s+science|engineering|medical|business|arts?|science)\s+(students?|professionals?|researchers?)', False),
+    ]
+]
+
+# Special handling for common academic contexts
+ACADEMIC_INDICATORS = [
+    'conference', 'symposium', 'workshop', 'seminar', 'congress',
+    'journal', 'publication', 'research', 'academic', 'university', 'college'
+]
+
+# --- Event type ------------------------------------------------------------
+
+ONLINE_RE = re.compile('|'.join([
+    r'online',
+    r'virtual',
+    r'zoom',
+    r'webinar',
+    r'web\s+conference',
+    r'livestream',
+    r'live\s+stream',
+    r'google\s+meet',
+    r'microsoft\s+teams',
+    r'webex',
+]), re.IGNORECASE)
+
+# --- Contact details -------------------------------------------------------
+
+PHONE_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(?i)(?:phone|mobile|contact|call|tel|telephone)\s*:?\s*(\+?\d[\d\s\-().]{7,})',
+    r'(?i)(?:phone|mobile|contact|call|tel|telephone)\s*:?\s*(\+?\d{1,4}[\s\-()]*\d{3,4}[\s\-()]*\d{3,4})',
+    r'(?<!\d)(\+?\d{10,12})(?!\d)',
+    r'(?<!\d)(\+?\d{1,4}[\s\-()]*\d{3,4}[\s\-()]*\d{3,4})(?!\d)',
+]]
+NON_PHONE_CHARS_RE = re.compile(r'[^\d+]')
+
+# Comprehensive email pattern that handles various formats
+EMAIL_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    # Standard email format
+    r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b',
+    
+    # Email with spaces (OCR artifacts): "user @ domain . com"
+    r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?\s*@\s*[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\s*\.\s*[a-zA-Z]{2,}\b',
+    
+    # Email patterns with context
+    r'(?i)(?:email|e-mail|contact|write\s+to|send\s+to|reach\s+(?:us\s+)?(?:at|out))\s*:?\s*([a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,})',
+    
+    # Multiple emails in a line separated by common delimiters
+    r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}(?:\s*[,;|&/]\s*[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,})*',
+]]
+EMAIL_SPLIT_RE = re.compile(r'[,;|&/\s]+')
+EMAIL_VALID_RE = re.compile(r'^[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}$')
+
+SOCIAL_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(?i)(?:facebook|fb)\.com/\S+',
+    r'(?i)(?:instagram|ig)\.com/\S+',
+    r'(?i)(?:twitter|x)\.com/\S+',
+    r'(?i)linkedin\.com/\S+',
+    r'(?i)youtube\.com/\S+',
+    r'(?i)@\w+',  # Common social media handle format
+]]
+
+# --- Price -----------------------------------------------------------------
+
+# Currency symbols and abbreviations, with the lowercase text each one needs
+# to be present before its price patterns are worth running
+CURRENCY_PATTERNS = {
+    'INR': [(r'₹', '₹'), (r'Rs\.?', 'rs'), (r'INR', 'inr'), (r'Rupees?', 'rupee')],
+    'USD': [(r'\$', '$'), (r'USD', 'usd'), (r'Dollars?', 'dollar')],
+    'EUR': [(r'€', '€'), (r'EUR', 'eur'), (r'Euros?', 'euro')],
+    'GBP': [(r'£', '£'), (r'GBP', 'gbp'), (r'Pounds?', 'pound')],
+    'JPY': [(r'¥', '¥'), (r'JPY', 'jpy'), (r'Yen', 'yen')],
+}
+
+# Comprehensive price patterns as (pattern, required currency text) pairs,
+# generated for each currency symbol
+PRICE_PATTERN_SOURCES = [
+    (pattern, literal)
+    for currency_symbols in CURRENCY_PATTERNS.values()
+    for symbol, literal in currency_symbols
+    for pattern in (
+        # Currency before amount: $100, Rs. 500
+        rf'(?i)(?:price|fee|cost|ticket|registration|entry)\s*:?\s*{symbol}\s*(\d+(?:[,.]\d+)?)',
+        rf'(?i){symbol}\s*(\d+(?:[,.]\d+)?)',
+        rf'(?i)(?:price|fee|cost|ticket|registration|entry)\s*:?\s*(\d+(?:[,.]\d+)?)\s*{symbol}',
+        rf'(?i)(\d+(?:[,.]\d+)?)\s*{symbol}',
+    )
+]
+
+# Additional patterns for price ranges and complex formats
+PRICE_PATTERN_SOURCES.extend((pattern, None) for pattern in [
+    # Price ranges: $100-200, Rs. 500 to 1000
+    r'(?i)(?:price|fee|cost|ticket|registration|entry)\s*:?\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*(\d+(?:[,.]\d+)?)\s*(?:to|-|–)\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*(\d+(?:[,.]\d+)?)',
+    
+    # Multiple price tiers: Student: $10, Professional: $50
+    r'(?i)((?:student|professional|academic|member|non-member|early\s+bird|regular)\s*:?\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*\d+(?:[,.]\d+)?)',
+    
+    # Price with context: Registration fee is $100
+    r'(?i)(?:registration|entry|participation|ticket)\s+(?:fee|cost|price)\s+(?:is|of)?\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*(\d+(?:[,.]\d+)?)',
+    
+    # Just numbers that might be prices (when near price-related words)
+    r'(?i)(?:price|fee|cost|ticket|registration|entry|pay|payment)\s*:?\s*(\d+(?:[,.]\d+)?)',
+])
+
+PRICE_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), literal)
+    for pattern, literal in PRICE_PATTERN_SOURCES
+]
+
+FREE_CONTEXT_RE = re.compile(r'(?i)\b(?:free|no\s+(?:charge|fee|cost)|complimentary|gratis)\b')
+FREE_EVENT_RE = re.compile(r'(?i)\b(?:free\s+(?:entry|admission|event|registration)|no\s+(?:charge|fee|cost)|entry\s+free|admission\s+free|complimentary|gratis)\b')
+NON_PRICE_CHARS_RE = re.compile(r'[^\d.,]')
+
+# Currency symbol for words found near a price
+CURRENCY_MAP = {
+    '₹': '₹', 'rs.': '₹', 'rs': '₹', 'inr': '₹', 'rupee': '₹',
+    '$': '$', 'usd': '$', 'dollar': '$',
+    '€': '€', 'eur': '€', 'euro': '€',
+    '£': '£', 'gbp': '£', 'pound': '£',
+    '¥': '¥', 'jpy': '¥', 'yen': '¥',
+}
+
+
+# ---------------------------------------------------------------------------
+# Single-pass lexer
+#
+# The OCR text is split once into words, numbers and symbols, and each token
+# is tagged (month, day, number, AM/PM, currency, separator). Extractors use
+# the token stream to skip pattern families that cannot match and to read
+# simple components such as partial dates without rescanning the text.
+# ---------------------------------------------------------------------------
+
+Token = namedtuple('Token', ['kind', 'value', 'start', 'end'])
+
+TOKEN_RE = re.compile(r'(?P<word>[^\W\d_]+)|(?P<number>\d+)|(?P<symbol>\S)')
+WORD_CHAR_RE = re.compile(r'\w')
+
+CURRENCY_WORDS = {
+    'rs', 'inr', 'rupee', 'rupees', 'usd', 'dollar', 'dollars',
+    'eur', 'euro', 'euros', 'gbp', 'pound', 'pounds', 'jpy', 'yen',
+}
+CURRENCY_SYMBOLS = set('₹$€£¥')
+SEPARATOR_SYMBOLS = set('-–—−/.:,=')
+ORDINAL_SUFFIXES = {'st', 'nd', 'rd', 'th'}
+
+
+class TokenStream:
+    """Tagged tokens of one OCR text, produced by a single lexer pass"""
+    
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        self.kinds = set()
+        self.digit_count = 0
+        
+        for match in TOKEN_RE.finditer(text):
+            value = match.group()
+            group = match.lastgroup
+            if group == 'word':
+                folded = value.casefold()
+                if folded in MONTH_MAPPING:
+                    kind = 'month'
+                elif folded in DAY_MAPPING:
+                    kind = 'day'
+                elif folded in ('am', 'pm'):
+                    kind = 'ampm'
+                elif folded in CURRENCY_WORDS:
+                    kind = 'currency'
+                else:
+                    kind = 'word'
+            elif group == 'number':
+                kind = 'number'
+                self.digit_count += len(value)
+            elif value in CURRENCY_SYMBOLS:
+                kind = 'currency'
+            elif value in SEPARATOR_SYMBOLS:
+                kind = 'separator'
+            else:
+                kind = 'symbol'
+            
+            self.kinds.add(kind)
+            self.tokens.append(Token(kind, value, match.start(), match.end()))
+    
+    def has(self, *kinds):
+        """Check that at least one token of every given kind is present"""
+        return all(kind in self.kinds for kind in kinds)
+    
+    def of_kind(self, kind):
+        """All tokens of one kind, in text order"""
+        return [token for token in self.tokens if token.kind == kind]
+    
+    def is_word_start(self, position):
+        """True if no word character directly precedes position"""
+        return position == 0 or not WORD_CHAR_RE.match(self.text, position - 1)
+    
+    def is_word_end(self, position):
+        """True if no word character sits at position"""
+        return position >= len(self.text) or not WORD_CHAR_RE.match(self.text, position)
+    
+    def is_whole_word(self, token):
+        """True if the token is delimited by word boundaries on both sides"""
+        return self.is_word_start(token.start) and self.is_word_end(token.end)
+
+
+def tokenize(text):
+    """Run the single-pass lexer over OCR text"""
+    return TokenStream(text)
+
+
+# ---------------------------------------------------------------------------
+# Keyword index
+#
+# The keyword lists the extractors scan for (event words, profession
+# categories, academic indicators, currency names) are compiled into one
+# automaton. A single pass over the lowercased text reports every keyword
+# occurrence, overlapping ones included, with the groups it belongs to, and
+# the extractors query those hits instead of rescanning the text per list.
+# ---------------------------------------------------------------------------
+
+# Currency words in CURRENCY_MAP priority order
+CURRENCY_PRIORITY = {key: rank for rank, key in enumerate(CURRENCY_MAP)}
+
+
+def trie_pattern(keywords):
+    """Regex source matching any of the keywords, nested by shared prefix.
+    
+    Each position is tried character by character down one trie branch
+    instead of against every keyword in turn; optional suffixes are greedy,
+    so the longest keyword wins.
+    """
+    root = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+    
+    return render(root)
+
+
+class KeywordIndex:
+    """Multi-keyword matcher over named keyword groups.
+    
+    All keywords are compiled into one trie-shaped regex inside a lookahead,
+    so a single scan finds the longest keyword starting at every position.
+    The shorter keywords starting there are exactly the keywords that are
+    prefixes of it, which are worked out once up front.
+    """
+    
+    def __init__(self, groups):
+        self.groups = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                self.groups.setdefault(keyword, []).append(group)
+        
+        self.prefixes = {
+            keyword: [other for other in self.groups if keyword.startswith(other)]
+            for keyword in self.groups
+        }
+        self.pattern = re.compile('(?=(' + trie_pattern(self.groups) + '))')
+    
+    def scan(self, text):
+        """All keyword hits in text (which should already be lowercased)"""
+        hits = []
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            for keyword in self.prefixes[match.group(1)]:
+                hits.append((start, keyword))
+        return KeywordHits(self, text, hits)
+
+
+class KeywordHits:
+    """Keyword occurrences found by one KeywordIndex scan, in text order"""
+    
+    def __init__(self, index, text, hits):
+        self.text = text
+        self.by_group = {}
+        for start, keyword in hits:
+            for group in index.groups[keyword]:
+                self.by_group.setdefault(group, []).append((start, start + len(keyword), keyword))
+    
+    def find(self, group, start=0, end=None, whole_word=False):
+        """(start, end, keyword) hits of one group lying within text[start:end]"""
+        if end is None:
+            end = len(self.text)
+        return [
+            hit for hit in self.by_group.get(group, ())
+            if hit[0] >= start and hit[1] <= end
+            and (not whole_word or self.is_whole_word(hit[0], hit[1]))
+        ]
+    
+    def has(self, group, whole_word=False):
+        return bool(self.find(group, whole_word=whole_word))
+    
+    def is_whole_word(self, start, end):
+        """True if text[start:end] is delimited by word boundaries on both sides"""
+        return ((start == 0 or not WORD_CHAR_RE.match(self.text, start - 1))
+                and (end >= len(self.text) or not WORD_CHAR_RE.match(self.text, end)))
+    
+    def line_numbers(self, group, line_starts):
+        """Indexes of the lines (given by their start offsets) containing a hit"""
+        return {bisect_right(line_starts, hit[0]) - 1 for hit in self.by_group.get(group, ())}
+
+
+def profession_group(category):
+    return ('profession', category.title())
+
+
+KEYWORD_INDEX = KeywordIndex({
+    'event': EVENT_KEYWORDS,
+    'fallback_event': FALLBACK_EVENT_KEYWORDS,
+    'academic': ACADEMIC_INDICATORS,
+    'submission': ['paper', 'abstract', 'submission'],
+    'currency': CURRENCY_MAP,
+    **{profession_group(category): keywords for category, keywords in PROFESSION_KEYWORDS.items()},
+})
+
+
+def scan_keywords(text):
+    """Run the keyword index over text"""
+    return KEYWORD_INDEX.scan(text.lower())
+
+
+# ---------------------------------------------------------------------------
+# Extractor guards
+#
+# Several patterns backtrack quadratically in the length of a line (lazy
+# "[^|\n]*?hall" style venue and profession phrases). Lines longer than
+# GUARD_MAX_LINE_CHARS are wrapped at whitespace before those patterns run,
+# which bounds the work per line. On top of that every extractor runs under
+# a time budget: once EXTRACTOR_BUDGET_MS is spent it stops trying further
+# patterns and returns the best result found so far.
+# ---------------------------------------------------------------------------
+
+EXTRACTOR_BUDGET_MS = float(os.environ.get('POSTER_EXTRACTOR_BUDGET_MS', 50))
+GUARD_MAX_LINE_CHARS = int(os.environ.get('POSTER_MAX_LINE_CHARS', 200))
+
+
+def configure_extractor_guard(budget_ms=50, max_line_chars=200):
+    """Set the per-extractor time budget and line wrap width (0/None disables)"""
+    global EXTRACTOR_BUDGET_MS, GUARD_MAX_LINE_CHARS
+    EXTRACTOR_BUDGET_MS = budget_ms
+    GUARD_MAX_LINE_CHARS = max_line_chars
+
+
+# Which extractions ran out of budget: extract_info resets ``exceeded`` for
+# the current thread and every Deadline that expires sets it
+_budget = threading.local()
+
+
+class Deadline:
+    """Time budget for one extractor call"""
+    
+    def __init__(self, stage, budget_ms=None):
+        if budget_ms is None:
+            budget_ms = EXTRACTOR_BUDGET_MS
+        self.stage = stage
+        self.expires = perf_counter() + budget_ms / 1000 if budget_ms else None
+        self.exceeded = False
+    
+    def expired(self):
+        """True once the budget is spent; counted once per call in the metrics"""
+        if self.exceeded:
+            return True
+        if self.expires is None or perf_counter() < self.expires:
+            return False
+        self.exceeded = True
+        _budget.exceeded = True
+        metrics.registry.increment('poster_budget_exceeded_total', self.stage)
+        return True
+
+
+def iter_chunked(pattern, text, deadline=None, chunk_chars=1000, separator='|'):
+    """Same matches as pattern.finditer(text) for patterns that never match separator.
+    
+    The text is searched a chunk of about chunk_chars at a time, each ending
+    just after a separator, and the deadline is checked between chunks: a
+    pattern without matches would otherwise scan the whole text in one call.
+    """
+    start = 0
+    while start < len(text):
+        if deadline is not None and deadline.expired():
+            return
+        end = text.find(separator, start + chunk_chars)
+        end = len(text) if end < 0 else end + 1
+        yield from pattern.finditer(text, start, end)
+        start = end
+
+
+def wrap_long_lines(text, max_chars=None):
+    """Break lines longer than max_chars at whitespace (or hard, if there is none)"""
+    if max_chars is None:
+        max_chars = GUARD_MAX_LINE_CHARS
+    lines = text.split('\n')
+    if not max_chars or max(map(len, lines)) <= max_chars:
+        return text
+    
+    wrapped = []
+    for line in lines:
+        while len(line) > max_chars:
+            cut = line.rfind(' ', 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip(' ')
+        wrapped.append(line)
+    return '\n'.join(wrapped)
+
+
+def iter_line_anchored(pattern, text, deadline=None):
+    """Same matches as pattern.finditer(text) for patterns starting with ".*?".
+    
+    Without DOTALL, if such a pattern fails at some position it fails at
+    every later position of the same line, so after a failed attempt the
+    scan jumps to the next line instead of retrying each character.
+    """
+    position = 0
+    while position <= len(text):
+        if deadline is not None and deadline.expired():
+            return
+        match = pattern.match(text, position)
+        if match and match.end() > position:
+            yield match
+            position = match.end()
+            continue
+        newline = text.find('\n', position)
+        if newline < 0:
+            return
+        position = newline + 1
+
+
+# ---------------------------------------------------------------------------
+# Word confidence
+#
+# DocTR gives every recognized word a confidence. Words below
+# MIN_WORD_CONFIDENCE (smudges, background texture, half-cut letters) are
+# blanked out of the text the free-text extractors search (venue, price,
+# profession and event name patterns), and lines whose mean confidence is
+# below it are not considered as event names, so OCR noise neither adds
+# candidates nor competes with the real text. Blanking keeps every offset
+# in place. Date, time and contact patterns still see every word: a digit
+# DocTR was unsure about is still the best reading there is.
+# ---------------------------------------------------------------------------
+
+MIN_WORD_CONFIDENCE = float(os.environ.get('POSTER_MIN_WORD_CONFIDENCE', 0.3))
+
+
+def configure_word_confidence(min_confidence=0.3):
+    """Set the OCR confidence below which words are ignored (0/None keeps every word)"""
+    global MIN_WORD_CONFIDENCE
+    MIN_WORD_CONFIDENCE = min_confidence
+
+
+class TextAnalysis:
+    """Per-document intermediate results shared by all field extractors.
+    
+    Every attribute is computed on first use and then reused, so the line
+    split, the lowercased text, the token stream, the keyword hits and the
+    venue are worked out once per poster no matter how many extractors need
+    them. When the text is the flattened text of an OcrDocument, the lines
+    and their offsets are taken from the document instead of re-splitting,
+    and low-confidence words are masked out of ``confident_text``.
+    """
+    
+    def __init__(self, text, document=None):
+        self.text = text
+        self.document = document if document is not None and document.text is text else None
+        self.metadata_flags = {}
+    
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+    
+    @cached_property
+    def document_lines(self):
+        """(line index, offset, stripped text) of the document's non-empty lines"""
+        document = self.document
+        lines = []
+        for index, offset in enumerate(document.line_offsets):
+            line = document.line_text(index).strip()
+            if line:
+                lines.append((index, offset, line))
+        return lines
+    
+    @cached_property
+    def lines(self):
+        """Non-empty, stripped text lines"""
+        if self.document is not None:
+            return [line for _, _, line in self.document_lines]
+        return [line.strip() for line in self.text.split('\n') if line.strip()]
+    
+    @cached_property
+    def confident_lines(self):
+        """self.lines without those whose mean OCR confidence is below MIN_WORD_CONFIDENCE"""
+        if self.document is None or not MIN_WORD_CONFIDENCE:
+            return self.lines
+        confidences = self.document.line_confidences
+        return [line for index, _, line in self.document_lines
+                if confidences[index] >= MIN_WORD_CONFIDENCE]
+    
+    @cached_property
+    def line_starts(self):
+        """Offset of each of self.lines in the lowercased text"""
+        if self.document is not None and len(self.lower) == len(self.text):
+            return [offset for _, offset, _ in self.document_lines]
+        starts = []
+        offset = 0
+        for line in self.lower.split('\n'):
+            if line.strip():
+                starts.append(offset)
+            offset += len(line) + 1
+        return starts
+    
+    @cached_property
+    def tokens(self):
+        return tokenize(self.text)
+    
+    @cached_property
+    def keyword_hits(self):
+        """Keyword index hits over the lowercased confident text (low-confidence words add none)"""
+        return KEYWORD_INDEX.scan(self.confident_lower)
+    
+    @cached_property
+    def confident_text(self):
+        """The text with words below MIN_WORD_CONFIDENCE blanked out (same length and offsets)"""
+        if self.document is None or not MIN_WORD_CONFIDENCE:
+            return self.text
+        return self.document.masked_text(MIN_WORD_CONFIDENCE)
+    
+    @cached_property
+    def confident_lower(self):
+        """self.confident_text lowercased"""
+        if self.confident_text is self.text:
+            return self.lower
+        return self.confident_text.lower()
+    
+    @cached_property
+    def guarded_text(self):
+        """The confident text with overly long lines wrapped, for backtracking-prone patterns"""
+        return wrap_long_lines(self.confident_text)
+    
+    @cached_property
+    def venue(self):
+        return _extract_venue(self.confident_text)
+    
+    def is_metadata(self, line):
+        """Memoized is_likely_metadata for lines of this document"""
+        flag = self.metadata_flags.get(line)
+        if flag is None:
+            flag = self.metadata_flags[line] = is_likely_metadata(line)
+        return flag
+
+
+def analyze_text(text, document=None):
+    """Create the shared analysis context for one OCR text"""
+    return TextAnalysis(text, document)
 
-# Initialize the OCR model
-model = ocr_predictor(pretrained=True)
 
 def clean_text(text):
     """Clean and normalize extracted text"""
     text = text.strip()
     # Replace multiple spaces with a single space
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     return text
 
 import re
 import string
 from collections import Counter
 
-def calculate_text_prominence(line, all_lines):
-    """Calculate how prominent a line is based on various factors"""
+def line_prominence(line, position, total_lines):
+    """Prominence score of one line at a 1-based position among total_lines"""
     score = 0
     
     # Length factor (moderate length is good for titles)
@@ -40,8 +1138,6 @@ def calculate_text_prominence(line, all_lines):
         score -= 2  # Too long, probably description
     
     # Position factor (earlier lines more likely to be titles)
-    position = all_lines.index(line) + 1
-    total_lines = len(all_lines)
     if position <= 3:
         score += 4
     elif position <= 5:
@@ -74,173 +1170,125 @@ def calculate_text_prominence(line, all_lines):
         score -= 2
     
     # Common event title indicators
-    event_keywords = [
-        'conference', 'summit', 'workshop', 'seminar', 'symposium', 'expo',
-        'festival', 'concert', 'show', 'exhibition', 'fair', 'competition',
-        'championship', 'tournament', 'meetup', 'gathering', 'celebration',
-        'launch', 'presentation', 'webinar', 'bootcamp', 'hackathon',
-        'convention', 'forum', 'congress', 'colloquium', 'masterclass'
-    ]
-    
     line_lower = line.lower()
-    for keyword in event_keywords:
+    for keyword in EVENT_KEYWORDS:
         if keyword in line_lower:
             score += 2
             break
     
     # Year patterns (events often have years in titles)
-    if re.search(r'\b20\d{2}\b', line):
+    if YEAR_RE.search(line):
         score += 1
     
     # Edition/version patterns
-    if re.search(r'\b(?:\d+(?:st|nd|rd|th)|first|second|third|annual)\b', line.lower()):
+    if EDITION_RE.search(line_lower):
         score += 2
     
     return score
 
+
+def calculate_text_prominence(lines, total_lines=None):
+    """Calculate how prominent each line is.
+    
+    Lines are scored by their position in ``lines``; ``total_lines`` is the
+    size of the document they were taken from (defaults to ``len(lines)``).
+    Returns a list of integer scores aligned with ``lines``.
+    """
+    if total_lines is None:
+        total_lines = len(lines)
+    return [line_prominence(line, position, total_lines) for position, line in enumerate(lines, 1)]
+
 def is_likely_metadata(line):
     """Check if a line is likely to be metadata rather than event title"""
     line_lower = line.lower().strip()
     
     # Common metadata patterns
-    metadata_patterns = [
-        r'^\s*date\s*:',
-        r'^\s*time\s*:',
-        r'^\s*venue\s*:',
-        r'^\s*location\s*:',
-        r'^\s*contact\s*:',
-        r'^\s*phone\s*:',
-        r'^\s*email\s*:',
-        r'^\s*price\s*:',
-        r'^\s*fee\s*:',
-        r'^\s*register\s*:',
-        r'^\s*organised by',
-        r'^\s*organized by',
-        r'^\s*sponsored by',
-        r'^\s*presented by',
-        r'^\s*powered by',
-        r'^\s*in association with',
-        r'^\s*supported by',
-        r'www\.',
-        r'http[s]?://',
-        r'@\w+',  # Social media handles
-        r'^\s*follow us',
-        r'^\s*visit us',
-        r'^\s*call us',
-        r'^\s*whatsapp',
-        r'^\s*telegram',
-        r'^\s*facebook',
-        r'^\s*instagram',
-        r'^\s*twitter',
-        r'^\s*linkedin',
-        r'admission',
-        r'registration',
-        r'certificate',
-        r'refreshments',
-        r'lunch',
-        r'dinner',
-        r'breakfast',
-    ]
-    
-    for pattern in metadata_patterns:
-        if re.search(pattern, line_lower):
-            return True
+    if METADATA_RE.search(line_lower):
+        return True
     
     # Check for email patterns
-    if re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', line):
+    if METADATA_EMAIL_RE.search(line):
         return True
     
     # Check for phone number patterns
-    if re.search(r'(?:\+?\d[\d\s\-().]{7,}|\d{10,})', line):
+    if METADATA_PHONE_RE.search(line):
         return True
     
     # Check for address-like patterns
-    if re.search(r'\b(?:street|road|avenue|lane|drive|plaza|building|floor)\b', line_lower):
+    if METADATA_ADDRESS_RE.search(line_lower):
         return True
     
     # Check for very generic phrases
-    generic_phrases = [
-        'welcome', 'join us', 'dont miss', "don't miss", 'limited seats',
-        'hurry up', 'book now', 'register now', 'apply now', 'click here',
-        'for more information', 'terms and conditions', 'terms & conditions'
-    ]
-    
-    for phrase in generic_phrases:
+    for phrase in GENERIC_PHRASES:
         if phrase in line_lower:
             return True
     
     return False
 
-def extract_event_name(text):
+@instrument()
+def extract_event_name(text, analysis=None):
     """
     Advanced event name extraction using multiple strategies and scoring
     """
     if not text or not text.strip():
         return "Not found"
     
+    if analysis is None:
+        analysis = analyze_text(text)
+    is_metadata = analysis.is_metadata
+    
     # Clean and split text into lines
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    lines = analysis.lines
     
     if not lines:
         return "Not found"
     
+    # Skip lines OCR was unsure about, unless that leaves nothing
+    candidate_lines = analysis.confident_lines or lines
+    
     # Remove obvious metadata lines
-    filtered_lines = [line for line in lines if not is_likely_metadata(line)]
+    filtered_lines = [line for line in candidate_lines if not is_metadata(line)]
     
     if not filtered_lines:
         # Fallback to original lines if all were filtered
-        filtered_lines = lines
-    
-    # Strategy 1: Look for explicit event name patterns
-    explicit_patterns = [
-        # "Event Name: XYZ" or "Title: XYZ"
-        r'(?i)(?:event\s*name|title|event\s*title|name\s*of\s*event)\s*[:\-–=]\s*(.+?)(?:\n|$)',
-        
-        # "Presenting XYZ" or "Announces XYZ"
-        r'(?i)(?:presenting|announces?|invites?\s+you\s+to|proudly\s+presents?)\s+(.+?)(?:\s+(?:on|at|in)\s+\d|\n|$)',
-        
-        # "Join us for XYZ" or "Welcome to XYZ"
-        r'(?i)(?:join\s+us\s+for|welcome\s+to|attend)\s+(.+?)(?:\s+(?:on|at|in)\s+\d|\n|$)',
-        
-        # "XYZ Conference/Workshop/etc."
-        r'(?i)(.+?(?:conference|workshop|seminar|symposium|summit|expo|festival|concert|show|exhibition|fair|competition|championship|tournament|meetup|gathering|celebration|launch|presentation|webinar|bootcamp|hackathon|convention|forum|congress|colloquium|masterclass)(?:\s+20\d{2})?)',
-        
-        # "Annual/1st/2nd XYZ"
-        r'(?i)((?:annual|\d+(?:st|nd|rd|th)|first|second|third)\s+.+?)(?:\s+(?:on|at|in)\s+\d|\n|$)',
-        
-        # "XYZ 2024/2025" (event with year)
-        r'(?i)(.+?\s+20\d{2})(?:\s|$)',
-    ]
-    
-    for pattern in explicit_patterns:
-        match = re.search(pattern, text, re.MULTILINE | re.DOTALL)
+        filtered_lines = candidate_lines
+    
+    # Strategy 1: Look for explicit event name patterns, until the time
+    # budget runs out (the remaining strategies only look at a few lines)
+    deadline = Deadline('extract_event_name')
+    guarded_text = analysis.guarded_text
+    for pattern, prefilter in EVENT_NAME_PATTERNS:
+        if deadline.expired():
+            break
+        if prefilter is not None and not prefilter.search(guarded_text):
+            continue
+        match = pattern.search(guarded_text)
         if match:
             candidate = match.group(1).strip()
             # Clean up the candidate
-            candidate = re.sub(r'\s+', ' ', candidate)
+            candidate = WHITESPACE_RE.sub(' ', candidate)
             candidate = candidate.strip('.,;:!?-–')
             
-            if 5 <= len(candidate) <= 100 and not is_likely_metadata(candidate):
+            if 5 <= len(candidate) <= 100 and not is_metadata(candidate):
                 return candidate
     
     # Strategy 2: Score-based line analysis
-    line_scores = []
-    for line in filtered_lines[:15]:  # Focus on first 15 lines
-        if len(line.strip()) < 3:  # Skip very short lines
-            continue
-            
-        score = calculate_text_prominence(line, filtered_lines)
-        line_scores.append((line, score))
-    
-    # Sort by score (highest first)
-    line_scores.sort(key=lambda x: x[1], reverse=True)
+    top_lines = filtered_lines[:15]  # Focus on first 15 lines
+    scores = calculate_text_prominence(top_lines, len(filtered_lines))
+    
+    # Sort by score (highest first, ties keep line order), skipping very short lines
+    line_scores = [
+        (top_lines[i], scores[i])
+        for i in sorted(range(len(top_lines)), key=lambda i: -scores[i])
+        if len(top_lines[i].strip()) >= 3
+    ]
     
     # Strategy 3: Look for title-like formatting patterns
     for line, score in line_scores:
         line_clean = line.strip()
         
         # Skip if it looks like metadata
-        if is_likely_metadata(line_clean):
+        if is_metadata(line_clean):
             continue
         
         # Check for good title characteristics
@@ -256,7 +1304,7 @@ def extract_event_name(text):
             sum(1 for word in words if word and word[0].isupper()) >= len(words) * 0.6):
             
             # Additional validation
-            if not re.search(r'^\d+\s*[.:]', line_clean):  # Not a numbered item
+            if not NUMBERED_ITEM_RE.search(line_clean):  # Not a numbered item
                 return line_clean
     
     # Strategy 4: Pattern-based extraction from high-scoring lines
@@ -265,44 +1313,30 @@ def extract_event_name(text):
         
         # Try to extract the main part of the line
         # Remove common prefixes/suffixes
-        prefixes_to_remove = [
-            r'(?i)^(?:the\s+)?(?:annual\s+)?\d+(?:st|nd|rd|th)\s+',
-            r'(?i)^(?:welcome\s+to\s+)?(?:the\s+)?',
-            r'(?i)^(?:join\s+us\s+for\s+)?(?:the\s+)?',
-            r'(?i)^(?:attend\s+)?(?:the\s+)?',
-        ]
-        
         cleaned_line = line_clean
-        for prefix_pattern in prefixes_to_remove:
-            cleaned_line = re.sub(prefix_pattern, '', cleaned_line).strip()
+        for prefix_pattern in TITLE_PREFIX_PATTERNS:
+            cleaned_line = prefix_pattern.sub('', cleaned_line).strip()
         
         # Remove trailing year if present
-        cleaned_line = re.sub(r'\s+20\d{2}$', '', cleaned_line).strip()
+        cleaned_line = TRAILING_YEAR_RE.sub('', cleaned_line).strip()
         
-        if 5 <= len(cleaned_line) <= 80 and not is_likely_metadata(cleaned_line):
+        if 5 <= len(cleaned_line) <= 80 and not is_metadata(cleaned_line):
             return cleaned_line
     
     # Strategy 5: Fallback to first substantial non-metadata line
     for line in filtered_lines[:10]:
         line_clean = line.strip()
         if (5 <= len(line_clean) <= 100 and 
-            not is_likely_metadata(line_clean) and
-            not re.match(r'^\d+[.:]', line_clean)):  # Not numbered
+            not is_metadata(line_clean) and
+            not NUMBERED_LINE_RE.match(line_clean)):  # Not numbered
             return line_clean
     
     # Strategy 6: Last resort - look for any line with event keywords
-    event_keywords = [
-        'conference', 'summit', 'workshop', 'seminar', 'symposium', 'expo',
-        'festival', 'concert', 'show', 'exhibition', 'fair', 'competition',
-        'championship', 'tournament', 'meetup', 'gathering', 'celebration',
-        'launch', 'presentation', 'webinar', 'bootcamp', 'hackathon'
-    ]
-    
-    for line in lines:
-        line_lower = line.lower()
-        for keyword in event_keywords:
-            if keyword in line_lower and 10 <= len(line) <= 100:
-                return line.strip()
+    keyword_lines = analysis.keyword_hits.line_numbers('fallback_event', analysis.line_starts)
+    for number in sorted(keyword_lines):
+        line = lines[number]
+        if 10 <= len(line) <= 100:
+            return line.strip()
     
     # Final fallback
     if filtered_lines:
@@ -313,7 +1347,71 @@ def extract_event_name(text):
     return "Not found"
 
 
-def clean_and_normalize_date(date_str, month_mapping, day_mapping):
+# Layout-aware event name tuning
+LAYOUT_TITLE_HEIGHT_RATIO = 0.85  # Lines this close to the tallest count as title-sized
+LAYOUT_MERGE_HEIGHT_TOLERANCE = 0.2  # Max relative height difference for multi-line titles
+LAYOUT_MAX_TITLE_LINES = 3
+
+
+@instrument()
+def extract_event_name_from_layout(document, analysis=None):
+    """
+    Pick the event name from OCR geometry: the largest text on the poster,
+    preferring the topmost region, merged with directly following lines of
+    the same size. Falls back to the text cascade when geometry doesn't help.
+    """
+    if analysis is None:
+        analysis = analyze_text(document.text, document)
+    
+    lines = document.lines
+    
+    # Title candidates: readable, confidently recognized, non-metadata,
+    # non-numbered lines
+    min_confidence = MIN_WORD_CONFIDENCE or 0.0
+    candidates = [
+        index for index, line in enumerate(lines)
+        if len(line.text) >= 3
+        and line.confidence >= min_confidence
+        and not analysis.is_metadata(line.text)
+        and not NUMBERED_LINE_RE.match(line.text)
+    ]
+    if not candidates:
+        return extract_event_name(document.text, analysis)
+    
+    heights = [line.box[3] - line.box[1] for line in lines]
+    tallest = max(heights[index] for index in candidates)
+    if tallest <= 0:
+        return extract_event_name(document.text, analysis)
+    
+    # Among title-sized lines, take the topmost (then leftmost) one
+    title_sized = [index for index in candidates if heights[index] >= LAYOUT_TITLE_HEIGHT_RATIO * tallest]
+    start = min(title_sized, key=lambda index: (lines[index].box[1], lines[index].box[0]))
+    
+    # Titles often wrap: merge following lines of the same block and size
+    candidate_set = set(candidates)
+    title_lines = [start]
+    for index in range(start + 1, len(lines)):
+        if len(title_lines) >= LAYOUT_MAX_TITLE_LINES:
+            break
+        line = lines[index]
+        previous = lines[title_lines[-1]]
+        if (index not in candidate_set
+                or line.block != previous.block
+                or abs(heights[index] - heights[start]) > LAYOUT_MERGE_HEIGHT_TOLERANCE * heights[start]
+                or line.box[1] - previous.box[3] > heights[start]):
+            break
+        title_lines.append(index)
+    
+    title = WHITESPACE_RE.sub(' ', ' '.join(lines[index].text for index in title_lines))
+    title = title.strip().strip('.,;:!?-–')
+    
+    if 3 <= len(title) <= 100:
+        return title
+    
+    return extract_event_name(document.text, analysis)
+
+
+def clean_and_normalize_date(date_str, month_mapping=MONTH_MAPPING, day_mapping=DAY_MAPPING):
     """Clean and normalize extracted date string"""
     if not date_str:
         return "Not found"
@@ -324,40 +1422,57 @@ def clean_and_normalize_date(date_str, month_mapping, day_mapping):
     # Replace common misspellings and normalize
     for abbrev, full in month_mapping.items():
         if abbrev in date_lower:
-            date_str = re.sub(r'\b' + re.escape(abbrev) + r'\b', full, date_str, flags=re.IGNORECASE)
+            date_str = abbrev_pattern(MONTH_ABBREV_PATTERNS, abbrev).sub(full, date_str)
             break
     
     # Replace day abbreviations
     for abbrev, full in day_mapping.items():
         if abbrev in date_lower:
-            date_str = re.sub(r'\b' + re.escape(abbrev) + r'\b', full, date_str, flags=re.IGNORECASE)
+            date_str = abbrev_pattern(DAY_ABBREV_PATTERNS, abbrev).sub(full, date_str)
             break
     
     # Clean up spacing and punctuation
-    date_str = re.sub(r'\s+', ' ', date_str)
-    date_str = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', date_str)  # Add space between letters and numbers
+    date_str = WHITESPACE_RE.sub(' ', date_str)
+    date_str = LETTER_DIGIT_RE.sub(r'\1 \2', date_str)  # Add space between letters and numbers
     date_str = date_str.replace('  ', ' ').strip()
     
     return date_str
 
-def extract_partial_dates(text, month_mapping, day_mapping):
+def abbrev_pattern(patterns, abbrev):
+    """Look up a precompiled whole-word pattern, compiling custom mapping keys on demand"""
+    pattern = patterns.get(abbrev)
+    if pattern is None:
+        pattern = re.compile(r'\b' + re.escape(abbrev) + r'\b', re.IGNORECASE)
+    return pattern
+
+def extract_partial_dates(text, month_mapping=MONTH_MAPPING, day_mapping=DAY_MAPPING, tokens=None):
     """Extract partial date information when full patterns don't match"""
-    
-    # Look for any month names
-    month_pattern = r'(?i)\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\b'
-    month_matches = re.findall(month_pattern, text)
-    
-    # Look for years
-    year_pattern = r'\b(20\d{2})\b'
-    year_matches = re.findall(year_pattern, text)
-    
-    # Look for day numbers (1-31)
-    day_pattern = r'\b(\d{1,2})(?:st|nd|rd|th)?\b'
-    day_matches = re.findall(day_pattern, text)
-    
-    # Look for day names
-    day_name_pattern = r'(?i)\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)\b'
-    day_name_matches = re.findall(day_name_pattern, text)
+    if tokens is None:
+        tokens = tokenize(text)
+    
+    # Look for any month names and day names (whole words only)
+    month_matches = [token.value for token in tokens.of_kind('month') if tokens.is_whole_word(token)]
+    day_name_matches = [token.value for token in tokens.of_kind('day') if tokens.is_whole_word(token)]
+    
+    # Look for years and day numbers (1-31, optionally with an ordinal suffix)
+    year_matches = []
+    day_matches = []
+    token_list = tokens.tokens
+    for index, token in enumerate(token_list):
+        if token.kind != 'number' or not tokens.is_word_start(token.start):
+            continue
+        
+        if len(token.value) == 4 and token.value.startswith('20') and tokens.is_word_end(token.end):
+            year_matches.append(token.value)
+        
+        if len(token.value) <= 2:
+            if tokens.is_word_end(token.end):
+                day_matches.append(token.value)
+            elif index + 1 < len(token_list):
+                suffix = token_list[index + 1]
+                if (suffix.start == token.end and suffix.value in ORDINAL_SUFFIXES
+                        and tokens.is_word_end(suffix.end)):
+                    day_matches.append(token.value)
     
     # Try to construct a date from available components
     result_parts = []
@@ -381,91 +1496,36 @@ def extract_partial_dates(text, month_mapping, day_mapping):
         result_parts.append(year_matches[0])
     
     if result_parts:
-        return ' '.join(result_parts)
-    
-    return "Not found"
-
-def extract_date(text):
-    """Extract date information using comprehensive regex patterns"""
-    
-    # Month name mappings for normalization
-    month_mapping = {
-        'jan': 'January', 'january': 'January',
-        'feb': 'February', 'february': 'February', 'feburary': 'February',  # Common misspelling
-        'mar': 'March', 'march': 'March',
-        'apr': 'April', 'april': 'April',
-        'may': 'May',
-        'jun': 'June', 'june': 'June',
-        'jul': 'July', 'july': 'July',
-        'aug': 'August', 'august': 'August',
-        'sep': 'September', 'september': 'September', 'sept': 'September',
-        'oct': 'October', 'october': 'October',
-        'nov': 'November', 'november': 'November',
-        'dec': 'December', 'december': 'December'
-    }
-    
-    # Day name mappings
-    day_mapping = {
-        'mon': 'Monday', 'monday': 'Monday',
-        'tue': 'Tuesday', 'tuesday': 'Tuesday', 'tues': 'Tuesday',
-        'wed': 'Wednesday', 'wednesday': 'Wednesday',
-        'thu': 'Thursday', 'thursday': 'Thursday', 'thur': 'Thursday', 'thurs': 'Thursday',
-        'fri': 'Friday', 'friday': 'Friday',
-        'sat': 'Saturday', 'saturday': 'Saturday',
-        'sun': 'Sunday', 'sunday': 'Sunday'
-    }
-    
-    # Comprehensive date patterns (ordered by specificity)
-    date_patterns = [
-        # Full date ranges: "January 18-19, 2025" or "18-19 January 2025"
-        r'(?i)(?:date\s*:?\s*)?(\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\s+\d{1,2}(?:st|nd|rd|th)?\s*[-–]\s*\d{1,2}(?:st|nd|rd|th)?\s*,?\s*\d{4})\b',
-        
-        # Date ranges with month at end: "18-19 January 2025"
-        r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)?\s*[-–]\s*\d{1,2}(?:st|nd|rd|th)?\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\s+\d{4})\b',
-        
-        # Day name with date: "Saturday May 20th" or "SAT MAY20TH"
-        r'(?i)(?:date\s*:?\s*)?(\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)\s*\.?\s*(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\s*\.?\s*\d{1,2}(?:st|nd|rd|th)?)\b',
-        
-        # Day name with numeric date: "THURSDAY 2/20"
-        r'(?i)(?:date\s*:?\s*)?(\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)\s*\.?\s*\d{1,2}\s*[/\-]\s*\d{1,2})\b',
-        
-        # Standard formats with ordinals: "28th February 2025"
-        r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\s+\d{4})\b',
-        
-        # Month Day, Year: "February 22-23, 2025"
-        r'(?i)(?:date\s*:?\s*)?(\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\s+\d{1,2}(?:st|nd|rd|th)?\s*[-–]?\s*\d{0,2}(?:st|nd|rd|th)?\s*,?\s*\d{4})\b',
-        
-        # DD Month YYYY
-        r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)?\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\.?\s+\d{4})\b',
-        
-        # Numeric formats: DD/MM/YYYY, MM/DD/YYYY, DD-MM-YYYY
-        r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}[./-]\d{1,2}[./-]\d{2,4})\b',
-        
-        # Year only in context: "2025"
-        r'(?i)(?:date\s*:?\s*)?(\b(?:20)\d{2})\b',
-        
-        # Month and day without year: "May 20th", "20th May"
-        r'(?i)(?:date\s*:?\s*)?(\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\s+\d{1,2}(?:st|nd|rd|th)?)\b',
-        r'(?i)(?:date\s*:?\s*)?(\b\d{1,2}(?:st|nd|rd|th)?\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary))\b',
-        
-        # Just month and year: "February 2025"
-        r'(?i)(?:date\s*:?\s*)?(\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|feburary)\s+\d{4})\b',
-    ]
+        return ' '.join(result_parts)
     
-    # Try each pattern
-    for pattern in date_patterns:
-        matches = re.finditer(pattern, text)
+    return "Not found"
+
+@instrument()
+def extract_date(text, analysis=None):
+    """Extract date information using comprehensive regex patterns"""
+    if analysis is None:
+        analysis = analyze_text(text)
+    tokens = analysis.tokens
+    deadline = Deadline('extract_date')
+    
+    # Try each pattern whose required tokens are present
+    for pattern, required in DATE_PATTERNS:
+        if deadline.expired():
+            break
+        if not required <= tokens.kinds:
+            continue
+        matches = pattern.finditer(text)
         for match in matches:
             date_str = match.group(1).strip()
             
             # Clean and normalize the extracted date
-            date_str = clean_and_normalize_date(date_str, month_mapping, day_mapping)
+            date_str = clean_and_normalize_date(date_str)
             
             if date_str and date_str != "Not found":
                 return date_str
     
     # If no pattern matches, look for isolated date components
-    return extract_partial_dates(text, month_mapping, day_mapping)
+    return extract_partial_dates(text, tokens=tokens)
 
 def post_process_time(time_str):
     """Post-process extracted time string to clean and normalize it"""
@@ -473,88 +1533,54 @@ def post_process_time(time_str):
         return "Not found"
     
     # Remove extra spaces
-    time_str = re.sub(r'\s+', ' ', time_str).strip()
+    time_str = WHITESPACE_RE.sub(' ', time_str).strip()
     
     # Normalize AM/PM formatting
-    time_str = re.sub(r'(?i)\b([ap])\.?m\.?\b', lambda m: m.group(1).upper() + 'M', time_str)
+    time_str = AMPM_RE.sub(lambda m: m.group(1).upper() + 'M', time_str)
     
     # Fix common OCR errors in time format
-    time_str = re.sub(r'(?i)([0-9])[oO]([0-9])', r'\1:\2', time_str)  # "1O:00" -> "1:00"
-    time_str = re.sub(r'\.(\d{2}\s*(?:AM|PM))', r':\1', time_str)  # "10.00 AM" -> "10:00 AM"
+    time_str = TIME_LETTER_O_RE.sub(r'\1:\2', time_str)  # "1O:00" -> "1:00"
+    time_str = TIME_DOT_AMPM_RE.sub(r':\1', time_str)  # "10.00 AM" -> "10:00 AM"
     
     # Add leading zero for single digit hours in 24-hour format
-    if re.match(r'^\d:\d{2}$', time_str):
+    if SHORT_24H_RE.match(time_str):
         time_str = '0' + time_str
     
     # Handle ranges and normalize separators
-    time_str = re.sub(r'\s*[-–=]\s*', ' - ', time_str)
+    time_str = TIME_RANGE_SEP_RE.sub(' - ', time_str)
     
     # Validate that we have a reasonable time format
-    if re.search(r'\d', time_str):  # At least contains a digit
+    if DIGIT_RE.search(time_str):  # At least contains a digit
         return time_str
     
     return "Not found"
 
-def extract_time(text):
+def preprocess_time_text(text):
+    """Normalize OCR artifacts in time expressions before matching"""
+    for pattern, replacement in TIME_PREPROCESS_SUBS:
+        text = pattern.sub(replacement, text)
+    return text
+
+@instrument()
+def extract_time(text, analysis=None):
     """Extract time information using comprehensive regex patterns - IMPROVED VERSION"""
+    if analysis is None:
+        analysis = analyze_text(text)
+    tokens = analysis.tokens
     
-    # Preprocess text to handle OCR artifacts and normalize formatting
-    def preprocess_time_text(text):
-        # Replace common OCR misreadings
-        text = re.sub(r'(?i)\b0(\d)\b', r'\1', text)  # "01.00" -> "1.00"
-        text = re.sub(r'(?i)(\d)[oO](\d)', r'\1:\2', text)  # "1O:00" -> "1:00"
-        text = re.sub(r'(?i)\.(?=\d{2}\s*(?:AM|PM|am|pm))', ':', text)  # "10.00 AM" -> "10:00 AM"
-        text = re.sub(r'(?i)(\d)\s*[.,]\s*(\d{2})', r'\1:\2', text)  # "10.00" or "10, 00" -> "10:00"
-        
-        # Handle spacing issues around AM/PM
-        text = re.sub(r'(?i)(\d)\s*(AM|PM)', r'\1 \2', text)  # "1PM" -> "1 PM"
-        text = re.sub(r'(?i)(\d)\s*([AP])\s*[.,]?\s*M', r'\1 \2M', text)  # "1 P M" -> "1 PM"
-        
-        # Normalize dashes and time separators
-        text = re.sub(r'[-–—−]+', '-', text)  # Normalize various dash types
-        text = re.sub(r'\s*[-–—−]\s*', ' - ', text)  # Normalize spacing around dashes
-        text = re.sub(r'\s*=\s*', ' - ', text)  # "10.00 AM = 01.00 PM" -> "10.00 AM - 01.00 PM"
-        text = re.sub(r'\s*to\s*', ' - ', text, flags=re.IGNORECASE)  # "to" -> "-"
-        
-        return text
+    # Every time pattern needs at least one number
+    if not tokens.has('number'):
+        return "Not found"
     
     # Preprocess the text
     processed_text = preprocess_time_text(text)
-    
-    # Comprehensive time patterns (ordered by complexity and specificity)
-    time_patterns = [
-        # Complex time ranges with various separators
-        # "10:00 AM - 1:00 PM", "10.00 AM = 01.00 PM", "9AM-4PM"
-        r'(?i)(?:time\s*:?\s*)?(\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.)\s*[-–=]\s*\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
-        
-        # Time ranges without AM/PM on first time: "10:00 - 1:00 PM"
-        r'(?i)(?:time\s*:?\s*)?(\d{1,2}(?:[:.]\d{2})?\s*[-–=]\s*\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
-        
-        # Single time with AM/PM: "1PM", "10:00 AM", "10.00 AM"
-        r'(?i)(?:time\s*:?\s*)?(\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
-        
-        # Time ranges in 24-hour format: "10:00 - 13:00", "10.00-13.00"
-        r'(?i)(?:time\s*:?\s*)?(\d{1,2}[:.]\d{2}\s*[-–=]\s*\d{1,2}[:.]\d{2})',
-        
-        # Simple time ranges: "1-2PM", "9AM-4PM"
-        r'(?i)(?:time\s*:?\s*)?(\d{1,2}\s*(?:AM|PM|am|pm)?\s*[-–=]\s*\d{1,2}\s*(?:AM|PM|am|pm))',
-        
-        # Time with context words: "from 10AM to 2PM", "between 1PM and 3PM"
-        r'(?i)(?:from|between)\s+(\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm)?\s*(?:to|and|-)\s*\d{1,2}(?:[:.]\d{2})?\s*(?:AM|PM|am|pm))',
-        
-        # Hours only with AM/PM: "1 PM", "10AM"
-        r'(?i)(?:time\s*:?\s*)?(\d{1,2}\s*(?:AM|PM|am|pm|a\.m\.|p\.m\.))',
-        
-        # 24-hour format: "13:00", "10.30"
-        r'(?i)(?:time\s*:?\s*)?((?:0?[0-9]|1[0-9]|2[0-3])[:.]\d{2})',
-        
-        # Partial times that might be cut off: just hours
-        r'(?i)(?:time\s*:?\s*)?(\d{1,2})(?=\s*(?:o\'clock|oclock|hours?))',
-    ]
+    deadline = Deadline('extract_time')
     
     # Try each pattern and return the first match
-    for pattern in time_patterns:
-        matches = re.finditer(pattern, processed_text)
+    for pattern in TIME_PATTERNS:
+        if deadline.expired():
+            return "Not found"
+        matches = pattern.finditer(processed_text)
         for match in matches:
             time_str = match.group(1).strip()
             
@@ -565,17 +1591,10 @@ def extract_time(text):
                 return time_str
     
     # Fallback: Look for any time-like patterns in the text
-    fallback_patterns = [
-        # Any number followed by AM/PM
-        r'(?i)(\d{1,2}\s*(?:AM|PM|am|pm))',
-        # Any time-like number pattern
-        r'(\d{1,2}[:.]\d{2})',
-        # Just numbers that might be hours
-        r'(?i)(?:at|@)\s*(\d{1,2})',
-    ]
-    
-    for pattern in fallback_patterns:
-        match = re.search(pattern, processed_text)
+    for pattern in TIME_FALLBACK_PATTERNS:
+        if deadline.expired():
+            break
+        match = pattern.search(processed_text)
         if match:
             time_str = match.group(1).strip()
             time_str = post_process_time(time_str)
@@ -584,122 +1603,74 @@ def extract_time(text):
     
     return "Not found"
     
-def extract_venue(text):
-    """Extract venue information using comprehensive regex patterns - IMPROVED VERSION"""
-    
-    def clean_venue_text(venue_text):
-        """Clean and validate extracted venue text"""
-        if not venue_text:
-            return None
-            
-        venue_text = venue_text.strip()
+def clean_venue_text(venue_text):
+    """Clean and validate extracted venue text"""
+    if not venue_text:
+        return None
         
-        # Remove common prefixes that might be captured
-        venue_text = re.sub(r'^(?i)(?:at|in|the|venue|location|place|address|held at|taking place at)[:.\s]*', '', venue_text)
+    venue_text = venue_text.strip()
+    
+    # Remove common prefixes that might be captured
+    venue_text = VENUE_PREFIX_RE.sub('', venue_text)
+    
+    # Remove trailing punctuation and clean up
+    venue_text = TRAILING_PUNCTUATION_RE.sub('', venue_text)
+    venue_text = WHITESPACE_RE.sub(' ', venue_text).strip()
+    
+    # Skip if it's too short (likely not a venue) or contains mostly numbers/dates
+    if len(venue_text) < 3:
+        return None
         
-        # Remove trailing punctuation and clean up
-        venue_text = re.sub(r'[,.:;!?]+$', '', venue_text)
-        venue_text = re.sub(r'\s+', ' ', venue_text).strip()
+    # Skip if it looks like a date, time, or phone number
+    if NUMERIC_ONLY_RE.match(venue_text):
+        return None
         
-        # Skip if it's too short (likely not a venue) or contains mostly numbers/dates
-        if len(venue_text) < 3:
-            return None
-            
-        # Skip if it looks like a date, time, or phone number
-        if re.match(r'^[\d\s\-/:.]+$', venue_text):
+    # Skip common false positives
+    for pattern in VENUE_FALSE_POSITIVES:
+        if pattern.match(venue_text):
             return None
-            
-        # Skip common false positives
-        false_positives = [
-            r'(?i)^(?:date|time|contact|phone|email|price|free|paid|registration)$',
-            r'(?i)^(?:am|pm|\d{1,2}:\d{2}|\d{4})$',
-            r'(?i)^(?:january|february|march|april|may|june|july|august|september|october|november|december)$'
-        ]
-        
-        for pattern in false_positives:
-            if re.match(pattern, venue_text):
-                return None
-        
-        # Limit length to avoid capturing too much text
-        if len(venue_text) > 150:
-            # Try to find a reasonable breaking point
-            words = venue_text.split()
-            if len(words) > 15:
-                venue_text = ' '.join(words[:15]) + '...'
-        
-        return venue_text
-    
-    # Preprocess text to handle common OCR issues
-    processed_text = text.replace('\n', ' | ')  # Replace newlines with separators for better parsing
-    
-    # Comprehensive venue extraction patterns (ordered by priority/specificity)
-    venue_patterns = [
-        # Explicit venue/location labels
-        r'(?i)venue\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
-        r'(?i)location\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
-        r'(?i)place\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
-        r'(?i)address\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
-        r'(?i)where\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
-        r'(?i)held\s+at\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
-        r'(?i)taking\s+place\s+at\s*[:.]?\s*([^|\n]{3,80})(?=\s*\||$|\n)',
-        
-        # City, Country patterns (like your examples)
-        r'(?i)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # "Zurich, Switzerland"
-        
-        # "At" patterns with various venue types
-        r'(?i)at\s+([^|\n]*?(?:hall|center|centre|auditorium|stadium|arena|theater|theatre|hotel|conference|room|building|campus|university|college|school|library|museum|gallery|club|bar|restaurant|cafe|park|ground|complex|plaza|square|convention|expo|fairground|facility|institute|academy|church|temple|mosque|cathedral|chapel)(?:\s+[^|\n]*?)?)(?=\s*\||$|\n|[.,:;!?])',
-        
-        # Common venue types without "at"
-        r'(?i)\b([A-Z][^|\n]*?(?:hall|center|centre|auditorium|stadium|arena|theater|theatre|hotel|conference\s+(?:room|hall)|convention\s+(?:center|centre)|expo\s+(?:center|centre)|community\s+(?:center|centre|hall)|cultural\s+(?:center|centre)|sports\s+(?:center|centre|complex)|civic\s+(?:center|centre)|town\s+hall|city\s+hall))\b',
-        
-        # Educational institutions
-        r'(?i)\b([A-Z][^|\n]*?(?:university|college|school|institute|academy|campus)(?:\s+of\s+[^|\n]*?)?)\b',
-        
-        # Downtown/area patterns (like "DOWNTOWN PETERBOROUGH")
-        r'(?i)\b((?:downtown|uptown|central|north|south|east|west|upper|lower)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',
-        
-        # Hotel patterns
-        r'(?i)\b([A-Z][^|\n]*?hotel(?:\s+[^|\n]*?)?)\b',
-        
-        # Generic place names (proper nouns that could be venues)
-        r'(?i)\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3}(?:\s+(?:Hall|Center|Centre|Building|Complex|Plaza|Square|Gardens?|Park)))\b',
-        
-        # Address-like patterns (numbers + street names)
-        r'(?i)\b(\d+\s+[A-Z][^|\n]*?(?:street|st|avenue|ave|road|rd|boulevard|blvd|lane|ln|drive|dr|way|place|pl|court|ct)(?:\s+[^|\n]*?)?)\b',
-        
-        # Venue names that end with common suffixes
-        r'(?i)\b([A-Z][^|\n]*?(?:centre|center|hall|arena|stadium|theater|theatre|auditorium|pavilion|complex|plaza|gardens?|park|ground|academy|institute|gallery|museum|library|club|lodge|manor|palace|castle|fort|tower|square))\b',
-        
-        # Room/Floor patterns
-        r'(?i)((?:room|floor|level|suite|block|wing|section)\s+[A-Z0-9][^|\n]*?)\b',
-        
-        # Generic proper noun patterns (2-4 words starting with capital letters)
-        r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b(?=.*(?:hall|center|centre|auditorium|stadium|arena|theater|theatre|hotel|conference|university|college|school|institute|academy|building|complex|plaza|square|park|ground|club|bar|restaurant|cafe|museum|gallery|library|church|temple|mosque|cathedral)|\s*[,.]|\s*$)',
-    ]
     
-    # Try each pattern and collect potential venues
+    # Limit length to avoid capturing too much text
+    if len(venue_text) > 150:
+        # Try to find a reasonable breaking point
+        words = venue_text.split()
+        if len(words) > 15:
+            venue_text = ' '.join(words[:15]) + '...'
+    
+    return venue_text
+
+@instrument()
+def extract_venue(text, analysis=None):
+    """Extract venue information using comprehensive regex patterns - IMPROVED VERSION"""
+    # Reuse the venue if another extractor already computed it for this text
+    if analysis is not None:
+        return analysis.venue
+    return _extract_venue(text)
+
+
+def _extract_venue(text):
+    """extract_venue without the timing, for TextAnalysis.venue"""
+    # Preprocess text to handle common OCR issues; wrapping long lines first
+    # bounds the backtracking of the lazy "[^|\n]*?" patterns
+    processed_text = wrap_long_lines(text).replace('\n', ' | ')  # Replace newlines with separators for better parsing
+    deadline = Deadline('extract_venue')
+    
+    # Try each pattern and collect potential venues, keeping what was found
+    # so far if the time budget runs out
     potential_venues = []
     
-    for pattern in venue_patterns:
-        matches = re.finditer(pattern, processed_text)
-        for match in matches:
+    for pattern, confidence in VENUE_PATTERNS:
+        if deadline.expired():
+            break
+        # No venue pattern matches across a " | " line separator
+        for match in iter_chunked(pattern, processed_text, deadline):
+            if deadline.expired():
+                break
             venue_candidate = match.group(1).strip()
             cleaned_venue = clean_venue_text(venue_candidate)
             
             if cleaned_venue and len(cleaned_venue) > 2:
-                # Add confidence scoring based on pattern type
-                confidence = 1.0
-                
-                # Higher confidence for explicit venue labels
-                if any(label in pattern for label in ['venue', 'location', 'address', 'place']):
-                    confidence = 1.0
-                # Medium confidence for "at" patterns and venue types
-                elif 'at\\s+' in pattern or any(vtype in pattern for vtype in ['hall', 'center', 'hotel', 'university']):
-                    confidence = 0.8
-                # Lower confidence for generic patterns
-                else:
-                    confidence = 0.6
-                
+                # Confidence is precomputed from the pattern type
                 potential_venues.append((cleaned_venue, confidence))
     
     # Remove duplicates and sort by confidence
@@ -714,78 +1685,45 @@ def extract_venue(text):
         best_venue = max(unique_venues.values(), key=lambda x: x[1])
         return best_venue[0]
     
+    if deadline.expired():
+        return "Not found"
+    
     # Fallback: Look for any proper nouns that might be venues
     # Look for sequences of capitalized words (2-4 words)
-    fallback_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\b'
-    fallback_matches = re.findall(fallback_pattern, text)
+    fallback_matches = VENUE_FALLBACK_RE.findall(text)
     
     for match in fallback_matches:
+        if deadline.expired():
+            break
         cleaned = clean_venue_text(match)
         if cleaned and len(cleaned) > 5:  # Slightly longer minimum for fallback
             # Additional filtering for fallback matches
-            if not re.search(r'(?i)^(?:january|february|march|april|may|june|july|august|september|october|november|december|monday|tuesday|wednesday|thursday|friday|saturday|sunday)$', cleaned):
+            if not MONTH_OR_DAY_NAME_RE.search(cleaned):
                 return cleaned
     
     return "Not found"
 
-def extract_profession(text):
-    """Extract profession or target audience information with comprehensive patterns"""
-    
-    # Normalize text for better matching
-    text_lower = text.lower()
-    
-    # Direct profession keywords and their mappings
-    profession_keywords = {
-        'student': ['student', 'students', 'undergraduate', 'graduate', 'phd', 'doctoral', 'scholar', 'learner'],
-        'researcher': ['researcher', 'researchers', 'research', 'scientist', 'scientists', 'investigator', 'academic', 'academics'],
-        'professional': ['professional', 'professionals', 'practitioner', 'practitioners', 'expert', 'experts'],
-        'developer': ['developer', 'developers', 'programmer', 'programmers', 'coder', 'coders', 'engineer', 'engineers'],
-        'teacher': ['teacher', 'teachers', 'educator', 'educators', 'instructor', 'instructors', 'faculty'],
-        'doctor': ['doctor', 'doctors', 'physician', 'physicians', 'medical', 'healthcare'],
-        'artist': ['artist', 'artists', 'creative', 'creatives', 'designer', 'designers'],
-        'entrepreneur': ['entrepreneur', 'entrepreneurs', 'startup', 'business owner', 'founder'],
-        'manager': ['manager', 'managers', 'executive', 'executives', 'leader', 'leadership'],
-    }
-    
-    # Extended patterns for profession extraction
-    profession_patterns = [
-        # Direct targeting patterns
-        r'(?i)(?:for|targeting|aimed\s+at|intended\s+for|designed\s+for)\s+(.*?(?:students?|researchers?|professionals?|developers?|engineers?|doctors?|teachers?|artists?|musicians?|entrepreneurs?|designers?|managers?|executives?|academics?|scholars?|practitioners?|scientists?))',
-        
-        # Invitation patterns
-        r'(?i)(.*?(?:students?|researchers?|professionals?|developers?|engineers?|doctors?|teachers?|artists?|musicians?|entrepreneurs?|designers?|managers?|executives?|academics?|scholars?|practitioners?|scientists?))\s+(?:are\s+)?(?:invited|welcome|encouraged|requested)',
-        
-        # Call for participation patterns
-        r'(?i)(?:call\s+for|seeking|inviting|looking\s+for)\s+(.*?(?:students?|researchers?|professionals?|paper\s+submission|abstract\s+submission|presentation))',
-        
-        # Paper submission patterns (indicating academic/research context)
-        r'(?i)(paper\s+submission|abstract\s+submission|research\s+paper|manuscript\s+submission|call\s+for\s+papers)',
-        
-        # Registration patterns
-        r'(?i)(?:registration\s+(?:open\s+)?for|register\s+(?:now\s+)?for)\s+(.*?(?:students?|researchers?|professionals?|participants?))',
-        
-        # General audience patterns
-        r'(?i)(?:open\s+to\s+all|all\s+are\s+welcome|everyone\s+welcome)\s*(.*?)(?:\n|$|\.)',
-        
-        # Context-based patterns (conference, workshop, etc.)
-        r'(?i)(?:conference|workshop|seminar|symposium|congress)\s+(?:for|on)\s+(.*?)(?:\n|$|\.)',
-        
-        # Membership or association patterns
-        r'(?i)(?:member|members)\s+of\s+(.*?)(?:\n|$|\.)',
-        
-        # Experience level patterns
-        r'(?i)(?:beginner|intermediate|advanced|expert)\s+(.*?)(?:\n|$|\.)',
-        
-        # Discipline-specific patterns
-        r'(?i)(?:computer\s+science|engineering|medical|business|arts?|science)\s+(students?|professionals?|researchers?)',
-    ]
+@instrument('extract_profession')
+def find_professions(text, analysis=None):
+    """Sorted list of the professions or target audiences a poster addresses"""
+    if analysis is None:
+        analysis = analyze_text(text)
     
     found_professions = set()
+    deadline = Deadline('extract_profession')
     
-    # Try each pattern
-    for pattern in profession_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
+    # Try each pattern on the wrapped text, keeping what was found so far if
+    # the time budget runs out
+    for pattern, line_anchored in PROFESSION_PATTERNS:
+        if deadline.expired():
+            break
+        if line_anchored:
+            matches = iter_line_anchored(pattern, analysis.guarded_text, deadline)
+        else:
+            matches = pattern.finditer(analysis.guarded_text)
         for match in matches:
+            if deadline.expired():
+                break
             matched_text = match.group(1).strip() if match.lastindex and match.lastindex >= 1 else match.group(0).strip()
             
             # Handle paper submission case specifically
@@ -799,27 +1737,21 @@ def extract_profession(text):
                 matched_text = ' '.join(matched_text.split()[:10])
             
             # Map to standard profession categories
-            mapped_profession = map_to_standard_profession(matched_text, profession_keywords)
+            mapped_profession = map_to_standard_profession(matched_text)
             if mapped_profession:
                 found_professions.add(mapped_profession)
             else:
                 found_professions.add(matched_text)
     
-    # Look for individual keywords in the entire text
-    for category, keywords in profession_keywords.items():
-        for keyword in keywords:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower):
-                found_professions.add(category.title())
+    # Look for individual keywords (whole words) in the entire text
+    keyword_hits = analysis.keyword_hits
+    for category in PROFESSION_KEYWORDS:
+        if keyword_hits.has(profession_group(category), whole_word=True):
+            found_professions.add(category.title())
     
     # Special handling for common academic contexts
-    academic_indicators = [
-        'conference', 'symposium', 'workshop', 'seminar', 'congress', 
-        'journal', 'publication', 'research', 'academic', 'university', 'college'
-    ]
-    
-    if any(indicator in text_lower for indicator in academic_indicators):
-        if 'paper' in text_lower or 'abstract' in text_lower or 'submission' in text_lower:
-            found_professions.add('Students/Researchers')
+    if keyword_hits.has('academic') and keyword_hits.has('submission'):
+        found_professions.add('Students/Researchers')
     
     # Remove duplicates and format result
     if found_professions:
@@ -827,16 +1759,29 @@ def extract_profession(text):
         specific_terms = found_professions - {'professional', 'participants', 'everyone'}
         if specific_terms:
             found_professions = specific_terms
-        
-        return ', '.join(sorted(found_professions))
+    
+    return sorted(found_professions)
+
+
+def extract_profession(text, analysis=None):
+    """Extract profession or target audience information with comprehensive patterns"""
+    professions = find_professions(text, analysis)
+    if professions:
+        return ', '.join(professions)
     
     return "Not specified"
 
 
-def map_to_standard_profession(text, profession_keywords):
+def map_to_standard_profession(text, profession_keywords=PROFESSION_KEYWORDS):
     """Map extracted text to standard profession categories"""
-    text_lower = text.lower()
+    if profession_keywords is PROFESSION_KEYWORDS:
+        keyword_hits = scan_keywords(text)
+        for category in PROFESSION_KEYWORDS:
+            if keyword_hits.has(profession_group(category)):
+                return category.title()
+        return None
     
+    text_lower = text.lower()
     for category, keywords in profession_keywords.items():
         for keyword in keywords:
             if keyword in text_lower:
@@ -844,78 +1789,62 @@ def map_to_standard_profession(text, profession_keywords):
     
     return None
 
-def determine_event_type(text):
+@instrument()
+def determine_event_type(text, analysis=None):
     """Determine if the event is online or offline"""
-    online_patterns = [
-        r'(?i)online',
-        r'(?i)virtual',
-        r'(?i)zoom',
-        r'(?i)webinar',
-        r'(?i)web\s+conference',
-        r'(?i)livestream',
-        r'(?i)live\s+stream',
-        r'(?i)google\s+meet',
-        r'(?i)microsoft\s+teams',
-        r'(?i)webex',
-    ]
+    if ONLINE_RE.search(text):
+        return "Online"
     
-    for pattern in online_patterns:
-        if re.search(pattern, text):
-            return "Online"
+    if analysis is None:
+        analysis = analyze_text(text)
     
-    # If venue is specified, it's likely offline
-    if extract_venue(text) != "Not found":
+    # If venue is specified, it's likely offline (shares the venue result
+    # with extract_venue instead of scanning for it again)
+    if analysis.venue != "Not found":
         return "Offline"
     
     return "Not specified"
 
-def extract_phone_numbers(text):
-    """Extract contact phone numbers"""
-    phone_patterns = [
-        r'(?i)(?:phone|mobile|contact|call|tel|telephone)\s*:?\s*(\+?\d[\d\s\-().]{7,})',
-        r'(?i)(?:phone|mobile|contact|call|tel|telephone)\s*:?\s*(\+?\d{1,4}[\s\-()]*\d{3,4}[\s\-()]*\d{3,4})',
-        r'(?<!\d)(\+?\d{10,12})(?!\d)',
-        r'(?<!\d)(\+?\d{1,4}[\s\-()]*\d{3,4}[\s\-()]*\d{3,4})(?!\d)',
-    ]
+@instrument('extract_phone_numbers')
+def find_phone_numbers(text, analysis=None):
+    """List of contact phone numbers, digits only"""
+    if analysis is None:
+        analysis = analyze_text(text)
+    tokens = analysis.tokens
+    
+    # A valid number needs at least 9 digits plus an optional leading +
+    if tokens.digit_count < 9:
+        return []
     
     phone_numbers = []
-    for pattern in phone_patterns:
-        matches = re.finditer(pattern, text)
+    for pattern in PHONE_PATTERNS:
+        matches = pattern.finditer(text)
         for match in matches:
             phone = match.group(1).strip()
             # Clean up the phone number
-            phone = re.sub(r'[^\d+]', '', phone)
+            phone = NON_PHONE_CHARS_RE.sub('', phone)
             if len(phone) >= 10:  # Only include if it's a valid length
                 phone_numbers.append(phone)
     
+    return phone_numbers
+
+
+def extract_phone_numbers(text, analysis=None):
+    """Extract contact phone numbers"""
+    phone_numbers = find_phone_numbers(text, analysis)
     if phone_numbers:
         return ', '.join(phone_numbers)
     
     return "Not found"
 
-def extract_email(text):
-    """Extract all email addresses from text with improved patterns"""
-    
-    # Comprehensive email pattern that handles various formats
-    email_patterns = [
-        # Standard email format
-        r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}\b',
-        
-        # Email with spaces (OCR artifacts): "user @ domain . com"
-        r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?\s*@\s*[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\s*\.\s*[a-zA-Z]{2,}\b',
-        
-        # Email patterns with context
-        r'(?i)(?:email|e-mail|contact|write\s+to|send\s+to|reach\s+(?:us\s+)?(?:at|out))\s*:?\s*([a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,})',
-        
-        # Multiple emails in a line separated by common delimiters
-        r'\b[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}(?:\s*[,;|&/]\s*[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,})*',
-    ]
-    
+@instrument('extract_email')
+def find_emails(text):
+    """Sorted list of the distinct (lowercased) email addresses in text"""
     found_emails = set()
     
     # Apply each pattern
-    for pattern in email_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
+    for pattern in EMAIL_PATTERNS:
+        matches = pattern.finditer(text)
         for match in matches:
             if match.lastindex and match.lastindex >= 1:
                 email_text = match.group(1)
@@ -923,10 +1852,10 @@ def extract_email(text):
                 email_text = match.group(0)
             
             # Clean up spaces in email (OCR artifacts)
-            email_text = re.sub(r'\s+', '', email_text)
+            email_text = WHITESPACE_RE.sub('', email_text)
             
             # Split multiple emails if they're in one match
-            potential_emails = re.split(r'[,;|&/\s]+', email_text)
+            potential_emails = EMAIL_SPLIT_RE.split(email_text)
             
             for email in potential_emails:
                 email = email.strip()
@@ -934,8 +1863,12 @@ def extract_email(text):
                     found_emails.add(email.lower())
     
     # Convert to sorted list to ensure consistent output
-    unique_emails = sorted(list(found_emails))
-    
+    return sorted(found_emails)
+
+
+def extract_email(text):
+    """Extract all email addresses from text with improved patterns"""
+    unique_emails = find_emails(text)
     if unique_emails:
         return ', '.join(unique_emails)
     
@@ -945,9 +1878,7 @@ def extract_email(text):
 def validate_email(email):
     """Validate if the extracted text is a proper email address"""
     # Basic email validation
-    email_regex = r'^[a-zA-Z0-9](?:[a-zA-Z0-9._-]*[a-zA-Z0-9])?@[a-zA-Z0-9](?:[a-zA-Z0-9.-]*[a-zA-Z0-9])?\.[a-zA-Z]{2,}$'
-    
-    if not re.match(email_regex, email):
+    if not EMAIL_VALID_RE.match(email):
         return False
     
     # Additional checks
@@ -962,75 +1893,46 @@ def validate_email(email):
     return True
 
 
+@instrument('extract_social_media')
+def find_social_media(text):
+    """List of social media links and handles"""
+    social_media = []
+    for pattern in SOCIAL_PATTERNS:
+        social_media.extend(pattern.findall(text))
+    return social_media
+
+
 def extract_social_media(text):
     """Extract social media links and handles"""
-    social_patterns = [
-        r'(?i)(?:facebook|fb)\.com/\S+',
-        r'(?i)(?:instagram|ig)\.com/\S+',
-        r'(?i)(?:twitter|x)\.com/\S+',
-        r'(?i)linkedin\.com/\S+',
-        r'(?i)youtube\.com/\S+',
-        r'(?i)@\w+',  # Common social media handle format
-    ]
-    
-    social_media = []
-    for pattern in social_patterns:
-        matches = re.findall(pattern, text)
-        social_media.extend(matches)
-    
+    social_media = find_social_media(text)
     if social_media:
         return ', '.join(social_media)
     
     return "Not found"
 
-def extract_price(text):
-    """Extract price information with support for multiple currencies and formats"""
-    
-    # Currency symbols and abbreviations
-    currency_patterns = {
-        'INR': [r'₹', r'Rs\.?', r'INR', r'Rupees?'],
-        'USD': [r'\$', r'USD', r'Dollars?'],
-        'EUR': [r'€', r'EUR', r'Euros?'],
-        'GBP': [r'£', r'GBP', r'Pounds?'],
-        'JPY': [r'¥', r'JPY', r'Yen'],
-    }
-    
-    # Comprehensive price patterns
-    price_patterns = []
-    
-    # Generate patterns for each currency
-    for currency_code, symbols in currency_patterns.items():
-        for symbol in symbols:
-            # Currency before amount: $100, Rs. 500
-            price_patterns.extend([
-                rf'(?i)(?:price|fee|cost|ticket|registration|entry)\s*:?\s*{symbol}\s*(\d+(?:[,.]\d+)?)',
-                rf'(?i){symbol}\s*(\d+(?:[,.]\d+)?)',
-                rf'(?i)(?:price|fee|cost|ticket|registration|entry)\s*:?\s*(\d+(?:[,.]\d+)?)\s*{symbol}',
-                rf'(?i)(\d+(?:[,.]\d+)?)\s*{symbol}',
-            ])
-    
-    # Additional patterns for price ranges and complex formats
-    additional_patterns = [
-        # Price ranges: $100-200, Rs. 500 to 1000
-        r'(?i)(?:price|fee|cost|ticket|registration|entry)\s*:?\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*(\d+(?:[,.]\d+)?)\s*(?:to|-|–)\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*(\d+(?:[,.]\d+)?)',
-        
-        # Multiple price tiers: Student: $10, Professional: $50
-        r'(?i)((?:student|professional|academic|member|non-member|early\s+bird|regular)\s*:?\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*\d+(?:[,.]\d+)?)',
-        
-        # Price with context: Registration fee is $100
-        r'(?i)(?:registration|entry|participation|ticket)\s+(?:fee|cost|price)\s+(?:is|of)?\s*(?:Rs\.?|₹|INR|USD|\$|€|EUR|£|GBP|¥|JPY)?\s*(\d+(?:[,.]\d+)?)',
-        
-        # Just numbers that might be prices (when near price-related words)
-        r'(?i)(?:price|fee|cost|ticket|registration|entry|pay|payment)\s*:?\s*(\d+(?:[,.]\d+)?)',
-    ]
-    
-    price_patterns.extend(additional_patterns)
+@instrument('extract_price')
+def find_prices(text, analysis=None):
+    """Distinct prices (currency symbol and amount or range, or "Free") in order of appearance"""
+    if analysis is None:
+        analysis = analyze_text(text)
+    tokens = analysis.tokens
+    # Low-confidence words are blanked out, offsets stay the same
+    text = analysis.confident_text
     
     found_prices = []
     
+    # Every price pattern needs a number, and currency patterns also need
+    # their symbol somewhere in the text
+    price_patterns = PRICE_PATTERNS if tokens.has('number') else []
+    deadline = Deadline('extract_price')
+    
     # Try each pattern
-    for pattern in price_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
+    for pattern, currency_text in price_patterns:
+        if deadline.expired():
+            break
+        if currency_text and currency_text not in analysis.confident_lower:
+            continue
+        matches = pattern.finditer(text)
         for match in matches:
             # Get the surrounding context to check for currency and free indicators
             start_pos = max(0, match.start() - 50)
@@ -1038,36 +1940,33 @@ def extract_price(text):
             surrounding_text = text[start_pos:end_pos].lower()
             
             # Check if it's free
-            if re.search(r'(?i)\b(?:free|no\s+(?:charge|fee|cost)|complimentary|gratis)\b', surrounding_text):
+            if FREE_CONTEXT_RE.search(surrounding_text):
                 found_prices.append("Free")
                 continue
             
             # Extract price components
+            currency = currency_in_window(analysis, surrounding_text, start_pos, end_pos)
             if match.lastindex == 2:  # Price range
                 price1, price2 = match.groups()
-                currency = extract_currency_from_context(surrounding_text)
                 found_prices.append(f"{currency}{price1}-{price2}")
             else:
                 price = match.group(1) if match.lastindex >= 1 else match.group(0)
-                price = re.sub(r'[^\d.,]', '', price)  # Clean non-numeric characters
+                price = NON_PRICE_CHARS_RE.sub('', price)  # Clean non-numeric characters
                 
-                if price and re.match(r'\d', price):  # Ensure it starts with a digit
-                    currency = extract_currency_from_context(surrounding_text)
+                if price and DIGIT_RE.match(price):  # Ensure it starts with a digit
                     found_prices.append(f"{currency}{price}")
     
     # Check for free event indicators
-    free_patterns = [
-        r'(?i)\b(?:free\s+(?:entry|admission|event|registration)|no\s+(?:charge|fee|cost)|entry\s+free|admission\s+free|complimentary|gratis)\b'
-    ]
-    
-    for pattern in free_patterns:
-        if re.search(pattern, text):
-            found_prices.append("Free")
-            break
+    if FREE_EVENT_RE.search(text):
+        found_prices.append("Free")
     
     # Remove duplicates while preserving order
-    unique_prices = list(dict.fromkeys(found_prices))
-    
+    return list(dict.fromkeys(found_prices))
+
+
+def extract_price(text, analysis=None):
+    """Extract price information with support for multiple currencies and formats"""
+    unique_prices = find_prices(text, analysis)
     if unique_prices:
         return ' | '.join(unique_prices)  # Use | to separate multiple prices
     
@@ -1076,158 +1975,718 @@ def extract_price(text):
 
 def extract_currency_from_context(text):
     """Extract currency symbol from surrounding text"""
-    currency_map = {
-        '₹': '₹', 'rs.': '₹', 'rs': '₹', 'inr': '₹', 'rupee': '₹',
-        '$': '$', 'usd': '$', 'dollar': '$',
-        '€': '€', 'eur': '€', 'euro': '€',
-        '£': '£', 'gbp': '£', 'pound': '£',
-        '¥': '¥', 'jpy': '¥', 'yen': '¥',
-    }
+    return currency_from_hits(scan_keywords(text).find('currency'))
+
+
+def currency_in_window(analysis, surrounding_text, start, end):
+    """Currency symbol for text[start:end], from the document's keyword hits"""
+    if len(analysis.confident_lower) != len(analysis.text):
+        # Lowercasing changed the length, so offsets do not line up
+        return extract_currency_from_context(surrounding_text)
+    return currency_from_hits(analysis.keyword_hits.find('currency', start, end))
+
+
+def currency_from_hits(hits):
+    """Symbol of the highest priority currency word among the hits"""
+    if not hits:
+        return ''  # No currency symbol found
+    key = min((hit[2] for hit in hits), key=CURRENCY_PRIORITY.__getitem__)
+    return CURRENCY_MAP[key]
+
+
+# One OCR text line with its geometry: box is (xmin, ymin, xmax, ymax) in
+# relative page coordinates, confidence the mean word confidence and block
+# the index of the DocTR block the line belongs to
+OcrLine = namedtuple('OcrLine', ['text', 'box', 'confidence', 'block'])
+
+
+def _plain(column):
+    """A column as a plain list, for JSON and fast per-element access"""
+    return column.tolist() if isinstance(column, np.ndarray) else column
+
+
+class OcrDocument:
+    """OCR result for one page, stored column-wise.
+    
+    Words live in flat columns (value, confidence, box) and line i owns words
+    line_starts[i]:line_starts[i + 1]; every line also has a box and a block
+    index. Columns may be passed as plain lists and become NumPy arrays the
+    first time they are read. The flattened text (each word followed by a
+    space, a newline after every line and another after every block), the
+    offset of each line in it and the OcrLine tuples are only built when
+    first used.
+    """
+    
+    def __init__(self, words, word_confidences, word_boxes, line_starts, line_boxes, line_blocks):
+        self.words = words
+        self._word_confidences = word_confidences
+        self._word_boxes = word_boxes
+        self._line_starts = line_starts
+        self._line_boxes = line_boxes
+        self._line_blocks = line_blocks
+    
+    @cached_property
+    def word_confidences(self):
+        return np.asarray(self._word_confidences, dtype=np.float32)
+    
+    @cached_property
+    def word_boxes(self):
+        return np.asarray(self._word_boxes, dtype=np.float32).reshape(-1, 4)
+    
+    @cached_property
+    def line_starts(self):
+        return np.asarray(self._line_starts, dtype=np.int32)
+    
+    @cached_property
+    def line_boxes(self):
+        return np.asarray(self._line_boxes, dtype=np.float32).reshape(-1, 4)
+    
+    @cached_property
+    def line_blocks(self):
+        return np.asarray(self._line_blocks, dtype=np.int32)
+    
+    @classmethod
+    def from_lines(cls, lines):
+        """Build a document from OcrLine tuples; words inherit their line's box and confidence"""
+        words = []
+        line_starts = [0]
+        for line in lines:
+            words.extend(line.text.split())
+            line_starts.append(len(words))
+        line_starts = np.array(line_starts, dtype=np.int32)
+        line_boxes = np.array([line.box for line in lines], dtype=np.float32).reshape(-1, 4)
+        counts = np.diff(line_starts)
+        return cls(
+            words,
+            np.repeat(np.array([line.confidence for line in lines], dtype=np.float32), counts),
+            np.repeat(line_boxes, counts, axis=0),
+            line_starts,
+            line_boxes,
+            np.array([line.block for line in lines], dtype=np.int32),
+        )
+    
+    def __len__(self):
+        return len(self._line_blocks)
+    
+    def line_text(self, index):
+        return ' '.join(self.words[self._line_starts[index]:self._line_starts[index + 1]])
+    
+    @cached_property
+    def joined(self):
+        """(text, line offsets), built with a single join"""
+        parts = []
+        offsets = []
+        position = 0
+        starts = _plain(self._line_starts)
+        blocks = _plain(self._line_blocks)
+        for index, block in enumerate(blocks):
+            if index and block != blocks[index - 1]:
+                parts.append("\n")
+                position += 1
+            words = self.words[starts[index]:starts[index + 1]]
+            line = ' '.join(words) + " \n" if words else "\n"
+            offsets.append(position)
+            parts.append(line)
+            position += len(line)
+        if blocks:
+            parts.append("\n")
+        return ''.join(parts), offsets
+    
+    @property
+    def text(self):
+        return self.joined[0]
+    
+    @property
+    def line_offsets(self):
+        """Start offset of every line in text"""
+        return self.joined[1]
+    
+    @cached_property
+    def word_offsets(self):
+        """Start offset of every word in text"""
+        # Within a line each word is followed by one space, so a word starts
+        # at its line's offset plus the lengths of the words before it
+        lengths = np.fromiter(map(len, self.words), dtype=np.int64, count=len(self.words)) + 1
+        starts = np.cumsum(lengths) - lengths
+        counts = np.diff(self.line_starts)
+        line_of_word = np.repeat(np.arange(len(counts)), counts)
+        return (np.asarray(self.line_offsets, dtype=np.int64)[line_of_word]
+                + starts - starts[self.line_starts[line_of_word]])
+    
+    def masked_text(self, min_confidence):
+        """text with every word below min_confidence replaced by spaces of the same length"""
+        low = np.flatnonzero(self.word_confidences < min_confidence)
+        if not len(low):
+            return self.text
+        text = self.text
+        offsets = self.word_offsets
+        parts = []
+        position = 0
+        for index in low.tolist():
+            start = int(offsets[index])
+            end = start + len(self.words[index])
+            parts.append(text[position:start])
+            parts.append(' ' * (end - start))
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts)
+    
+    def span_confidence(self, start, end):
+        """Mean confidence of the words overlapping text[start:end], None if there are none"""
+        offsets = self.word_offsets
+        first = max(0, int(np.searchsorted(offsets, start, side='right')) - 1)
+        last = int(np.searchsorted(offsets, end, side='left'))
+        if last <= first:
+            return None
+        return float(self.word_confidences[first:last].mean())
+    
+    @cached_property
+    def line_confidences(self):
+        """Mean word confidence of every line (0.0 for lines without words)"""
+        counts = np.diff(self.line_starts)
+        if not len(counts):
+            return np.zeros(0, dtype=np.float32)
+        sums = np.add.reduceat(np.append(self.word_confidences, 0), self.line_starts[:-1])
+        return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+    
+    @cached_property
+    def lines(self):
+        starts = _plain(self._line_starts)
+        return [
+            OcrLine(' '.join(self.words[starts[index]:starts[index + 1]]), tuple(box), confidence, block)
+            for index, (box, confidence, block) in enumerate(zip(
+                self.line_boxes.tolist(), self.line_confidences.tolist(), _plain(self._line_blocks)))
+        ]
     
-    for key, symbol in currency_map.items():
-        if key in text.lower():
-            return symbol
+    def to_dict(self):
+        """Plain JSON-serializable form, used by the OCR cache"""
+        return {
+            "words": self.words,
+            "word_confidences": _plain(self.word_confidences),
+            "word_boxes": _plain(self.word_boxes),
+            "line_starts": _plain(self._line_starts),
+            "line_boxes": _plain(self.line_boxes),
+            "line_blocks": _plain(self._line_blocks),
+        }
     
-    return ''  # No currency symbol found
+    @classmethod
+    def from_dict(cls, data):
+        if "lines" in data:
+            # Entries cached before word-level storage
+            return cls.from_lines([OcrLine(text, tuple(box), confidence, block)
+                                   for text, box, confidence, block in data["lines"]])
+        return cls(data["words"], data["word_confidences"], data["word_boxes"],
+                   data["line_starts"], data["line_boxes"], data["line_blocks"])
 
 
-def extract_poster_info(image):
-    """Main function to extract all information from poster image"""
-    try:
-        # Make sure we have a valid image
-        if image is None:
-            return "No image provided. Please upload an image.", "{}", ""
-            
-        # Convert image to PIL format if needed and save temporarily
-        import tempfile
-        from PIL import Image
-        import os
-        
-        # Create a temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-        temp_filename = temp_file.name
-        temp_file.close()
-        
-        # Convert numpy array to PIL Image and save
-        if isinstance(image, np.ndarray):
-            img = Image.fromarray(image.astype('uint8'))
-            img.save(temp_filename)
+def geometries_to_boxes(geometries):
+    """Convert DocTR geometries (2-point boxes or polygons) to an N x 4 array of
+    (xmin, ymin, xmax, ymax), all at once"""
+    if not geometries:
+        return np.zeros((0, 4), dtype=np.float32)
+    # fromiter over the flattened coordinates is several times faster than
+    # np.asarray on a list of nested tuples
+    points = len(geometries[0])
+    coordinates = np.fromiter(chain.from_iterable(chain.from_iterable(geometries)),
+                              dtype=np.float32, count=len(geometries) * points * 2)
+    coordinates = coordinates.reshape(-1, points, 2)
+    return np.concatenate([coordinates.min(axis=1), coordinates.max(axis=1)], axis=1)
+
+
+class PageDocument(OcrDocument):
+    """OcrDocument flattened from a DocTR page.
+    
+    The words, the text and the line offsets are built in a single walk over
+    the page; confidences and boxes stay on the DocTR objects until a
+    consumer reads them.
+    """
+    
+    def __init__(self, page):
+        words = []
+        rows = []
+        offsets = []
+        line_starts = [0]
+        line_blocks = []
+        page_words = []
+        page_lines = []
+        position = 0
+        for block_index, block in enumerate(page.blocks):
+            if rows and block.lines:
+                rows.append('')
+                position += 1
+            for line in block.lines:
+                values = [word.value for word in line.words]
+                row = ' '.join(values) + ' ' if values else ''
+                offsets.append(position)
+                rows.append(row)
+                position += len(row) + 1
+                words.extend(values)
+                page_words.extend(line.words)
+                page_lines.append(line)
+                line_starts.append(len(words))
+                line_blocks.append(block_index)
+        super().__init__(words, None, None, line_starts, None, line_blocks)
+        self.joined = ('\n'.join(rows) + '\n\n' if rows else '', offsets)
+        self._page_words = page_words
+        self._page_lines = page_lines
+    
+    @cached_property
+    def word_confidences(self):
+        return np.fromiter((word.confidence for word in self._page_words),
+                           dtype=np.float32, count=len(self._page_words))
+    
+    @cached_property
+    def word_boxes(self):
+        return geometries_to_boxes([word.geometry for word in self._page_words])
+    
+    @cached_property
+    def line_boxes(self):
+        return geometries_to_boxes([line.geometry for line in self._page_lines])
+
+
+@instrument('flatten')
+def page_to_document(page):
+    """Flatten a DocTR page into an OcrDocument, keeping word boxes and confidences"""
+    return PageDocument(page)
+
+
+def page_to_text(page):
+    """Flatten a DocTR page into plain text, one OCR line per text line"""
+    return page_to_document(page).text
+
+
+# How the event name is chosen: "text" (the default) always uses the
+# text-only strategy cascade, "layout" uses OCR line geometry when it is
+# available
+EVENT_NAME_MODES = ('text', 'layout')
+
+# Between the text of consecutive pages of a multi-page document
+PAGE_SEPARATOR = "\n"
+
+SPAN_TOKEN_RE = re.compile(r'\w+')
+
+
+def find_span(value, lower):
+    """(start, end) of a field value in the lowercased text, or None.
+
+    Values the extractors normalized (regrouped phone digits, changed
+    punctuation or spacing) are matched word by word with any separators
+    in between.
+    """
+    value_lower = value.lower()
+    start = lower.find(value_lower)
+    if start >= 0:
+        return (start, start + len(value_lower))
+    tokens = SPAN_TOKEN_RE.findall(value_lower)
+    if not tokens:
+        return None
+    if len(tokens) == 1 and tokens[0].isdigit():
+        # Digits the extractor joined, e.g. "98765 43210" -> "9876543210"
+        pattern = r'\W{0,3}'.join(tokens[0])
+    else:
+        pattern = r'\W*'.join(map(re.escape, tokens))
+    match = re.search(pattern, lower)
+    return match.span() if match else None
+
+
+def locate_fields(values, lower, document=None):
+    """(spans, confidences) of field values, aligned with them.
+
+    Single values get one span, multi-valued fields one per item. With the
+    OcrDocument the text was flattened from, a field's confidence is the
+    mean OCR confidence of the words under its spans.
+    """
+    spans = []
+    confidence = []
+    for value in values:
+        if not value:
+            spans.append(None)
+            confidence.append(None)
+            continue
+        if isinstance(value, str):
+            span = find_span(value, lower)
+            field_spans = [span] if span else []
+            spans.append(span)
         else:
-            # If it's already a PIL image
-            image.save(temp_filename)
-            
-        # Process the image with DocTR
-        doc = DocumentFile.from_images([temp_filename])
-        result = model(doc)
-        
-        # Clean up the temporary file
-        os.unlink(temp_filename)
-        
-        # Extract all text from the document
-        extracted_text = ""
-        for page in result.pages:
-            for block in page.blocks:
-                for line in block.lines:
-                    for word in line.words:
-                        extracted_text += word.value + " "
-                    extracted_text += "\n"
-                extracted_text += "\n"
-        
-        # Extract key information using the improved functions
-        event_name = extract_event_name(extracted_text)
-        date = extract_date(extracted_text)
-        time = extract_time(extracted_text)  # This now uses the improved function
-        venue = extract_venue(extracted_text)
-        profession = extract_profession(extracted_text)
-        event_type = determine_event_type(extracted_text)
-        phone = extract_phone_numbers(extracted_text)
-        email = extract_email(extracted_text)
-        social_media = extract_social_media(extracted_text)
-        price = extract_price(extracted_text)
+            item_spans = tuple(find_span(item, lower) for item in value)
+            field_spans = [span for span in item_spans if span]
+            spans.append(item_spans)
+        scores = [] if document is None else [
+            score for score in (document.span_confidence(*span) for span in field_spans)
+            if score is not None
+        ]
+        confidence.append(sum(scores) / len(scores) if scores else None)
+    return spans, confidence
+
+
+# The extractor of every field, called as extractor(text, analysis); the
+# event name switches to extract_event_name_from_layout when there is an
+# OcrDocument and the event name mode is "layout"
+FIELD_EXTRACTORS = {
+    'event_name': extract_event_name,
+    'date': extract_date,
+    'time': extract_time,
+    'venue': extract_venue,
+    'professions': find_professions,
+    'event_type': determine_event_type,
+    'phones': find_phone_numbers,
+    'emails': lambda text, analysis: find_emails(text),
+    'social_media': lambda text, analysis: find_social_media(text),
+    'prices': find_prices,
+}
+
+# Fields whose extractor reuses other fields' results from the shared
+# TextAnalysis: the event type is "Offline" when a venue was found
+FIELD_DEPENDENCIES = {
+    'event_type': ('venue',),
+}
+
+
+def resolve_fields(fields=None):
+    """Record keys of the fields to extract for a requested set, in FIELDS order.
+
+    Fields can be given by record key or display label; the fields they
+    depend on are added, since their extractors run anyway. None means
+    every field.
+    """
+    if fields is None:
+        return tuple(FIELD_KEYS)
+    resolved = set()
+    pending = list(field_keys(fields))
+    while pending:
+        key = pending.pop()
+        if key not in resolved:
+            resolved.add(key)
+            pending.extend(FIELD_DEPENDENCIES.get(key, ()))
+    # FIELDS order runs every dependency before the fields that need it
+    return tuple(key for key in FIELD_KEYS if key in resolved)
+
+
+def extract_info(extracted_text, document=None, event_name_mode='text', fields=None):
+    """Run the field extractors over OCR text and return a PosterInfo.
+    
+    Pass the OcrDocument the text came from to enable layout-aware event
+    name extraction and per-field OCR confidences. ``fields`` limits the
+    work to those fields (see resolve_fields); the others are left empty.
+    """
+    selected = resolve_fields(fields)
+    _budget.exceeded = False
+    with timed('extract_fields'), trace_request(extracted_text):
+        # Build one analysis context and share its intermediate results
+        # (lines, lowercased text, tokens, venue) between all extractors
+        analysis = analyze_text(extracted_text, document)
+        
+        values = []
+        for key in FIELD_KEYS:
+            if key not in selected:
+                value = None
+            elif key == 'event_name' and document is not None and event_name_mode == 'layout':
+                value = extract_event_name_from_layout(document, analysis)
+            else:
+                value = FIELD_EXTRACTORS[key](extracted_text, analysis)
+            if isinstance(value, str) and value in MISSING_VALUES:
+                value = None
+            values.append(value)
         
-        # Create output in both JSON and CSV formats
-        info_dict = {
-            "Event Name": event_name,
-            "Date": date,
-            "Time": time,
-            "Venue": venue,
-            "Profession/Target Audience": profession,
-            "Event Type": event_type,
-            "Contact Number": phone,
-            "Email": email,
-            "Social Media": social_media,
-            "Price": price
-        }
+        # Confidences need word offsets into this exact text
+        aligned = document is not None and document.text is extracted_text
+        with timed('locate_fields'):
+            spans, confidence = locate_fields(values, analysis.lower, document if aligned else None)
+    
+    return PosterInfo(*values, confidence=confidence, spans=spans, truncated=_budget.exceeded)
+
+
+def extract_fields(extracted_text, document=None, event_name_mode='text', fields=None):
+    """Run the field extractors over OCR text and return the result dict
+    (the display form of extract_info's PosterInfo, with only the requested
+    fields when ``fields`` is given)."""
+    info = extract_info(extracted_text, document, event_name_mode, fields)
+    return info.to_dict(None if fields is None else field_keys(fields))
+
+
+def merge_pages(page_results):
+    """Combine per-page ``(text, PosterInfo)`` results into one for the whole document.
+
+    See PosterInfo.merge; spans are shifted to point into the joined text.
+    """
+    offsets = []
+    position = 0
+    for text, _ in page_results:
+        offsets.append(position)
+        position += len(text) + len(PAGE_SEPARATOR)
+    text = PAGE_SEPARATOR.join(text for text, _ in page_results)
+    return text, PosterInfo.merge([info for _, info in page_results], offsets)
+
+
+def image_to_array(image):
+    """Convert an uploaded numpy array or PIL image to an RGB uint8 array for DocTR"""
+    if isinstance(image, np.ndarray):
+        page = image if image.dtype == np.uint8 else image.astype('uint8')
+    else:
+        # PIL images (including palette/greyscale/RGBA modes)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        page = np.asarray(image)
+    
+    # DocTR expects H x W x 3
+    if page.ndim == 2:
+        page = np.stack([page] * 3, axis=-1)
+    elif page.shape[-1] == 4:
+        page = page[..., :3]
+    elif page.shape[-1] == 1:
+        page = np.repeat(page, 3, axis=-1)
+    
+    return np.ascontiguousarray(page)
+
+
+def configure_ocr_cache(max_entries=256, path=None):
+    """Replace the module OCR cache, e.g. to point batch runs at a SQLite file"""
+    global ocr_cache
+    ocr_cache.close()
+    ocr_cache = OcrCache(max_entries=max_entries, path=path)
+    return ocr_cache
+
+
+def ocr_cache_namespace():
+    """Cache namespace for the current model profile, mode and preprocessing settings"""
+    namespace = OCR_CACHE_NAMESPACE
+    if OCR_PROFILE != 'balanced':
+        namespace += '|' + OCR_PROFILE
+    if OCR_MODE != 'eager':
+        # Quantized or compiled models can recognize slightly differently
+        namespace += '|' + OCR_MODE
+    return namespace + preprocessor.signature()
+
+
+def configure_preprocessing(max_side=None, grayscale=False, normalize_contrast=False,
+                            crop_borders=False, deskew=False):
+    """Set the preprocessing applied to pages before OCR"""
+    global preprocessor
+    preprocessor = Preprocessor(PreprocessConfig(max_side, grayscale, normalize_contrast, crop_borders,
+                                                 deskew))
+    return preprocessor
+
+
+def ocr_entries(pages, use_cache=True):
+    """OCR decoded pages, skipping the forward pass for pages already cached.
+
+    Returns ``(keys, entries)``: one cache key (None when caching is off) and
+    one ``{"document": ..., "fields": {...}}`` entry per page. Only cache
+    misses are preprocessed and sent to the model, together in one batch,
+    and identical pages within a batch are recognized once. Keys hash the
+    pages as decoded, qualified by the preprocessing settings.
+    """
+    if use_cache:
+        namespace = ocr_cache_namespace()
+        with timed('cache_lookup'):
+            keys = [image_key(page, namespace) for page in pages]
+            entries = [ocr_cache.get(key) for key in keys]
+    else:
+        keys = [None] * len(pages)
+        entries = [None] * len(pages)
+    
+    # Group misses by key so duplicate pages share one forward pass
+    missing = {}
+    for index, (key, entry) in enumerate(zip(keys, entries)):
+        if entry is None:
+            missing.setdefault(key if key is not None else index, []).append(index)
+    
+    if missing:
+        model = get_model()
+        inputs = [pages[indices[0]] for indices in missing.values()]
+        if preprocessor.enabled:
+            with timed('preprocess'):
+                inputs = [preprocessor(page) for page in inputs]
+        with timed('ocr'):
+            result = model(inputs)
+        for indices, page in zip(missing.values(), result.pages):
+            entry = {"document": page_to_document(page).to_dict(), "fields": {}}
+            for index in indices:
+                entries[index] = entry
+    
+    return keys, entries
+
+
+def parse_entry(key, entry, event_name_mode='text', fields=None):
+    """Extract the fields for one OCR cache entry and return ``(text, PosterInfo)``.
+
+    Fields already cached for this event name mode are reused; otherwise
+    they are extracted and the entry is stored back under ``key`` (unless
+    it is None). Only complete results are cached: with ``fields`` (see
+    extract_info) a cached result is returned whole, and for a fresh
+    partial one, or one cut short by the extractor time budget, only the
+    OCR result is stored, so the next request skips the model. Cached
+    entries are never mutated in place, so this is safe to call from
+    several threads.
+    """
+    document = OcrDocument.from_dict(entry["document"])
+    state = entry["fields"].get(event_name_mode)
+    # Fields cached as display dicts (before PosterInfo) lack confidences
+    # and spans; extracting them again is cheap next to OCR
+    if state is None or isinstance(state, dict):
+        info = extract_info(document.text, document, event_name_mode, fields)
+        if key is not None and fields is None and not info.truncated:
+            cached_fields = dict(entry["fields"])
+            cached_fields[event_name_mode] = info.to_state()
+            ocr_cache.put(key, {"document": entry["document"], "fields": cached_fields})
+        elif key is not None and key not in ocr_cache:
+            ocr_cache.put(key, {"document": entry["document"], "fields": entry["fields"]})
+    else:
+        info = PosterInfo.from_state(state)
+    return document.text, info
+
+
+def extract_records(pages, event_name_mode='text', use_cache=True, fields=None):
+    """Run OCR on a batch of decoded pages in one forward pass.
+
+    Returns a list of ``(extracted_text, PosterInfo)`` tuples, one per page.
+    Pages seen before are served from the OCR cache, including their
+    extracted fields, without running the model. ``fields`` limits field
+    extraction to those fields (see extract_info).
+    """
+    if not pages:
+        return []
+    
+    keys, entries = ocr_entries(pages, use_cache)
+    return [parse_entry(key, entry, event_name_mode, fields) for key, entry in zip(keys, entries)]
+
+
+def extract_batch(pages, event_name_mode='text', use_cache=True, fields=None):
+    """Like extract_records, with the fields as display dicts.
+
+    ``pages`` is a list of numpy arrays as returned by ``DocumentFile``.
+    Returns a list of ``(extracted_text, info_dict)`` tuples, one per page;
+    with ``fields`` the dicts only have those fields.
+    """
+    keys = None if fields is None else field_keys(fields)
+    return [(text, info.to_dict(keys))
+            for text, info in extract_records(pages, event_name_mode, use_cache, fields)]
+
+
+def extract_document(source, batch_size=None, event_name_mode='text', use_cache=True,
+                     fields=None):
+    """Extract the information from every page of a PDF or multi-page TIFF.
+
+    Pages are rendered lazily and recognized ``batch_size`` at a time
+    (DOCUMENT_BATCH_SIZE by default), so only one batch of page pixels is
+    held at once however long the document is. Returns one
+    ``(extracted_text, PosterInfo)`` for the whole document, with the
+    fields of all pages merged by merge_pages(). ``fields`` limits field
+    extraction as in extract_info.
+    """
+    batch_size = batch_size or DOCUMENT_BATCH_SIZE
+    page_results = []
+    with PageReader(source) as reader:
+        for start in range(0, len(reader), batch_size):
+            with timed('decode'):
+                pages = [reader.render(number)
+                         for number in range(start, min(start + batch_size, len(reader)))]
+            page_results.extend(extract_records(pages, event_name_mode, use_cache, fields))
+            # Free this batch's pixels before the next one is rendered
+            del pages
+    return merge_pages(page_results)
+
+
+def extract_poster_info(image, document=None):
+    """Main function to extract all information from poster image.
+
+    ``document`` is an optional PDF or multi-page TIFF (a path or an
+    uploaded file) to read instead of the image.
+    """
+    try:
+        if document is not None:
+            extracted_text, info = extract_document(getattr(document, 'name', document))
+        else:
+            # Make sure we have a valid image
+            if image is None:
+                return "No image provided. Please upload an image.", "{}", ""
+
+            # Feed the decoded pixels straight to the OCR predictor, or reuse
+            # the cached result if this exact image was seen before
+            with timed('decode'):
+                page = image_to_array(image)
+            extracted_text, info = extract_records([page])[0]
+        info_dict = info.to_dict()
         
-        # Convert to JSON
-        json_output = json.dumps(info_dict, indent=4)
+        # Convert to JSON, with the OCR confidence of every field
+        json_output = json.dumps(dict(info_dict, Confidence=info.confidence_dict()), indent=4)
         
         # Convert to CSV
-        df = pd.DataFrame([info_dict])
-        csv_output = df.to_csv(index=False)
+        csv_output = format_csv([info_dict], list(info_dict))
         
         return extracted_text, json_output, csv_output
     except Exception as e:
         return f"Error processing image: {str(e)}", "{}", ""
 
-# Create Gradio interface
-with gr.Blocks(title="Event Poster Information Extractor") as demo:
-    gr.Markdown("# 📢 Event Poster Information Extractor")
-    gr.Markdown("""
-    Upload an event poster image to extract key information such as event name, date, time, venue, 
-    contact details, and pricing. The system uses DocTR for OCR and regex patterns for information extraction.
-    
-    **Enhanced Date Extraction**: Now handles various date formats including:
-    - Date ranges (January 18-19, 2025)
-    - Day names with dates (Saturday May 20th, THURSDAY 2/20)
-    - Common misspellings (Feburary → February)
-    - Partial dates and flexible formatting
-    """)
-    
-    with gr.Row():
-        with gr.Column(scale=1):
-            input_image = gr.Image(label="Upload Poster Image")
-            extract_btn = gr.Button("Extract Information", variant="primary")
-        
-        with gr.Column(scale=2):
-            with gr.Tab("Extracted Text"):
-                text_output = gr.Textbox(label="Raw Extracted Text", lines=10)
+def build_demo():
+    """Create the Gradio interface"""
+    import gradio as gr
+    
+    with gr.Blocks(title="Event Poster Information Extractor") as demo:
+        gr.Markdown("# 📢 Event Poster Information Extractor")
+        gr.Markdown("""
+        Upload an event poster image to extract key information such as event name, date, time, venue, 
+        contact details, and pricing. The system uses DocTR for OCR and regex patterns for information extraction.
+    
+        **Enhanced Date Extraction**: Now handles various date formats including:
+        - Date ranges (January 18-19, 2025)
+        - Day names with dates (Saturday May 20th, THURSDAY 2/20)
+        - Common misspellings (Feburary → February)
+        - Partial dates and flexible formatting
+        """)
+    
+        with gr.Row():
+            with gr.Column(scale=1):
+                input_image = gr.Image(label="Upload Poster Image")
+                input_document = gr.File(label="...or a PDF / Multi-Page TIFF",
+                                         file_types=[".pdf", ".tif", ".tiff"], type="filepath")
+                extract_btn = gr.Button("Extract Information", variant="primary")
+        
+            with gr.Column(scale=2):
+                with gr.Tab("Extracted Text"):
+                    text_output = gr.Textbox(label="Raw Extracted Text", lines=10)
             
-            with gr.Tab("JSON Output"):
-                json_output = gr.JSON(label="Structured Information (JSON)")
+                with gr.Tab("JSON Output"):
+                    json_output = gr.JSON(label="Structured Information (JSON)")
             
-            with gr.Tab("CSV Output"):
-                csv_output = gr.Textbox(label="Structured Information (CSV)", lines=10)
+                with gr.Tab("CSV Output"):
+                    csv_output = gr.Textbox(label="Structured Information (CSV)", lines=10)
     
-    extract_btn.click(
-        fn=extract_poster_info,
-        inputs=[input_image],
-        outputs=[text_output, json_output, csv_output]
-    )
+        extract_btn.click(
+            fn=extract_poster_info,
+            inputs=[input_image, input_document],
+            outputs=[text_output, json_output, csv_output]
+        )
     
-    gr.Markdown("""
-    ## How it works
+        gr.Markdown("""
+        ## How it works
     
-    1. The system uses DocTR (Document Text Recognition) for OCR to extract all text from the poster
-    2. Specialized regex patterns identify and extract key information
-    3. Enhanced date extraction handles various formats and common OCR errors
-    4. The extracted data is provided in both JSON and CSV formats
+        1. The system uses DocTR (Document Text Recognition) for OCR to extract all text from the poster
+        2. Specialized regex patterns identify and extract key information
+        3. Enhanced date extraction handles various formats and common OCR errors
+        4. The extracted data is provided in both JSON and CSV formats
     
-    ## Date Extraction Improvements
+        ## Date Extraction Improvements
     
-    - **Date ranges**: "January 18-19, 2025", "18-19 January 2025"
-    - **Day names**: "Saturday May 20th", "SAT. MAY20TH"
-    - **Numeric formats**: "THURSDAY 2/20", "28th February 2025"
-    - **Misspellings**: Handles "Feburary" and other common OCR errors
-    - **Partial dates**: Extracts available components when full date isn't found
+        - **Date ranges**: "January 18-19, 2025", "18-19 January 2025"
+        - **Day names**: "Saturday May 20th", "SAT. MAY20TH"
+        - **Numeric formats**: "THURSDAY 2/20", "28th February 2025"
+        - **Misspellings**: Handles "Feburary" and other common OCR errors
+        - **Partial dates**: Extracts available components when full date isn't found
     
-    ## Tips for best results
+        ## Tips for best results
     
-    - Use clear, high-resolution images of posters
-    - Ensure the poster has good contrast between text and background
-    - Make sure key information is visible and not obscured
-    """)
+        - Use clear, high-resolution images of posters
+        - Ensure the poster has good contrast between text and background
+        - Make sure key information is visible and not obscured
+        """)
+    
+    return demo
+
 
 # Launch the app
 if __name__ == "__main__":
-    demo.launch()
\ No newline at end of file
+    # Expose Prometheus-style stage metrics on http://host:PORT/metrics
+    if os.environ.get('POSTER_METRICS_PORT'):
+        metrics.serve(int(os.environ['POSTER_METRICS_PORT']))
+    build_demo().launch()
\ No newline at end of file
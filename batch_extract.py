@@ -0,0 +1,417 @@
+"""Headless batch extraction for whole directories of event posters.
+
+Examples:
+    python batch_extract.py posters/ -o results.jsonl
+    python batch_extract.py "scans/**/*.png" -o results.csv --batch-size 16
+    python batch_extract.py manifest.txt --format csv > results.csv
+    python batch_extract.py archive/ -r -o results.parquet --sync-every 1000
+
+Inputs can be directories, glob patterns or manifest files (one image path
+per line). Images are decoded, recognized in batches and parsed in
+overlapping pipeline stages (see pipeline.py), so DocTR runs one forward
+pass per batch while the previous batch is parsed, and one row per poster is
+streamed to the output (see writers.py) as soon as it is ready. PDFs and
+multi-page TIFFs are read page by page and give one row each, with the
+fields of all their pages merged.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import app_advanced
+import metrics
+from app_advanced import (
+    EVENT_NAME_MODES, FIELD_KEYS, FIELD_NAMES, OCR_MODES, OCR_PROFILES, configure_ocr_cache,
+    configure_ocr_model, configure_preprocessing,
+)
+from parallel import ParallelExtractor
+from pipeline import ExtractionPipeline
+from records import field_keys
+from writers import FORMATS, open_writer
+
+# Image and document types picked up when scanning directories
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp', '.pdf')
+
+
+def is_image_path(path):
+    """Check if a path looks like an image we can OCR"""
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def iter_directory(directory, recursive=False):
+    """Yield image files in a directory in a stable order"""
+    if recursive:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if is_image_path(name):
+                    yield os.path.join(root, name)
+    else:
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path) and is_image_path(name):
+                yield path
+
+
+def iter_manifest(manifest_path):
+    """Yield image paths listed in a manifest file, relative to the manifest"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, encoding='utf-8') as manifest:
+        for line in manifest:
+            line = line.strip()
+            # Skip blank lines and comments
+            if not line or line.startswith('#'):
+                continue
+            yield line if os.path.isabs(line) else os.path.join(base_dir, line)
+
+
+def collect_inputs(inputs, recursive=False):
+    """Expand directories, globs and manifests into a list of image paths"""
+    for item in inputs:
+        if os.path.isdir(item):
+            yield from iter_directory(item, recursive)
+        elif glob.has_magic(item):
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path) and is_image_path(path):
+                    yield path
+        elif is_image_path(item):
+            yield item
+        else:
+            yield from iter_manifest(item)
+
+
+def confidence_column(field):
+    return f"{field} Confidence"
+
+
+def result_to_row(result, include_text=False, records=False, confidence=False, fields=None):
+    """Turn one PipelineResult into an output row.
+
+    With ``records`` the fields are the PosterInfo's typed record (lists,
+    confidences and spans) instead of the display columns. ``confidence``
+    adds a column with the OCR confidence of every display field.
+    ``fields`` (record keys) limits the row to those fields.
+    """
+    if result.error is not None:
+        return {"File": result.source, "Error": result.error}
+    row = {"File": result.source}
+    row.update(result.fields.to_record(fields) if records else result.fields.to_dict(fields))
+    if confidence and not records:
+        for field, score in result.fields.confidence_dict(fields).items():
+            row[confidence_column(field)] = score
+    if include_text:
+        row["Extracted Text"] = result.text
+    return row
+
+
+def output_columns(include_text=False, confidence=False, fields=None):
+    """Column order for CSV and Parquet output"""
+    labels = [label for label, key in zip(FIELD_NAMES, FIELD_KEYS) if fields is None or key in fields]
+    columns = ["File"] + labels
+    if confidence:
+        columns.extend(map(confidence_column, labels))
+    if include_text:
+        columns.append("Extracted Text")
+    columns.append("Error")
+    return columns
+
+
+def detect_format(output_path, requested_format):
+    """Pick the output format from --format or the output file extension"""
+    if requested_format:
+        return requested_format
+    if output_path:
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension in ('.csv', '.parquet'):
+            return extension[1:]
+    return 'jsonl'
+
+
+def run(inputs, output=None, output_format=None, batch_size=8,
+        recursive=False, include_text=False, event_name_mode='text',
+        use_cache=True, cache_path=None, decode_workers=2, parse_workers=2,
+        processes=0, sync_every=0, records=False, confidence=False, fields=None):
+    """Extract every poster in inputs and stream rows to the output file.
+
+    With ``processes`` > 0 posters are sharded across that many worker
+    processes instead of the in-process threaded pipeline. With
+    ``sync_every`` > 0 the output file is fsynced every that many rows.
+    ``records`` writes typed records (JSONL only) and ``confidence`` adds
+    per-field confidence columns, see result_to_row. ``fields`` (record
+    keys or display labels) only extracts and writes those fields.
+    """
+    output_format = detect_format(output, output_format)
+    if fields is not None:
+        fields = field_keys(fields)
+    writer = open_writer(output, output_format, output_columns(include_text, confidence, fields),
+                         sync_every=sync_every, stream=sys.stdout)
+
+    processed = 0
+    failed = 0
+    start_time = time.perf_counter()
+    if processes:
+        engine = ParallelExtractor(
+            workers=processes,
+            batch_size=batch_size,
+            event_name_mode=event_name_mode,
+            use_cache=use_cache,
+            cache_path=cache_path,
+            fields=fields,
+        )
+    else:
+        if use_cache and cache_path:
+            configure_ocr_cache(path=cache_path)
+        engine = ExtractionPipeline(
+            batch_size=batch_size,
+            decode_workers=decode_workers,
+            parse_workers=parse_workers,
+            event_name_mode=event_name_mode,
+            use_cache=use_cache,
+            fields=fields,
+        )
+    try:
+        for result in engine.run(collect_inputs(inputs, recursive)):
+            row = result_to_row(result, include_text, records, confidence, fields)
+            writer.write(row)
+            processed += 1
+            if "Error" in row:
+                failed += 1
+
+            if processed % batch_size == 0:
+                writer.flush()
+                elapsed = time.perf_counter() - start_time
+                print(f"Processed {processed} posters ({failed} failed) "
+                      f"in {elapsed:.1f}s", file=sys.stderr)
+        if processed % batch_size:
+            elapsed = time.perf_counter() - start_time
+            print(f"Processed {processed} posters ({failed} failed) "
+                  f"in {elapsed:.1f}s", file=sys.stderr)
+    finally:
+        if processes:
+            engine.close()
+        writer.close()
+
+    # Worker processes keep their own in-memory caches
+    if use_cache and not processes:
+        stats = app_advanced.ocr_cache.stats()
+        print(f"OCR cache: {stats['hits']} hits ({stats['disk_hits']} from disk), "
+              f"{stats['misses']} misses", file=sys.stderr)
+
+    return processed, failed
+
+
+def field_list(value):
+    """argparse type for --fields: comma-separated record keys or display labels"""
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    if not fields:
+        raise argparse.ArgumentTypeError("no fields given")
+    try:
+        return field_keys(fields)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Extract event information from many poster images at once."
+    )
+    parser.add_argument(
+        'inputs', nargs='+',
+        help="Directories, glob patterns or manifest files listing image paths"
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help="Output file (.jsonl, .csv or .parquet). Defaults to JSONL on stdout"
+    )
+    parser.add_argument(
+        '--format', dest='output_format', choices=FORMATS,
+        help="Output format. Inferred from the output file extension if omitted"
+    )
+    parser.add_argument(
+        '--sync-every', type=int, default=0,
+        help="Flush and fsync the output file every N rows (default: 0, only "
+             "at the end)"
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=8,
+        help="Number of posters per OCR forward pass (default: 8)"
+    )
+    parser.add_argument(
+        '--decode-workers', type=int, default=2,
+        help="Threads decoding images ahead of OCR (default: 2)"
+    )
+    parser.add_argument(
+        '--parse-workers', type=int, default=2,
+        help="Threads running the field extractors behind OCR (default: 2)"
+    )
+    parser.add_argument(
+        '-j', '--processes', type=int, default=0,
+        help="Shard posters across this many worker processes, each with its "
+             "own OCR model (default: 0, run in this process)"
+    )
+    parser.add_argument(
+        '--metrics', dest='metrics_path',
+        help="Write per-stage timings in Prometheus text format to this file "
+             "when done (in-process runs only)"
+    )
+    parser.add_argument(
+        '--slow-log',
+        help="Append a JSON line with stage timings and OCR text for every "
+             "poster whose field extraction exceeds --slow-threshold-ms"
+    )
+    parser.add_argument(
+        '--slow-threshold-ms', type=float, default=200,
+        help="Threshold for --slow-log in milliseconds (default: 200)"
+    )
+    parser.add_argument(
+        '--ocr-mode', choices=OCR_MODES,
+        help="Run the OCR networks as-is (eager), with int8 dynamic "
+             "quantization or through torch.compile (default: eager, or "
+             "POSTER_OCR_MODE)"
+    )
+    parser.add_argument(
+        '--ocr-profile', choices=list(OCR_PROFILES),
+        help="Detection/recognition architectures: fast (MobileNet), balanced "
+             "(DocTR's defaults) or accurate (default: balanced, or POSTER_OCR_PROFILE)"
+    )
+    parser.add_argument(
+        '--det-batch-size', type=int,
+        help="Pages per text detection forward pass (default: DocTR's)"
+    )
+    parser.add_argument(
+        '--reco-batch-size', type=int,
+        help="Word crops per text recognition forward pass (default: DocTR's)"
+    )
+    parser.add_argument(
+        '--max-side', type=int,
+        help="Downscale images so their longer side is at most this many "
+             "pixels before OCR (e.g. 1600 for phone photos)"
+    )
+    parser.add_argument(
+        '--grayscale', action='store_true',
+        help="Convert images to grayscale before OCR"
+    )
+    parser.add_argument(
+        '--normalize-contrast', action='store_true',
+        help="Stretch image contrast to the full range before OCR"
+    )
+    parser.add_argument(
+        '--crop-borders', action='store_true',
+        help="Crop uniform margins around the poster before OCR"
+    )
+    parser.add_argument(
+        '--deskew', action='store_true',
+        help="Rotate tilted photos so the text lines are level before OCR"
+    )
+    parser.add_argument(
+        '-r', '--recursive', action='store_true',
+        help="Scan input directories recursively"
+    )
+    parser.add_argument(
+        '--include-text', action='store_true',
+        help="Include the raw OCR text in every row"
+    )
+    parser.add_argument(
+        '--records', action='store_true',
+        help="Write JSONL rows as typed records: snake_case field keys, "
+             "list-valued fields, per-field OCR confidence and source spans"
+    )
+    parser.add_argument(
+        '--fields', type=field_list, metavar='FIELD[,FIELD...]',
+        help="Only extract and write these fields, e.g. --fields date,time,venue "
+             f"(default: all of {', '.join(FIELD_KEYS)})"
+    )
+    parser.add_argument(
+        '--confidence', action='store_true',
+        help="Add a \"<field> Confidence\" column with the mean OCR confidence "
+             "of the words every field was read from (records always have it)"
+    )
+    parser.add_argument(
+        '--event-name-mode', choices=EVENT_NAME_MODES, default='text',
+        help="Pick the event name from the text-only strategy cascade "
+             "or from OCR layout (largest, topmost text) (default: text)"
+    )
+    parser.add_argument(
+        '--cache', dest='cache_path',
+        help="SQLite file for OCR results, reused across runs and by the web app"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="Always run OCR, even for posters seen before"
+    )
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.decode_workers < 1 or args.parse_workers < 1:
+        parser.error("--decode-workers and --parse-workers must be at least 1")
+    if args.processes < 0:
+        parser.error("--processes cannot be negative")
+    if (args.det_batch_size is not None and args.det_batch_size < 1) or \
+            (args.reco_batch_size is not None and args.reco_batch_size < 1):
+        parser.error("--det-batch-size and --reco-batch-size must be at least 1")
+    if args.max_side is not None and args.max_side < 32:
+        parser.error("--max-side must be at least 32")
+    if args.sync_every < 0:
+        parser.error("--sync-every cannot be negative")
+    if detect_format(args.output, args.output_format) == 'parquet' and not args.output:
+        parser.error("Parquet output needs --output")
+    if args.records and detect_format(args.output, args.output_format) != 'jsonl':
+        parser.error("--records needs JSONL output")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.slow_log:
+        metrics.configure_slow_log(args.slow_log, args.slow_threshold_ms)
+        # Worker processes (--processes) read the log settings from the environment
+        os.environ['POSTER_SLOW_LOG'] = args.slow_log
+        os.environ['POSTER_SLOW_THRESHOLD_MS'] = str(args.slow_threshold_ms)
+    if args.ocr_mode or args.ocr_profile or args.det_batch_size or args.reco_batch_size:
+        mode = args.ocr_mode or app_advanced.OCR_MODE
+        profile = args.ocr_profile or app_advanced.OCR_PROFILE
+        det_batch_size = args.det_batch_size or app_advanced.OCR_DET_BATCH_SIZE
+        reco_batch_size = args.reco_batch_size or app_advanced.OCR_RECO_BATCH_SIZE
+        configure_ocr_model(mode, profile, det_batch_size, reco_batch_size)
+        # Worker processes load their own predictor from the environment
+        os.environ['POSTER_OCR_MODE'] = mode
+        os.environ['POSTER_OCR_PROFILE'] = profile
+        os.environ['POSTER_DET_BATCH_SIZE'] = str(det_batch_size or 0)
+        os.environ['POSTER_RECO_BATCH_SIZE'] = str(reco_batch_size or 0)
+    if args.max_side or args.grayscale or args.normalize_contrast or args.crop_borders or args.deskew:
+        configure_preprocessing(args.max_side, args.grayscale, args.normalize_contrast,
+                                args.crop_borders, args.deskew)
+        # Worker processes read the preprocessing settings from the environment too
+        os.environ['POSTER_MAX_SIDE'] = str(args.max_side or 0)
+        for name, enabled in [('POSTER_GRAYSCALE', args.grayscale),
+                              ('POSTER_NORMALIZE_CONTRAST', args.normalize_contrast),
+                              ('POSTER_CROP_BORDERS', args.crop_borders),
+                              ('POSTER_DESKEW', args.deskew)]:
+            os.environ[name] = '1' if enabled else '0'
+    processed, failed = run(
+        args.inputs,
+        output=args.output,
+        output_format=args.output_format,
+        batch_size=args.batch_size,
+        recursive=args.recursive,
+        include_text=args.include_text,
+        event_name_mode=args.event_name_mode,
+        use_cache=not args.no_cache,
+        cache_path=args.cache_path,
+        processes=args.processes,
+        decode_workers=args.decode_workers,
+        parse_workers=args.parse_workers,
+        sync_every=args.sync_every,
+        records=args.records,
+        confidence=args.confidence,
+        fields=args.fields,
+    )
+    if args.metrics_path:
+        metrics.write_metrics(args.metrics_path)
+    return 1 if processed and failed == processed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Benchmarks for the poster extractor.
+
+Run them from the repository root as modules, e.g.
+``python -m benchmarks.input_path``.
+"""
@@ -0,0 +1,97 @@
+"""Worst-case extractor latency on adversarial OCR text.
+
+    python -m benchmarks.adversarial --length 20000
+    python -m benchmarks.adversarial --length 5000 --unguarded
+
+The inputs target the patterns that backtrack heavily: long lines without
+line breaks, capitalized words with no venue keyword, "are invited" with no
+profession, keywords only at the very end, digit runs and OCR symbol noise.
+Every extractor is timed on every input with the line wrapping guard and
+time budget on (and, with ``--unguarded``, off for comparison; that can take
+minutes at larger lengths).
+"""
+import argparse
+import random
+import time
+
+from app_advanced import EXTRACTOR_BUDGET_MS, GUARD_MAX_LINE_CHARS, analyze_text, configure_extractor_guard
+from benchmarks.suite import EXTRACTORS
+
+CAPITALIZED_WORDS = "Lorem Ipsum Dolor Sit Amet Consectetur Adipiscing Elit Sed Eiusmod".split()
+LOWERCASE_WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed eiusmod".split()
+
+
+def repeat_words(words, length):
+    text = []
+    size = 0
+    i = 0
+    while size < length:
+        word = words[i % len(words)]
+        text.append(word)
+        size += len(word) + 1
+        i += 1
+    return " ".join(text)
+
+
+def adversarial_texts(length=20000, seed=0):
+    """Named adversarial OCR texts of roughly length characters each"""
+    rng = random.Random(seed)
+    return {
+        "long capitalized line": repeat_words(CAPITALIZED_WORDS, length),
+        "long lowercase line": repeat_words(LOWERCASE_WORDS, length),
+        "keyword at the end": repeat_words(CAPITALIZED_WORDS, length) + " conference hall",
+        "invited without audience": "\n".join(
+            repeat_words(LOWERCASE_WORDS, 150) + " are invited" for _ in range(length // 160)
+        ),
+        "digit runs": " ".join(str(rng.randint(0, 99)) for _ in range(length // 3)),
+        "symbol noise": "".join(rng.choice("|-:/.,;()[]{}@#$%&*+=_~ ") for _ in range(length)),
+    }
+
+
+def measure(texts, repeat=1):
+    """Max latency in ms of every extractor on every text"""
+    results = {}
+    for name, text in texts.items():
+        timings = {}
+        for _ in range(repeat):
+            analysis = analyze_text(text)
+            for _, stage, extractor in EXTRACTORS:
+                start = time.perf_counter()
+                extractor(text, None, analysis)
+                elapsed = (time.perf_counter() - start) * 1000
+                timings[stage] = max(timings.get(stage, 0.0), elapsed)
+        results[name] = timings
+    return results
+
+
+def print_results(label, results):
+    print(label)
+    for name, timings in results.items():
+        stage, worst = max(timings.items(), key=lambda item: item[1])
+        print(f"  {name:<26} total {sum(timings.values()):9.1f} ms   "
+              f"slowest {stage} {worst:9.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--length', type=int, default=20000, help="Characters per adversarial text")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--unguarded', action='store_true',
+                        help="Also run with the time budget and line wrapping disabled")
+    args = parser.parse_args(argv)
+
+    texts = adversarial_texts(args.length)
+    print_results(f"guarded (budget {EXTRACTOR_BUDGET_MS:g} ms, lines wrapped at "
+                  f"{GUARD_MAX_LINE_CHARS} chars)", measure(texts, args.repeat))
+
+    if args.unguarded:
+        budget_ms, max_line_chars = EXTRACTOR_BUDGET_MS, GUARD_MAX_LINE_CHARS
+        configure_extractor_guard(budget_ms=0, max_line_chars=0)
+        try:
+            print_results("unguarded", measure(texts, args.repeat))
+        finally:
+            configure_extractor_guard(budget_ms, max_line_chars)
+
+
+if __name__ == "__main__":
+    main()
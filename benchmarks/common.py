@@ -0,0 +1,59 @@
+"""Small timing and memory helpers shared by the benchmark scripts"""
+import statistics
+import time
+import tracemalloc
+
+
+def time_calls(fn, repeat, warmup=1):
+    """Call fn() repeatedly and return the per-call latencies in seconds"""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(timings):
+    """Latency summary in milliseconds"""
+    return {
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "calls": len(timings),
+    }
+
+
+def measure_peak_memory(fn):
+    """Run fn() once under tracemalloc and return the peak traced bytes"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def format_row(label, stats, width=28):
+    """One aligned line of benchmark output"""
+    return (f"{label:<{width}} mean {stats['mean_ms']:9.3f} ms   "
+            f"p50 {stats['p50_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms")
+
+
+def parse_size(value):
+    """Parse a WIDTHxHEIGHT command line argument"""
+    width, height = value.lower().split('x')
+    return int(width), int(height)
@@ -0,0 +1,83 @@
+"""Effect of skipping low-confidence OCR words on accuracy, candidates and latency.
+
+    python -m benchmarks.confidence --noise-lines 10 --repeat 50
+
+Every sample poster gets ``--noise-lines`` extra OCR lines with word
+confidences below 0.3, the way DocTR reads background texture, logos and
+smudges: price- and venue-like fragments, stray capitalized words and
+garbage, some of them title-sized. Each poster is extracted with every word
+kept (threshold 0) and with the given thresholds. The report has the
+field-level accuracy against the samples' ground truth, the number of venue
+and price pattern matches the extractors had to consider and the
+extraction latency.
+"""
+import argparse
+import random
+
+import app_advanced
+from app_advanced import (
+    MIN_WORD_CONFIDENCE, PRICE_PATTERNS, VENUE_PATTERNS, OcrDocument, OcrLine, analyze_text,
+    configure_word_confidence, extract_info,
+)
+from benchmarks.common import format_row, summarize, time_calls
+from benchmarks.samples import BODY, SAMPLE_POSTERS, TITLE, sample_document
+from benchmarks.suite import score
+
+NOISE_WORDS = [
+    "Rs", "450", "$", "99", "€12", "Hall", "Auditorium", "Centre", "Venue", "at", "GRAND",
+    "OPENING", "Plaza", "Free", "Entry", "lI1|", "~~", "Tlcket", "Sale", "Club", "Arena",
+]
+
+
+def add_noise(document, lines, seed=0):
+    """The document with ``lines`` low-confidence lines inserted at random positions"""
+    rng = random.Random(seed)
+    result = list(document.lines)
+    for number in range(lines):
+        text = ' '.join(rng.choice(NOISE_WORDS) for _ in range(rng.randint(2, 6)))
+        height = TITLE * 1.2 if rng.random() < 0.2 else BODY
+        top = rng.random() * 0.9
+        # A block of its own, so it never merges with the poster's lines
+        result.insert(rng.randint(0, len(result)),
+                      OcrLine(text, (0.1, top, 0.9, top + height), rng.uniform(0.05, 0.25), -1 - number))
+    return OcrDocument.from_lines(result)
+
+
+def candidate_count(document):
+    """Venue and price pattern matches in the text the extractors search"""
+    text = analyze_text(document.text, document).confident_text
+    venue_text = text.replace('\n', ' | ')
+    return (sum(1 for pattern, _ in VENUE_PATTERNS for _ in pattern.finditer(venue_text))
+            + sum(1 for pattern, _ in PRICE_PATTERNS for _ in pattern.finditer(text)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--noise-lines', type=int, default=10, help="Low-confidence lines per poster")
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[MIN_WORD_CONFIDENCE])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    documents = [add_noise(sample_document(poster), args.noise_lines, seed=index)
+                 for index, poster in enumerate(SAMPLE_POSTERS)]
+    corpus = [(poster, None) for poster in SAMPLE_POSTERS]
+
+    print(f"{len(documents)} posters, {args.noise_lines} low-confidence lines each")
+    default = app_advanced.MIN_WORD_CONFIDENCE
+    try:
+        for threshold in [0.0] + args.thresholds:
+            configure_word_confidence(threshold)
+            predictions = [extract_info(document.text, document).to_dict() for document in documents]
+            _, accuracy = score(corpus, predictions)
+            candidates = sum(map(candidate_count, documents))
+            timings = time_calls(
+                lambda: [extract_info(document.text, document) for document in documents], args.repeat)
+            label = f"threshold {threshold:g}"
+            print(f"  {label:<16} accuracy {accuracy:6.1%}   {candidates:5d} venue/price candidates")
+            print("    " + format_row("extract all posters", summarize(timings), width=24))
+    finally:
+        configure_word_confidence(default)
+
+
+if __name__ == "__main__":
+    main()
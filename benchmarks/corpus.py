@@ -0,0 +1,82 @@
+"""Synthetic poster images with known ground truth, rendered offline with PIL.
+
+Every sample poster from ``benchmarks.samples`` is drawn top to bottom with
+its relative text heights, on a seeded random background, so OCR runs on
+real pixels while the expected fields stay known. ``render_corpus`` returns
+PNG bytes, so decoding is part of what gets measured.
+"""
+import io
+import random
+
+from PIL import Image, ImageDraw, ImageFont
+
+from benchmarks.samples import SAMPLE_POSTERS
+
+# Tried in order; Pillow searches the system font directories
+FONT_NAMES = ['DejaVuSans-Bold.ttf', 'DejaVuSans.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf']
+
+
+def load_font(size):
+    """A scalable font of the given pixel size, or Pillow's built-in fallback"""
+    for name in FONT_NAMES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def fit_font(draw, text, size, max_width):
+    """Shrink the font until text fits in max_width pixels"""
+    while size > 8:
+        font = load_font(size)
+        if draw.textlength(text, font=font) <= max_width:
+            return font
+        size = int(size * 0.9)
+    return load_font(size)
+
+
+def render_poster(poster, size=(1024, 1448), seed=0):
+    """Draw one sample poster and return it as an RGB PIL image"""
+    width, height = size
+    rng = random.Random(seed)
+    background = tuple(rng.randint(200, 255) for _ in range(3))
+    ink = tuple(rng.randint(0, 60) for _ in range(3))
+
+    image = Image.new('RGB', size, background)
+    draw = ImageDraw.Draw(image)
+
+    # A few faint decorative shapes so the detector sees more than text
+    for _ in range(6):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randint(width // 20, width // 6)
+        shade = tuple(max(0, channel - rng.randint(10, 30)) for channel in background)
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=shade)
+
+    top = 0.05 * height
+    for block in poster["blocks"]:
+        for line, relative_height in block:
+            font = fit_font(draw, line, int(relative_height * height), 0.9 * width)
+            line_width = draw.textlength(line, font=font)
+            draw.text(((width - line_width) / 2, top), line, font=font, fill=ink)
+            top += relative_height * height * 1.4
+        top += 0.04 * height
+    return image
+
+
+def render_corpus(copies=1, size=(1024, 1448), seed=0):
+    """Render every sample poster ``copies`` times with different backgrounds.
+
+    Returns ``(poster, png_bytes)`` pairs.
+    """
+    corpus = []
+    for copy in range(copies):
+        for index, poster in enumerate(SAMPLE_POSTERS):
+            buffer = io.BytesIO()
+            render_poster(poster, size, seed=seed + copy * len(SAMPLE_POSTERS) + index).save(buffer, format='PNG')
+            corpus.append((poster, buffer.getvalue()))
+    return corpus
@@ -0,0 +1,57 @@
+"""Text-to-fields throughput of the regex extractors.
+
+    python -m benchmarks.extractors --repeat 200
+
+Runs ``extract_fields`` and every individual extractor over the sample
+poster texts and reports posters per second. No OCR is involved.
+"""
+import argparse
+import time
+
+import app_advanced
+from benchmarks.samples import SAMPLE_TEXTS
+
+EXTRACTORS = [
+    "extract_event_name",
+    "extract_date",
+    "extract_time",
+    "extract_venue",
+    "extract_profession",
+    "determine_event_type",
+    "extract_phone_numbers",
+    "extract_email",
+    "extract_social_media",
+    "extract_price",
+]
+
+
+def throughput(fn, texts, repeat):
+    """Posters per second for fn over texts, repeated repeat times"""
+    # Warm up once so one-off costs don't skew the first measurement
+    for text in texts:
+        fn(text)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    elapsed = time.perf_counter() - start
+    return repeat * len(texts) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=100,
+                        help="Passes over the sample corpus")
+    args = parser.parse_args(argv)
+
+    print(f"{len(SAMPLE_TEXTS)} sample posters x {args.repeat} passes\n")
+    total = throughput(app_advanced.extract_fields, SAMPLE_TEXTS, args.repeat)
+    print(f"{'extract_fields':<24} {total:10.1f} posters/s")
+    print()
+    for name in EXTRACTORS:
+        rate = throughput(getattr(app_advanced, name), SAMPLE_TEXTS, args.repeat)
+        print(f"{name:<24} {rate:10.1f} posters/s   {1000.0 / rate:8.3f} ms/poster")
+
+
+if __name__ == "__main__":
+    main()
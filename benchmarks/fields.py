@@ -0,0 +1,61 @@
+"""Cost of extracting each field on its own, and of common field sets.
+
+    python -m benchmarks.fields --repeat 200
+    python -m benchmarks.fields --sets date,time,venue event_name,date --noise-lines 10
+
+Every sample poster is extracted with ``extract_info(..., fields=[field])``
+for one field at a time, so each figure includes the shared analysis work
+(lowercasing, line split, keyword scan) that field needs and the fields it
+depends on, as a consumer asking only for it would pay. The report has the
+latency for all sample posters per field and per ``--sets`` entry, next to
+extracting every field, so consumers can pick the set they need.
+``--noise-lines`` adds low-confidence OCR lines as in benchmarks.confidence.
+No OCR is involved.
+"""
+import argparse
+
+from app_advanced import FIELD_DEPENDENCIES, FIELD_KEYS, extract_info, resolve_fields
+from benchmarks.common import format_row, summarize, time_calls
+from benchmarks.confidence import add_noise
+from benchmarks.samples import SAMPLE_POSTERS, sample_document
+
+DEFAULT_SETS = ['date,time,venue', 'event_name,date,venue', 'phones,emails,social_media']
+
+
+def measure(documents, fields, repeat):
+    return summarize(time_calls(
+        lambda: [extract_info(document.text, document, fields=fields) for document in documents], repeat))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--sets', nargs='+', default=DEFAULT_SETS,
+                        help="Comma-separated field sets to time together")
+    parser.add_argument('--noise-lines', type=int, default=0, help="Low-confidence lines per poster")
+    args = parser.parse_args(argv)
+
+    documents = [sample_document(poster) for poster in SAMPLE_POSTERS]
+    if args.noise_lines:
+        documents = [add_noise(document, args.noise_lines, seed=index)
+                     for index, document in enumerate(documents)]
+
+    every = measure(documents, None, args.repeat)
+    print(f"{len(documents)} posters, {args.repeat} runs each")
+    print("  " + format_row("all fields", every))
+    print("single fields (share of all fields)")
+    for key in FIELD_KEYS:
+        stats = measure(documents, [key], args.repeat)
+        dependencies = FIELD_DEPENDENCIES.get(key)
+        label = f"{key} (+{', '.join(dependencies)})" if dependencies else key
+        print(f"  {format_row(label, stats)}   {stats['mean_ms'] / every['mean_ms']:6.1%}")
+    print("field sets")
+    for field_set in args.sets:
+        fields = field_set.split(',')
+        stats = measure(documents, fields, args.repeat)
+        label = ','.join(resolve_fields(fields))
+        print(f"  {format_row(label, stats)}   {stats['mean_ms'] / every['mean_ms']:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Cost of flattening DocTR output into an OcrDocument, on large pages.
+
+    python -m benchmarks.flatten --words 500 5000 50000
+
+Synthetic DocTR-shaped pages (blocks of lines of words, each with a value,
+confidence and geometry) are flattened with ``page_to_document``, then the
+text is joined and the OcrLine view built. The flattening that came before
+the column-wise document (text and OcrLines built eagerly) and the original
+word-by-word ``+=`` concatenation are timed alongside for reference, as is
+the round trip through the OCR cache's dict form. (CPython usually extends a string in
+place when nothing else references it, so ``+=`` is only quadratic on
+other interpreters or when the partial text is shared.)
+"""
+import argparse
+import random
+from collections import namedtuple
+
+from app_advanced import OcrDocument, OcrLine, page_to_document
+from benchmarks.common import format_row, summarize, time_calls
+
+Word = namedtuple('Word', ['value', 'confidence', 'geometry'])
+Line = namedtuple('Line', ['words', 'geometry'])
+Block = namedtuple('Block', ['lines'])
+Page = namedtuple('Page', ['blocks'])
+
+WORDS_PER_LINE = 8
+LINES_PER_BLOCK = 10
+
+
+def make_page(words, seed=0):
+    """A DocTR-like page with about the given number of words"""
+    rng = random.Random(seed)
+    blocks = []
+    remaining = words
+    while remaining > 0:
+        lines = []
+        for _ in range(LINES_PER_BLOCK):
+            if remaining <= 0:
+                break
+            top = rng.random() * 0.95
+            count = min(WORDS_PER_LINE, remaining)
+            line_words = [
+                Word(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 10))),
+                     rng.random(), ((i / 10, top), (i / 10 + 0.09, top + 0.02)))
+                for i in range(count)
+            ]
+            lines.append(Line(line_words, ((0.0, top), (0.9, top + 0.02))))
+            remaining -= count
+        blocks.append(Block(lines))
+    return Page(blocks)
+
+
+def concatenate(page):
+    """The original flattening: one string grown with += per word"""
+    text = ""
+    for block in page.blocks:
+        for line in block.lines:
+            for word in line.words:
+                text += word.value + " "
+            text += "\n"
+        text += "\n"
+    return text
+
+
+def previous_page_to_document(page):
+    """The flattening before OcrDocument was column-wise: the text and one
+    OcrLine per line, both built up front"""
+    parts = []
+    lines = []
+    for block_index, block in enumerate(page.blocks):
+        for line in block.lines:
+            values = [word.value for word in line.words]
+            for value in values:
+                parts.append(value + " ")
+            parts.append("\n")
+            confidences = [word.confidence for word in line.words]
+            confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            xs = [point[0] for point in line.geometry]
+            ys = [point[1] for point in line.geometry]
+            box = (min(xs), min(ys), max(xs), max(ys))
+            lines.append(OcrLine(' '.join(values), box, confidence, block_index))
+        parts.append("\n")
+    return ''.join(parts), lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, nargs='+', default=[500, 5000, 50000],
+                        help="Words per synthetic page")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for words in args.words:
+        page = make_page(words)
+        document = page_to_document(page)
+        data = document.to_dict()
+        print(f"{words} words")
+        for label, fn in [
+            ("+= concatenation", lambda: concatenate(page)),
+            ("previous text and lines", lambda: previous_page_to_document(page)),
+            ("page_to_document", lambda: page_to_document(page)),
+            ("  + text", lambda: page_to_document(page).text),
+            ("  + text and lines", lambda: page_to_document(page).lines),
+            ("to_dict / from_dict", lambda: OcrDocument.from_dict(document.to_dict())),
+            ("from_dict + text", lambda: OcrDocument.from_dict(data).text),
+        ]:
+            print("  " + format_row(label, summarize(time_calls(fn, args.repeat)), width=26))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Cold import time of app_advanced and the heavy modules it pulls in.
+
+    python -m benchmarks.import_time --repeat 10
+    python -m benchmarks.import_time --model
+
+Every run starts a fresh interpreter, imports ``app_advanced`` and calls a
+text-only extractor, then reports which of gradio, pandas, torch and doctr
+ended up loaded. Pass ``--model`` to also time the first ``get_model()``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import summarize
+
+HEAVY_MODULES = ['gradio', 'pandas', 'torch', 'doctr']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app_advanced
+imported = time.perf_counter()
+app_advanced.extract_date("Saturday May 20th, 2025")
+app_advanced.extract_venue("Venue: City Convention Center")
+extracted = time.perf_counter()
+result = {
+    "import": imported - start,
+    "first_extract": extracted - imported,
+    "loaded": [name for name in %(heavy)r if name in sys.modules],
+}
+if %(model)r:
+    app_advanced.get_model()
+    result["model"] = time.perf_counter() - extracted
+print(json.dumps(result))
+"""
+
+
+def probe(load_model=False):
+    """Run the import probe in a fresh interpreter and return its measurements"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = PROBE % {"heavy": HEAVY_MODULES, "model": load_model}
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=root, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--model', action='store_true',
+                        help="Also time loading the OCR predictor")
+    args = parser.parse_args(argv)
+
+    runs = [probe(args.model) for _ in range(args.repeat)]
+
+    for label, key in [("import app_advanced", "import"),
+                       ("first text extraction", "first_extract"),
+                       ("get_model()", "model")]:
+        if key not in runs[0]:
+            continue
+        stats = summarize([run[key] for run in runs])
+        print(f"{label:<24} mean {stats['mean_ms']:9.1f} ms   "
+              f"p50 {stats['p50_ms']:9.1f} ms   max {max(run[key] for run in runs) * 1000:9.1f} ms")
+
+    loaded = runs[0]["loaded"]
+    print(f"heavy modules loaded by the import: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
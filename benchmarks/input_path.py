@@ -0,0 +1,93 @@
+"""Compare the old temp-file JPEG input path with the in-memory path.
+
+    python -m benchmarks.input_path --sizes 1024x1448 3024x4032 --repeat 20
+
+The old path encoded every upload to a temporary JPEG, reloaded it with
+``DocumentFile.from_images`` and unlinked it. The in-memory path hands the
+decoded pixels straight to the predictor. Pass ``--ocr`` to include the
+DocTR forward pass in the timings.
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image, ImageDraw
+from doctr.io import DocumentFile
+
+from app_advanced import image_to_array
+from benchmarks.common import format_row, measure_peak_memory, parse_size, summarize, time_calls
+
+
+def make_poster(width, height):
+    """Render a poster-like RGB image with gradients, blocks and text"""
+    gradient = np.linspace(0, 255, width, dtype=np.uint8)
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[..., 0] = gradient
+    pixels[..., 1] = gradient[::-1]
+    pixels[..., 2] = 128
+    img = Image.fromarray(pixels)
+    draw = ImageDraw.Draw(img)
+    for i in range(20):
+        top = int(height * (i + 1) / 22)
+        draw.rectangle([width // 10, top, width * 9 // 10, top + height // 60], fill=(255, 255, 255))
+        draw.text((width // 8, top), f"Annual Tech Summit 2025 - line {i}", fill=(0, 0, 0))
+    return np.asarray(img)
+
+
+def tempfile_roundtrip(image):
+    """The previous extract_poster_info input path, kept for comparison"""
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
+    temp_filename = temp_file.name
+    temp_file.close()
+    try:
+        Image.fromarray(image.astype('uint8')).save(temp_filename)
+        return DocumentFile.from_images([temp_filename])
+    finally:
+        os.unlink(temp_filename)
+
+
+def in_memory(image):
+    """The current extract_poster_info input path"""
+    return [image_to_array(image)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', type=parse_size,
+                        default=[(1024, 1448), (3024, 4032)],
+                        help="Image sizes as WIDTHxHEIGHT")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--ocr', action='store_true',
+                        help="Include the DocTR forward pass in each call")
+    args = parser.parse_args(argv)
+
+    if args.ocr:
+        from app_advanced import get_model
+        model = get_model()
+        paths = {
+            "temp-file JPEG": lambda img: model(tempfile_roundtrip(img)),
+            "in-memory": lambda img: model(in_memory(img)),
+        }
+    else:
+        paths = {
+            "temp-file JPEG": tempfile_roundtrip,
+            "in-memory": in_memory,
+        }
+
+    for width, height in args.sizes:
+        image = make_poster(width, height)
+        print(f"\n{width}x{height} ({image.nbytes / 1e6:.1f} MB decoded)")
+        baseline = None
+        for label, fn in paths.items():
+            stats = summarize(time_calls(lambda: fn(image), args.repeat))
+            peak = measure_peak_memory(lambda: fn(image))
+            print(f"{format_row(label, stats, width=16)}   peak alloc {peak / 1e6:8.2f} MB")
+            if baseline is None:
+                baseline = stats
+            else:
+                print(f"{'':<16} {baseline['mean_ms'] / stats['mean_ms']:.1f}x faster per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Event name accuracy and speed: text cascade vs. layout-aware extraction.
+
+    python -m benchmarks.layout --repeat 200
+
+Both extractors run over the sample posters (laid out with their text
+heights) and are scored against the expected event names.
+"""
+import argparse
+import time
+
+from app_advanced import analyze_text, extract_event_name, extract_event_name_from_layout
+from benchmarks.samples import SAMPLE_POSTERS, sample_document
+
+
+def normalize(name):
+    return ' '.join(name.lower().split())
+
+
+def evaluate(extract, documents, repeat):
+    """Return (accuracy, ms per poster, predictions) for one extractor"""
+    predictions = [extract(document) for document in documents]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for document in documents:
+            extract(document)
+    elapsed = time.perf_counter() - start
+    correct = sum(
+        normalize(prediction) == normalize(poster["title"])
+        for prediction, poster in zip(predictions, SAMPLE_POSTERS)
+    )
+    return correct / len(documents), elapsed * 1000 / (repeat * len(documents)), predictions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--verbose', action='store_true', help="Print every prediction")
+    args = parser.parse_args(argv)
+
+    documents = [sample_document(poster) for poster in SAMPLE_POSTERS]
+    modes = {
+        "text cascade": lambda document: extract_event_name(document.text, analyze_text(document.text)),
+        "layout": lambda document: extract_event_name_from_layout(document, analyze_text(document.text)),
+    }
+
+    for label, extract in modes.items():
+        accuracy, ms_per_poster, predictions = evaluate(extract, documents, args.repeat)
+        print(f"{label:<14} accuracy {accuracy:6.1%}   {ms_per_poster:7.3f} ms/poster")
+        if args.verbose:
+            for prediction, poster in zip(predictions, SAMPLE_POSTERS):
+                marker = ' ' if normalize(prediction) == normalize(poster["title"]) else 'x'
+                print(f"  {marker} {prediction!r:50} expected {poster['title']!r}")
+
+
+if __name__ == "__main__":
+    main()
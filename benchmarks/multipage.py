@@ -0,0 +1,151 @@
+"""Peak memory and latency of multi-page PDF and TIFF ingestion.
+
+    python -m benchmarks.multipage --pages 100
+    python -m benchmarks.multipage --pages 100 --format tiff --no-ocr
+
+The rendered sample posters are repeated into one ``--pages`` page document.
+Each strategy runs in a fresh interpreter, so its peak RSS is its own:
+
+- ``upfront``: rasterize every page first (as ``DocumentFile.from_pdf``
+  does), then recognize them ``--batch-size`` at a time
+- ``stream``: ``extract_document``, which renders ``--batch-size`` pages,
+  recognizes them and lets them go before rendering the next batch
+
+``--no-ocr`` only renders the pages, which isolates the rasterization
+memory and needs no model. The report has the wall time, the peak of
+traced (Python and NumPy) allocations and the peak RSS of the run, minus
+the RSS the interpreter had after loading the model.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import measure_peak_memory, parse_size
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STRATEGIES = ('upfront', 'stream')
+
+
+def build_document(path, output_format, pages, size, seed=0):
+    """Write the sample posters, repeated up to ``pages`` pages, as a PDF or TIFF"""
+    from benchmarks.corpus import render_poster
+    from benchmarks.samples import SAMPLE_POSTERS
+
+    posters = [render_poster(poster, size, seed=seed + index)
+               for index, poster in enumerate(SAMPLE_POSTERS)]
+    images = [posters[number % len(posters)] for number in range(pages)]
+    if output_format == 'pdf':
+        # At 144 dpi pdfium's default 2x scale renders the posters at their own size
+        images[0].save(path, format='PDF', save_all=True, append_images=images[1:], resolution=144)
+    else:
+        images[0].save(path, format='TIFF', save_all=True, append_images=images[1:],
+                       compression='tiff_deflate')
+
+
+def max_rss():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else None
+
+
+def run_strategy(strategy, path, batch_size, ocr):
+    """Ingest the document once with one strategy and return the measurements"""
+    from app_advanced import extract_document, extract_records, merge_pages, ocr_entries
+    from documents import PageReader
+
+    if ocr:
+        # Load and warm up the predictor outside the measurements
+        with PageReader(path) as reader:
+            ocr_entries([reader.render(0)], use_cache=False)
+    baseline = max_rss()
+
+    def upfront():
+        with PageReader(path) as reader:
+            pages = list(reader)
+        if ocr:
+            results = []
+            for start in range(0, len(pages), batch_size):
+                results.extend(extract_records(pages[start:start + batch_size], use_cache=False))
+            merge_pages(results)
+
+    def stream():
+        if ocr:
+            extract_document(path, batch_size, use_cache=False)
+            return
+        with PageReader(path) as reader:
+            for start in range(0, len(reader), batch_size):
+                pages = [reader.render(number)
+                         for number in range(start, min(start + batch_size, len(reader)))]
+                del pages
+
+    start = time.perf_counter()
+    traced_peak = measure_peak_memory(upfront if strategy == 'upfront' else stream)
+    seconds = time.perf_counter() - start
+    peak = max_rss()
+    return {
+        "seconds": seconds,
+        "traced_peak_bytes": traced_peak,
+        "max_rss_bytes": peak,
+        "rss_growth_bytes": peak - baseline if peak is not None else None,
+    }
+
+
+def run_isolated(strategy, path, batch_size, ocr):
+    """run_strategy in a fresh interpreter"""
+    command = [sys.executable, '-m', 'benchmarks.multipage', '--child', strategy, path,
+               '--batch-size', str(batch_size)]
+    if not ocr:
+        command.append('--no-ocr')
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def megabytes(value):
+    return f"{value / 1e6:8.0f}MB" if value is not None else f"{'n/a':>10}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--format', dest='output_format', choices=['pdf', 'tiff'], default='pdf')
+    parser.add_argument('--size', type=parse_size, default=(1024, 1448),
+                        help="Page size in pixels as WIDTHxHEIGHT")
+    parser.add_argument('--batch-size', type=int, default=4, help="Pages per OCR forward pass")
+    parser.add_argument('--strategies', nargs='+', choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument('--no-ocr', action='store_true', help="Only render the pages")
+    parser.add_argument('--child', nargs=2, metavar=('STRATEGY', 'PATH'), help=argparse.SUPPRESS)
+    parser.add_argument('-o', '--output', help="Write the measurements as JSON")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        strategy, path = args.child
+        print(json.dumps(run_strategy(strategy, path, args.batch_size, not args.no_ocr)))
+        return
+
+    reports = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'brochure.' + args.output_format)
+        build_document(path, args.output_format, args.pages, args.size)
+        print(f"{args.pages}-page {args.output_format.upper()} at {args.size[0]}x{args.size[1]}, "
+              f"{os.path.getsize(path) / 1e6:.1f}MB on disk, batches of {args.batch_size}"
+              f"{', render only' if args.no_ocr else ''}")
+        print(f"{'strategy':<10} {'seconds':>8} {'traced peak':>12} {'max RSS':>10} {'RSS growth':>11}")
+        for strategy in args.strategies:
+            report = reports[strategy] = run_isolated(strategy, path, args.batch_size, not args.no_ocr)
+            print(f"{strategy:<10} {report['seconds']:8.2f} {megabytes(report['traced_peak_bytes']):>12} "
+                  f"{megabytes(report['max_rss_bytes'])} {megabytes(report['rss_growth_bytes']):>11}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
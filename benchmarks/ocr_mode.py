@@ -0,0 +1,76 @@
+"""Latency, memory and accuracy of the OCR model profiles and inference modes.
+
+    python -m benchmarks.ocr_mode --copies 2 --repeat 2
+    python -m benchmarks.ocr_mode --modes eager int8
+    python -m benchmarks.ocr_mode --profiles fast balanced accurate --reco-batch-size 256
+
+Every profile and mode combination runs the full benchmark suite
+(``benchmarks.suite``) on the rendered sample corpus in a fresh interpreter
+with ``POSTER_OCR_PROFILE`` and ``POSTER_OCR_MODE`` set, so model load time
+and peak RSS are measured separately for each. The suite warms the predictor up on one poster
+first; with ``compile`` that includes compiling the models, but new image
+shapes can still trigger recompilation during the timed run.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from app_advanced import OCR_MODES, OCR_PROFILES
+
+
+def run_mode(mode, copies, repeat, size, profile='balanced', det_batch_size=0, reco_batch_size=0):
+    """Run the suite with one OCR profile and mode and return its report"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'report.json')
+        env = dict(os.environ, POSTER_OCR_MODE=mode, POSTER_OCR_PROFILE=profile,
+                   POSTER_DET_BATCH_SIZE=str(det_batch_size),
+                   POSTER_RECO_BATCH_SIZE=str(reco_batch_size))
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.suite', '--copies', str(copies),
+             '--repeat', str(repeat), '--size', size, '-o', output],
+            env=env, check=True, stdout=subprocess.DEVNULL,
+        )
+        with open(output, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def print_row(label, report):
+    ocr = report["stages"]["ocr"]
+    rss = report["memory"].get("max_rss_bytes")
+    print(f"{label:<18} {report['model_load_s']:7.2f} {ocr['p50_ms']:7.1f}ms {ocr['p95_ms']:7.1f}ms "
+          f"{report['stages']['total']['p50_ms']:8.1f}ms "
+          f"{(f'{rss / 1e6:7.0f}MB' if rss else 'n/a'):>9} {report['overall_accuracy'] * 100:8.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', choices=list(OCR_PROFILES), default=['balanced'])
+    parser.add_argument('--modes', nargs='+', choices=OCR_MODES, default=list(OCR_MODES))
+    parser.add_argument('--det-batch-size', type=int, default=0, help="0 keeps DocTR's default")
+    parser.add_argument('--reco-batch-size', type=int, default=0, help="0 keeps DocTR's default")
+    parser.add_argument('--copies', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--size', default='1024x1448', help="Poster size as WIDTHxHEIGHT")
+    parser.add_argument('-o', '--output', help="Write all reports as JSON, keyed by profile/mode")
+    args = parser.parse_args(argv)
+
+    reports = {}
+    print(f"{'profile/mode':<18} {'load s':>7} {'ocr p50':>9} {'ocr p95':>9} {'total p50':>10} "
+          f"{'max RSS':>9} {'accuracy':>9}")
+    for profile in args.profiles:
+        for mode in args.modes:
+            label = f"{profile}/{mode}"
+            report = reports[label] = run_mode(mode, args.copies, args.repeat, args.size, profile,
+                                               args.det_batch_size, args.reco_batch_size)
+            print_row(label, report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
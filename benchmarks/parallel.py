@@ -0,0 +1,73 @@
+"""Throughput scaling of process-pool extraction from 1 to N workers.
+
+    python -m benchmarks.parallel --posters 64 --workers 1 2 4 8 16 32
+
+Synthetic posters are rendered to a temporary directory once. For every
+worker count the pool is started and warmed up (each worker loads its
+predictor) before the timed run, with the OCR cache disabled.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from PIL import Image
+
+from benchmarks.common import parse_size
+from benchmarks.input_path import make_poster
+from parallel import ParallelExtractor, threads_per_worker
+
+
+def default_worker_counts():
+    counts = []
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        counts.append(workers)
+        workers *= 2
+    return counts
+
+
+def render_posters(directory, count, size):
+    """Write count synthetic posters as PNG files and return their paths"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"poster_{i:04d}.png")
+        Image.fromarray(make_poster(*size)).save(path)
+        paths.append(path)
+    return paths
+
+
+def measure(paths, workers, batch_size):
+    """Posters per second for one worker count, excluding pool startup"""
+    with ParallelExtractor(workers=workers, batch_size=batch_size, use_cache=False) as extractor:
+        # One shard per worker so every process has loaded its model
+        list(extractor.run(paths[:workers * batch_size]))
+        start = time.perf_counter()
+        results = list(extractor.run(paths))
+        elapsed = time.perf_counter() - start
+    failed = sum(result.error is not None for result in results)
+    return len(paths) / elapsed, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posters', type=int, default=64)
+    parser.add_argument('--size', type=parse_size, default=(1024, 1448),
+                        help="Poster size as WIDTHxHEIGHT")
+    parser.add_argument('--workers', type=int, nargs='+', default=default_worker_counts())
+    parser.add_argument('--batch-size', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = render_posters(directory, args.posters, args.size)
+        baseline = None
+        for workers in args.workers:
+            throughput, failed = measure(paths, workers, args.batch_size)
+            baseline = baseline or throughput
+            print(f"{workers:>3} workers x {threads_per_worker(workers):>2} threads   "
+                  f"{throughput:8.2f} posters/s   speedup {throughput / baseline:5.2f}x"
+                  + (f"   ({failed} failed)" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
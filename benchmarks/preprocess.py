@@ -0,0 +1,90 @@
+"""Latency and accuracy of OCR at different preprocessing resolutions.
+
+    python -m benchmarks.preprocess --size 3024x4032 --max-side 0 2048 1600 1280 1024
+    python -m benchmarks.preprocess --max-side 1600 --grayscale --normalize-contrast --crop-borders
+    python -m benchmarks.preprocess --max-side 1600 --tilt 5 --deskew
+
+The sample posters are rendered at phone-photo size (12MP by default) and
+decoded once. For every ``--max-side`` value (0 keeps the full resolution)
+each poster is preprocessed, recognized and parsed with the OCR cache off;
+the report has the per-poster latency and the field accuracy against the
+samples' ground truth. ``--tilt`` rotates the rendered posters by that many
+degrees first, to measure what ``--deskew`` recovers.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app_advanced import configure_preprocessing, get_model, ocr_entries, parse_entry
+from benchmarks.common import parse_size, summarize
+from benchmarks.suite import decode_png, score
+
+
+def tilt(page, degrees):
+    """page rotated counterclockwise, as a photo taken at an angle"""
+    from PIL import Image
+    return np.asarray(Image.fromarray(page).rotate(degrees, resample=Image.BILINEAR, expand=True,
+                                                   fillcolor=(255, 255, 255)))
+
+
+def run_setting(pages, corpus, max_side, grayscale, normalize_contrast, crop_borders, repeat,
+                deskew=False):
+    """(latency summary, overall accuracy, per-field accuracy) for one setting"""
+    configure_preprocessing(max_side or None, grayscale, normalize_contrast, crop_borders, deskew)
+    timings = []
+    predictions = []
+    for i in range(repeat):
+        for page in pages:
+            start = time.perf_counter()
+            keys, entries = ocr_entries([page], use_cache=False)
+            _, info = parse_entry(keys[0], entries[0])
+            timings.append(time.perf_counter() - start)
+            if i == 0:
+                predictions.append(info.to_dict())
+    accuracy, overall = score(corpus, predictions)
+    return summarize(timings), overall, accuracy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=parse_size, default=(3024, 4032),
+                        help="Rendered poster size as WIDTHxHEIGHT")
+    parser.add_argument('--max-side', type=int, nargs='+', default=[0, 2048, 1600, 1280, 1024],
+                        help="Longest image side to test; 0 means no resizing")
+    parser.add_argument('--grayscale', action='store_true')
+    parser.add_argument('--normalize-contrast', action='store_true')
+    parser.add_argument('--crop-borders', action='store_true')
+    parser.add_argument('--deskew', action='store_true')
+    parser.add_argument('--tilt', type=float, default=0.0,
+                        help="Rotate the rendered posters by this many degrees")
+    parser.add_argument('--copies', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from benchmarks.corpus import render_corpus
+    corpus = render_corpus(args.copies, args.size, args.seed)
+    pages = [decode_png(png) for _, png in corpus]
+    if args.tilt:
+        pages = [tilt(page, args.tilt) for page in pages]
+
+    # Load and warm up the predictor outside the timings
+    get_model()
+    ocr_entries(pages[:1], use_cache=False)
+
+    print(f"{len(pages)} posters at {args.size[0]}x{args.size[1]}")
+    print(f"{'max side':>9} {'mean':>10} {'p50':>10} {'p95':>10}   ms/poster   accuracy")
+    try:
+        for max_side in args.max_side:
+            stats, overall, _ = run_setting(pages, corpus, max_side, args.grayscale,
+                                            args.normalize_contrast, args.crop_borders, args.repeat,
+                                            args.deskew)
+            print(f"{max_side or 'full':>9} {stats['mean_ms']:10.1f} {stats['p50_ms']:10.1f} "
+                  f"{stats['p95_ms']:10.1f}   {'':9}   {overall * 100:7.1f}%")
+    finally:
+        configure_preprocessing()
+
+
+if __name__ == "__main__":
+    main()
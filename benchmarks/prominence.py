@@ -0,0 +1,90 @@
+"""Line prominence scoring: the original per-line lookup vs. scoring by position.
+
+    python -m benchmarks.prominence --lines 15 100 500 2000
+
+The original ``calculate_text_prominence`` scored one line at a time and
+looked it up with ``all_lines.index(line)``, which is quadratic in the
+number of lines. The current one passes each line's position to
+``line_prominence`` instead.
+"""
+import argparse
+import random
+
+from app_advanced import EDITION_RE, EVENT_KEYWORDS, YEAR_RE, calculate_text_prominence
+from benchmarks.common import format_row, summarize, time_calls
+from benchmarks.samples import SAMPLE_TEXTS
+
+
+def legacy_prominence(line, all_lines):
+    """Original per-line scorer, kept for comparison"""
+    score = 0
+    length = len(line.strip())
+    if 10 <= length <= 80:
+        score += 3
+    elif 5 <= length <= 100:
+        score += 2
+    elif length > 100:
+        score -= 2
+    position = all_lines.index(line) + 1
+    total_lines = len(all_lines)
+    if position <= 3:
+        score += 4
+    elif position <= 5:
+        score += 3
+    elif position <= total_lines * 0.3:
+        score += 2
+    words = line.strip().split()
+    if len(words) > 0:
+        title_case_count = sum(1 for word in words if word and word[0].isupper())
+        if title_case_count == len(words) and len(words) > 1:
+            score += 4
+        elif title_case_count >= len(words) * 0.7:
+            score += 3
+        if line.strip().isupper() and 3 <= len(words) <= 8:
+            score += 3
+        elif line.strip().isupper() and len(words) > 8:
+            score -= 1
+    if line.count('.') <= 1 and line.count(',') <= 2:
+        score += 1
+    if line.endswith(('!', '?')):
+        score += 1
+    if line.count(':') > 1 or line.count(';') > 0:
+        score -= 2
+    line_lower = line.lower()
+    for keyword in EVENT_KEYWORDS:
+        if keyword in line_lower:
+            score += 2
+            break
+    if YEAR_RE.search(line):
+        score += 1
+    if EDITION_RE.search(line_lower):
+        score += 2
+    return score
+
+
+def make_lines(count, seed=0):
+    """An OCR dump of count distinct lines built from the sample posters"""
+    rnd = random.Random(seed)
+    pool = [line.strip() for text in SAMPLE_TEXTS for line in text.split('\n') if line.strip()]
+    return [f"{rnd.choice(pool)} {i}" for i in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', nargs='+', type=int, default=[15, 100, 500, 2000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    for count in args.lines:
+        lines = make_lines(count)
+        legacy = summarize(time_calls(
+            lambda: [legacy_prominence(line, lines) for line in lines], args.repeat))
+        current = summarize(time_calls(lambda: calculate_text_prominence(lines), args.repeat))
+        print(f"\n{count} lines")
+        print(format_row("line lookup", legacy, width=16))
+        print(format_row("by position", current, width=16))
+        print(f"{'':<16} {legacy['mean_ms'] / current['mean_ms']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Memory and serialization cost of PosterInfo records against display dicts.
+
+    python -m benchmarks.records --records 100000
+
+Fields are extracted once from every sample poster; the report has the
+traced memory per record when that many records are held at once (built
+from their cached JSON form, so every record owns its strings, as in a
+real batch) and the time to serialize a record to a JSON line and to a
+CSV row.
+"""
+import argparse
+import csv
+import io
+import json
+
+from app_advanced import FIELD_NAMES, extract_info
+from benchmarks.common import format_row, measure_peak_memory, summarize, time_calls
+from benchmarks.samples import SAMPLE_POSTERS, sample_document
+from records import PosterInfo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    documents = [sample_document(poster) for poster in SAMPLE_POSTERS]
+    infos = [extract_info(document.text, document) for document in documents]
+    states = [json.dumps(info.to_state()) for info in infos]
+    dicts = [json.dumps(info.to_dict()) for info in infos]
+
+    def hold(build, serialized):
+        return lambda: [build(serialized[index % len(serialized)]) for index in range(args.records)]
+
+    dict_bytes = measure_peak_memory(hold(json.loads, dicts)) / args.records
+    record_bytes = measure_peak_memory(
+        hold(lambda state: PosterInfo.from_state(json.loads(state)), states)) / args.records
+    print(f"{args.records} records held at once")
+    print(f"  display dict   {dict_bytes:8.0f} bytes/record")
+    print(f"  PosterInfo     {record_bytes:8.0f} bytes/record (with confidences and spans)")
+
+    buffer = io.StringIO()
+    dict_writer = csv.DictWriter(buffer, fieldnames=FIELD_NAMES)
+    row_writer = csv.writer(buffer)
+    info = infos[0]
+    for label, fn in [
+        ("dict -> JSON", lambda: json.dumps(info.to_dict(), ensure_ascii=False)),
+        ("record -> JSON", info.to_json),
+        ("dict -> CSV row", lambda: dict_writer.writerow(info.to_dict())),
+        ("to_row -> CSV row", lambda: row_writer.writerow(info.to_row())),
+    ]:
+        buffer.seek(0)
+        buffer.truncate()
+        print("  " + format_row(label, summarize(time_calls(fn, args.repeat)), width=20))
+
+
+if __name__ == "__main__":
+    main()
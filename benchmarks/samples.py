@@ -0,0 +1,196 @@
+"""Poster samples used by the text-only benchmarks.
+
+Each sample lists its text blocks as ``(line, relative text height)`` pairs
+together with the expected event name and, under ``fields``, the expected
+values of the other fields it states clearly (None where the poster has no
+such field, so the extractor should report it missing).
+
+``SAMPLE_TEXTS`` holds the same posters flattened the way ``page_to_text``
+does: words separated by single spaces, a trailing space and newline after
+every OCR line and a blank line between blocks. ``sample_document`` lays a sample out top to bottom as an
+``OcrDocument`` for the layout-aware extractor.
+"""
+from app_advanced import OcrDocument, OcrLine
+
+# Relative text heights: large title, medium subtitle, regular body text
+TITLE = 0.06
+SUBTITLE = 0.035
+BODY = 0.022
+
+SAMPLE_POSTERS = [
+    {
+        "title": "ANNUAL TECH SUMMIT 2025",
+        "fields": {
+            "Date": "18-19 January 2025",
+            "Time": "10:00 AM 4:00 PM",
+            "Venue": "City Convention Center",
+            "Event Type": "Offline",
+            "Contact Number": "415 555 0134",
+            "Email": "info@techsummit.org",
+            "Price": "50",
+        },
+        "blocks": [
+            [("ANNUAL TECH SUMMIT 2025", TITLE)],
+            [("Date: 18-19 January 2025", BODY), ("Time: 10:00 AM - 4:00 PM", BODY)],
+            [("Venue: Grand Hall, City Convention Center", BODY)],
+            [("Students and professionals are invited", BODY), ("Registration fee: $50", BODY)],
+            [("Contact: +1 415 555 0134", BODY), ("Email: info@techsummit.org", BODY)],
+        ],
+    },
+    {
+        "title": "International Conference on Machine Learning",
+        "fields": {
+            "Venue": "Zurich",
+            "Contact Number": None,
+            "Email": None,
+            "Price": "250",
+        },
+        "blocks": [
+            [("International Conference on Machine Learning", TITLE)],
+            [("Call for papers", SUBTITLE), ("Paper submission deadline March 1st 2025", BODY)],
+            [("Zurich, Switzerland", BODY)],
+            [("Early bird: EUR 250", BODY), ("Regular: EUR 400", BODY)],
+            [("www.icml-conf.org", BODY), ("@icmlconf", BODY)],
+        ],
+    },
+    {
+        "title": "Summer Music Festival",
+        "fields": {
+            "Date": "May 20",
+            "Time": "1 PM 10 PM",
+            "Venue": "Peterborough",
+            "Contact Number": None,
+            "Email": None,
+            "Social Media": "facebook.com/peterboroughfest",
+        },
+        "blocks": [
+            [("SAT. MAY20TH", SUBTITLE)],
+            [("Summer Music Festival", TITLE)],
+            [("DOWNTOWN PETERBOROUGH", SUBTITLE)],
+            [("1PM - 10PM", BODY), ("FREE ENTRY", BODY)],
+            [("facebook.com/peterboroughfest", BODY), ("instagram.com/ptbofest", BODY)],
+        ],
+    },
+    {
+        "title": "Introduction to Data Science for Beginners",
+        "fields": {
+            "Date": "2/20",
+            "Time": "6:30 PM",
+            "Event Type": "Online",
+            "Contact Number": None,
+            "Email": "events@datasci.io",
+        },
+        "blocks": [
+            [("Free Webinar", SUBTITLE)],
+            [("Introduction to Data Science for Beginners", TITLE)],
+            [("THURSDAY 2/20", BODY), ("6:30 PM EST", BODY)],
+            [("Join us online via Zoom", BODY)],
+            [("Register now at events@datasci.io", BODY)],
+        ],
+    },
+    {
+        "title": "Hackathon 2024",
+        "fields": {
+            "Date": "28 February 2025",
+            "Time": "9 AM 5 PM",
+            "Venue": "Stanford University",
+            "Contact Number": "9876543210",
+            "Email": None,
+            "Price": "500",
+        },
+        "blocks": [
+            [("Hackathon 2024", TITLE)],
+            [("Developers, designers and entrepreneurs welcome", BODY)],
+            [("28th February 2025", BODY), ("from 9AM to 5PM", BODY)],
+            [("at Stanford University Campus", BODY)],
+            [("Entry: Rs. 500", BODY), ("Call 9876543210", BODY)],
+        ],
+    },
+    {
+        "title": "Workshop on Cloud Computing",
+        "fields": {
+            "Date": "15/03/2025",
+            "Time": "10:00 AM 01:00 PM",
+            "Venue": "Engineering Building",
+            "Contact Number": None,
+            "Email": "workshop@univ.ac.uk",
+            "Price": "20",
+        },
+        "blocks": [
+            [("Workshop on Cloud Computing", TITLE)],
+            [("For researchers and scientists", SUBTITLE)],
+            [("15/03/2025", BODY), ("10.00 AM = 01.00 PM", BODY)],
+            [("Room 204, Engineering Building", BODY)],
+            [("Fee: 20 GBP", BODY), ("Contact: workshop@univ.ac.uk, admin@univ.ac.uk", BODY)],
+        ],
+    },
+    {
+        "title": "Medical Professionals Networking Evening",
+        "fields": {
+            "Date": "October 10",
+            "Time": "7 pm",
+            "Venue": "Ritz Hotel",
+            "Contact Number": "020 7493 8181",
+            "Email": None,
+        },
+        "blocks": [
+            [("WELCOME", SUBTITLE)],
+            [("Medical Professionals", TITLE), ("Networking Evening", TITLE)],
+            [("Friday, October 10", BODY), ("7 pm", BODY)],
+            [("The Ritz Hotel", BODY), ("150 Piccadilly Street, London", BODY)],
+            [("Admission free for members", BODY), ("Refreshments served", BODY)],
+            [("Tel: 020 7493 8181", BODY)],
+        ],
+    },
+    {
+        "title": "Colors of the World",
+        "fields": {
+            "Date": "June 5-7 2025",
+            "Venue": "Modern Art Gallery",
+            "Contact Number": "416 555 0199",
+            "Email": None,
+            "Price": "15",
+            "Social Media": "twitter.com/colorsexpo",
+        },
+        "blocks": [
+            [("Art Exhibition", SUBTITLE)],
+            [("Colors of the World", TITLE)],
+            [("June 5-7, 2025", BODY)],
+            [("Modern Art Gallery", BODY), ("Downtown Toronto", BODY)],
+            [("Tickets $15 to $25", BODY), ("Artists and creatives welcome", BODY)],
+            [("twitter.com/colorsexpo", BODY), ("Phone: (416) 555-0199", BODY)],
+        ],
+    },
+]
+
+
+def ocr_text(*blocks):
+    """Join blocks of lines the way page_to_text does"""
+    text = ""
+    for block in blocks:
+        for line in block:
+            text += " ".join(line.split()) + " \n"
+        text += "\n"
+    return text
+
+
+def sample_text(poster):
+    """Flattened OCR text of one sample poster"""
+    return ocr_text(*[[line for line, _ in block] for block in poster["blocks"]])
+
+
+def sample_document(poster, line_gap=0.01, block_gap=0.04):
+    """Lay a sample poster out top to bottom as an OcrDocument"""
+    lines = []
+    top = 0.05
+    for block_index, block in enumerate(poster["blocks"]):
+        for line, height in block:
+            width = min(0.9, 0.5 * height * len(line))
+            left = (1.0 - width) / 2
+            lines.append(OcrLine(" ".join(line.split()), (left, top, left + width, top + height), 0.95, block_index))
+            top += height + line_gap
+        top += block_gap
+    return OcrDocument.from_lines(lines)
+
+
+SAMPLE_TEXTS = [sample_text(poster) for poster in SAMPLE_POSTERS]
@@ -0,0 +1,254 @@
+"""End-to-end latency and accuracy benchmark on a synthetic poster corpus.
+
+    python -m benchmarks.suite --copies 3 --repeat 2 -o results.json
+    python -m benchmarks.suite --text-only --repeat 50
+    python -m benchmarks.suite --compare baseline.json
+
+The sample posters are rendered offline with PIL (see ``benchmarks.corpus``)
+and pushed through every stage of extraction: PNG decode, the DocTR forward
+pass, flattening the OCR output and each field extractor. The report has
+mean/p50/p95/p99 latency per stage, peak memory and field-level accuracy
+against the samples' ground truth. ``--text-only`` skips rendering, decode
+and OCR and feeds the extractors the samples' exact text and layout.
+
+A predicted field counts as correct when every word of the expected value
+appears in it (ignoring case and punctuation). Fields a poster does not have
+must come back as "Not found" or "Not specified".
+"""
+import argparse
+import json
+import re
+import subprocess
+import time
+from collections import defaultdict
+
+from app_advanced import (
+    FIELD_NAMES, analyze_text, determine_event_type, extract_date, extract_email,
+    extract_event_name, extract_event_name_from_layout, extract_phone_numbers, extract_price,
+    extract_profession, extract_social_media, extract_time, extract_venue, get_model,
+    page_to_document,
+)
+from benchmarks.common import measure_peak_memory, parse_size, summarize
+from benchmarks.samples import SAMPLE_POSTERS, sample_document
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MISSING_VALUES = {"Not found", "Not specified"}
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _event_name(text, document, analysis):
+    if document is not None:
+        return extract_event_name_from_layout(document, analysis)
+    return extract_event_name(text, analysis)
+
+
+# (field, stage name, extractor) in the order extract_fields runs them, so
+# the shared TextAnalysis is filled in the same order as in production
+EXTRACTORS = [
+    ("Event Name", "extract_event_name", _event_name),
+    ("Date", "extract_date", lambda text, document, analysis: extract_date(text, analysis)),
+    ("Time", "extract_time", lambda text, document, analysis: extract_time(text, analysis)),
+    ("Venue", "extract_venue", lambda text, document, analysis: extract_venue(text, analysis)),
+    ("Profession/Target Audience", "extract_profession",
+     lambda text, document, analysis: extract_profession(text, analysis)),
+    ("Event Type", "determine_event_type",
+     lambda text, document, analysis: determine_event_type(text, analysis)),
+    ("Contact Number", "extract_phone_numbers",
+     lambda text, document, analysis: extract_phone_numbers(text, analysis)),
+    ("Email", "extract_email", lambda text, document, analysis: extract_email(text)),
+    ("Social Media", "extract_social_media", lambda text, document, analysis: extract_social_media(text)),
+    ("Price", "extract_price", lambda text, document, analysis: extract_price(text, analysis)),
+]
+
+
+def field_matches(expected, predicted):
+    """Score one predicted field against its ground truth"""
+    if expected is None:
+        return predicted in MISSING_VALUES
+    if predicted in MISSING_VALUES:
+        return False
+    flattened = ''.join(WORD_RE.findall(predicted.lower()))
+    return all(word in flattened for word in WORD_RE.findall(expected.lower()))
+
+
+def expected_fields(poster):
+    expected = {"Event Name": poster["title"]}
+    expected.update(poster.get("fields", {}))
+    return expected
+
+
+class StageTimer:
+    """Collects per-stage latencies across all posters"""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+
+    def __call__(self, stage, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.timings[stage].append(time.perf_counter() - start)
+        return result
+
+
+def decode_png(png_bytes):
+    from doctr.io import DocumentFile
+    return DocumentFile.from_images(png_bytes)[0]
+
+
+def process_poster(timer, poster, png_bytes=None):
+    """Run one poster through every stage and return the predicted fields"""
+    start = time.perf_counter()
+    if png_bytes is None:
+        document = sample_document(poster)
+    else:
+        page = timer("decode", decode_png, png_bytes)
+        result = timer("ocr", get_model(), [page])
+        document = timer("flatten", page_to_document, result.pages[0])
+
+    analysis = analyze_text(document.text)
+    predictions = {}
+    for field, stage, extractor in EXTRACTORS:
+        predictions[field] = timer(stage, extractor, document.text, document, analysis)
+    timer.timings["total"].append(time.perf_counter() - start)
+    return predictions
+
+
+def score(corpus, predictions):
+    """Field-level accuracy over the corpus"""
+    correct = defaultdict(int)
+    scored = defaultdict(int)
+    for (poster, _), predicted in zip(corpus, predictions):
+        for field, expected in expected_fields(poster).items():
+            scored[field] += 1
+            correct[field] += field_matches(expected, predicted[field])
+    fields = {
+        field: {"correct": correct[field], "scored": scored[field],
+                "accuracy": correct[field] / scored[field]}
+        for field in FIELD_NAMES if scored[field]
+    }
+    total = sum(scored.values())
+    return fields, (sum(correct.values()) / total if total else 0.0)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(copies=1, repeat=1, size=(1024, 1448), text_only=False, seed=0,
+              adversarial_length=None):
+    """Run the benchmark and return the report as a JSON-serializable dict"""
+    if text_only:
+        corpus = [(poster, None) for poster in SAMPLE_POSTERS] * copies
+    else:
+        from benchmarks.corpus import render_corpus
+        corpus = render_corpus(copies, size, seed)
+
+    report = {"commit": git_commit(), "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+              "config": {"copies": copies, "repeat": repeat, "size": list(size),
+                         "text_only": text_only, "posters": len(corpus)}}
+
+    if not text_only:
+        start = time.perf_counter()
+        get_model()
+        report["model_load_s"] = time.perf_counter() - start
+        # Warm up the predictor so the first timed call is not an outlier
+        process_poster(StageTimer(), *corpus[0])
+
+    timer = StageTimer()
+    predictions = [process_poster(timer, poster, png) for poster, png in corpus]
+    for _ in range(repeat - 1):
+        for poster, png in corpus:
+            process_poster(timer, poster, png)
+
+    report["stages"] = {stage: summarize(timings) for stage, timings in timer.timings.items()}
+    report["accuracy"], report["overall_accuracy"] = score(corpus, predictions)
+    report["memory"] = {"python_peak_bytes": measure_peak_memory(
+        lambda: process_poster(StageTimer(), *corpus[0]))}
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux
+        report["memory"]["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    if adversarial_length:
+        from benchmarks.adversarial import adversarial_texts, measure
+        report["adversarial_max_ms"] = measure(adversarial_texts(adversarial_length))
+    report["predictions"] = [
+        {"title": poster["title"], "fields": predicted}
+        for (poster, _), predicted in zip(corpus[:len(SAMPLE_POSTERS)], predictions)
+    ]
+    return report
+
+
+def print_report(report, baseline=None):
+    def delta(now, before):
+        return f"   ({(now - before) / before * 100:+6.1f}%)" if before else ""
+
+    print(f"{'stage':<24} {'mean':>10} {'p50':>10} {'p95':>10} {'p99':>10}   ms")
+    for stage, stats in report["stages"].items():
+        line = (f"{stage:<24} {stats['mean_ms']:10.3f} {stats['p50_ms']:10.3f} "
+                f"{stats['p95_ms']:10.3f} {stats['p99_ms']:10.3f}")
+        if baseline and stage in baseline.get("stages", {}):
+            line += delta(stats['p50_ms'], baseline["stages"][stage]['p50_ms'])
+        print(line)
+
+    print()
+    for field, result in report["accuracy"].items():
+        line = f"{field:<28} {result['correct']:>3}/{result['scored']:<3} {result['accuracy'] * 100:6.1f}%"
+        if baseline and field in baseline.get("accuracy", {}):
+            line += f"   (was {baseline['accuracy'][field]['accuracy'] * 100:.1f}%)"
+        print(line)
+    print(f"{'overall':<28} {report['overall_accuracy'] * 100:14.1f}%")
+
+    memory = report["memory"]
+    print(f"\npython peak alloc {memory['python_peak_bytes'] / 1e6:.2f} MB", end="")
+    if "max_rss_bytes" in memory:
+        print(f", max RSS {memory['max_rss_bytes'] / 1e6:.1f} MB", end="")
+    print()
+
+    if "adversarial_max_ms" in report:
+        print("\nworst case on adversarial text")
+        for name, timings in report["adversarial_max_ms"].items():
+            stage, worst = max(timings.items(), key=lambda item: item[1])
+            print(f"  {name:<26} slowest {stage} {worst:9.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--copies', type=int, default=1,
+                        help="Renderings of each sample poster, with different backgrounds")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed passes over the corpus")
+    parser.add_argument('--size', type=parse_size, default=(1024, 1448),
+                        help="Poster size as WIDTHxHEIGHT")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--text-only', action='store_true',
+                        help="Skip rendering and OCR; run the extractors on the sample text")
+    parser.add_argument('--adversarial', type=int, nargs='?', const=20000, metavar='LENGTH',
+                        help="Also record worst-case extractor latency on adversarial "
+                             "texts of LENGTH characters (default 20000)")
+    parser.add_argument('-o', '--output', help="Write the full report as JSON")
+    parser.add_argument('--compare', help="Report from an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.copies, args.repeat, args.size, args.text_only, args.seed,
+                       args.adversarial)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"comparing {report['commit']} against {baseline.get('commit')}\n")
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Lazy page access for multi-page PDF and TIFF posters.
+
+Event brochures often arrive as PDFs or multi-frame TIFFs. Rasterizing a
+whole document up front (as ``DocumentFile.from_pdf`` does) holds every
+page's pixels at once, which for a 100-page PDF at 144 dpi is well over a
+gigabyte. A ``PageReader`` opens the document, reports its page count and
+renders one page at a time, so callers can feed OCR a few pages per batch
+and let each page go once it has been recognized.
+
+PDF pages are rendered with pypdfium2 (already a DocTR dependency), TIFF
+frames are read with PIL. Sources can be paths or the file's bytes.
+"""
+import io
+import os
+import threading
+
+import numpy as np
+
+PDF_EXTENSIONS = ('.pdf',)
+TIFF_EXTENSIONS = ('.tif', '.tiff')
+DOCUMENT_EXTENSIONS = PDF_EXTENSIONS + TIFF_EXTENSIONS
+
+# pdfium renders at 72 dpi times this scale; 2 matches DocTR's from_pdf
+PDF_RENDER_SCALE = float(os.environ.get('POSTER_PDF_SCALE', 2))
+
+# pdfium is not thread-safe, even across different documents
+_PDFIUM_LOCK = threading.Lock()
+
+
+def document_kind(source):
+    """'pdf' or 'tiff' for a path or encoded bytes in one of those formats, else None"""
+    if isinstance(source, bytes):
+        if source.startswith(b'%PDF'):
+            return 'pdf'
+        if source[:4] in (b'II*\x00', b'MM\x00*'):
+            return 'tiff'
+        return None
+    if isinstance(source, (str, os.PathLike)):
+        extension = os.path.splitext(os.fspath(source))[1].lower()
+        if extension in PDF_EXTENSIONS:
+            return 'pdf'
+        if extension in TIFF_EXTENSIONS:
+            return 'tiff'
+    return None
+
+
+class PageReader:
+    """Renders the pages of a PDF or TIFF one at a time as H x W x 3 uint8 arrays.
+
+    Use as a context manager (or call ``close``) to release the document.
+    A reader must not be shared between threads.
+    """
+
+    def __init__(self, source, scale=None):
+        self.kind = document_kind(source)
+        if self.kind is None:
+            raise ValueError("Not a PDF or TIFF document")
+        if not isinstance(source, bytes):
+            source = os.fspath(source)
+        self.scale = scale or PDF_RENDER_SCALE
+
+        if self.kind == 'pdf':
+            import pypdfium2 as pdfium
+            with _PDFIUM_LOCK:
+                self.document = pdfium.PdfDocument(source)
+                self.page_count = len(self.document)
+        else:
+            from PIL import Image
+            self.document = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+            self.page_count = getattr(self.document, 'n_frames', 1)
+
+    def __len__(self):
+        return self.page_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        for number in range(self.page_count):
+            yield self.render(number)
+
+    def render(self, number):
+        """Pixels of page ``number`` (0-based)"""
+        if self.kind == 'pdf':
+            with _PDFIUM_LOCK:
+                page = self.document[number]
+                try:
+                    bitmap = page.render(scale=self.scale, rev_byteorder=True)
+                    # Copy out of pdfium's buffer so it can be freed right away
+                    pixels = np.array(bitmap.to_numpy()[..., :3])
+                    bitmap.close()
+                finally:
+                    page.close()
+            return pixels
+
+        self.document.seek(number)
+        frame = self.document
+        if frame.mode != 'RGB':
+            frame = frame.convert('RGB')
+        return np.asarray(frame)
+
+    def close(self):
+        if self.kind == 'pdf':
+            with _PDFIUM_LOCK:
+                self.document.close()
+        else:
+            self.document.close()
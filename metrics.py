@@ -0,0 +1,252 @@
+"""Hot-path timing instrumentation and a Prometheus-style metrics surface.
+
+Stages (decode, OCR, flattening, each ``extract_*`` function) are timed with
+``timed`` or the ``instrument`` decorator and recorded in a process-wide
+histogram registry. ``render`` returns the Prometheus text exposition
+format; ``serve`` exposes it over HTTP and ``write_metrics`` dumps it to a
+file.
+
+The slow-request log is opt-in: set ``POSTER_SLOW_LOG`` to a file path (and
+optionally ``POSTER_SLOW_THRESHOLD_MS``, default 200) or call
+``configure_slow_log``. Every field extraction that takes longer than the
+threshold appends one JSON line with its per-stage times and the OCR text
+that triggered it.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bucket upper bounds for size histograms such as OCR batch sizes
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class StageStats:
+    """Latency histogram for one stage (or any histogram, given its buckets)"""
+
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(bounds)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(self.bounds):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def render(self, name, labels=""):
+        """Prometheus bucket, sum and count lines; labels like 'stage="ocr",'"""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {self.count}')
+        selector = '{' + labels.rstrip(',') + '}' if labels else ''
+        lines.append(f'{name}_sum{selector} {self.total:.6f}')
+        lines.append(f'{name}_count{selector} {self.count}')
+        return lines
+
+
+class Registry:
+    """Thread-safe collection of per-stage histograms and counters"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.slow_requests = 0
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.observe(seconds)
+
+    def increment(self, name, stage):
+        """Add one to the counter name{stage=...}"""
+        with self.lock:
+            key = (name, stage)
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def observe_value(self, name, value, bounds=SIZE_BUCKETS):
+        """Record value in the histogram name (created with bounds on first use)"""
+        with self.lock:
+            stats = self.histograms.get(name)
+            if stats is None:
+                stats = self.histograms[name] = StageStats(bounds)
+            stats.observe(value)
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+            self.counters.clear()
+            self.histograms.clear()
+            self.gauges.clear()
+            self.slow_requests = 0
+
+    def snapshot(self):
+        """Per-stage count, total, mean and max, in seconds"""
+        with self.lock:
+            return {
+                stage: {"count": stats.count, "total_s": stats.total,
+                        "mean_s": stats.total / stats.count, "max_s": stats.max}
+                for stage, stats in self.stages.items()
+            }
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = [
+            "# HELP poster_stage_seconds Time spent in each extraction stage",
+            "# TYPE poster_stage_seconds histogram",
+        ]
+        with self.lock:
+            for stage in sorted(self.stages):
+                lines += self.stages[stage].render('poster_stage_seconds', f'stage="{stage}",')
+            lines += [
+                "# HELP poster_slow_requests_total Extractions slower than the slow-log threshold",
+                "# TYPE poster_slow_requests_total counter",
+                f"poster_slow_requests_total {self.slow_requests}",
+            ]
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                lines.append(f"# TYPE {name} counter")
+                for (counter, stage), value in sorted(self.counters.items()):
+                    if counter == name:
+                        lines.append(f'{name}{{stage="{stage}"}} {value}')
+            for name in sorted(self.histograms):
+                lines.append(f"# TYPE {name} histogram")
+                lines += self.histograms[name].render(name)
+            for name in sorted(self.gauges):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {self.gauges[name]}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# Per-thread stage times of the extraction currently being traced
+_trace = threading.local()
+
+
+@contextmanager
+def timed(stage):
+    """Time the enclosed block and record it under stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe(stage, elapsed)
+        stages = getattr(_trace, 'stages', None)
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+
+
+def instrument(stage=None):
+    """Decorator that times every call, by default under the function name"""
+    def decorator(fn):
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Slow-request log configuration
+slow_log_path = os.environ.get('POSTER_SLOW_LOG') or None
+slow_threshold_ms = float(os.environ.get('POSTER_SLOW_THRESHOLD_MS', 200))
+_slow_log_lock = threading.Lock()
+
+
+def configure_slow_log(path, threshold_ms=200):
+    """Enable (or, with path=None, disable) the slow-request log"""
+    global slow_log_path, slow_threshold_ms
+    slow_log_path = path
+    slow_threshold_ms = threshold_ms
+
+
+@contextmanager
+def trace_request(text):
+    """Collect per-stage times for one extraction and log it if it is slow"""
+    if slow_log_path is None:
+        yield
+        return
+
+    previous = getattr(_trace, 'stages', None)
+    _trace.stages = {}
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stages = _trace.stages
+        _trace.stages = previous
+        if elapsed_ms >= slow_threshold_ms:
+            record = {
+                "time": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                "total_ms": round(elapsed_ms, 3),
+                "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in stages.items()},
+                "text": text,
+            }
+            with _slow_log_lock:
+                with open(slow_log_path, 'a', encoding='utf-8') as log:
+                    log.write(json.dumps(record, ensure_ascii=False) + "\n")
+            with registry.lock:
+                registry.slow_requests += 1
+
+
+def render():
+    return registry.render()
+
+
+def write_metrics(path):
+    """Dump the current metrics to a file in Prometheus text format"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the app's stderr
+        pass
+
+
+def serve(port, host='0.0.0.0'):
+    """Serve /metrics on a background thread and return the server"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,148 @@
+"""Content-addressed cache for OCR results.
+
+Posters are keyed on a hash of their decoded pixels, so the same image
+uploaded twice (or re-run in a batch) skips the DocTR forward pass. Entries
+live in a bounded in-memory LRU and, optionally, in a SQLite file that
+survives restarts and can be shared between the web app and batch runs.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def image_key(page, namespace=""):
+    """Hash a decoded page (H x W x C array) into a cache key.
+
+    The shape and dtype are part of the digest so arrays that happen to
+    share the same bytes but not the same geometry never collide.
+    ``namespace`` separates results produced by different OCR models.
+    """
+    page = np.ascontiguousarray(page)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{namespace}|{page.shape}|{page.dtype.str}|".encode('utf-8'))
+    digest.update(memoryview(page).cast('B'))
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """Two-tier cache: a bounded in-memory LRU in front of an optional SQLite file.
+
+    Values are kept as Python objects in memory and stored on disk through
+    ``encode``/``decode`` (JSON by default). Every lookup is counted as a
+    memory hit, a disk hit or a miss.
+    """
+
+    def __init__(self, max_entries=256, path=None, encode=json.dumps, decode=json.loads):
+        self.max_entries = max_entries
+        self.path = path
+        self.encode = encode
+        self.decode = decode
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.db = None
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self.db.commit()
+
+    def __len__(self):
+        return len(self.memory)
+
+    def __contains__(self, key):
+        """Whether either tier has key; not counted as a lookup"""
+        with self.lock:
+            if key in self.memory:
+                return True
+            if self.db is None:
+                return False
+            return self.db.execute(
+                "SELECT 1 FROM ocr_cache WHERE key = ?", (key,)
+            ).fetchone() is not None
+
+    def _remember(self, key, value):
+        """Insert into the LRU, evicting the least recently used entries"""
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self.lock:
+            value = self.memory.get(key)
+            if value is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT value FROM ocr_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = self.decode(row[0])
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store value under key in memory and, if configured, on disk"""
+        with self.lock:
+            if self.max_entries > 0:
+                self._remember(key, value)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO ocr_cache (key, value) VALUES (?, ?)",
+                    (key, self.encode(value))
+                )
+                self.db.commit()
+
+    def clear(self):
+        """Drop every entry from both tiers and reset the counters"""
+        with self.lock:
+            self.memory.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM ocr_cache")
+                self.db.commit()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and current sizes"""
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            stats = {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "max_entries": self.max_entries,
+            }
+            if self.db is not None:
+                stats["disk_entries"] = self.db.execute(
+                    "SELECT COUNT(*) FROM ocr_cache"
+                ).fetchone()[0]
+            return stats
+
+    def close(self):
+        """Close the SQLite connection, if any"""
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
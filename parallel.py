@@ -0,0 +1,145 @@
+"""Process-pool extraction for multi-core CPU servers.
+
+The threaded pipeline shares one interpreter, so the pure-Python extractors
+are limited by the GIL and one DocTR predictor serves every poster. Here
+posters are sharded across worker processes instead. Each worker loads its
+own predictor once, and torch's intra-op thread pool is sized so that
+``workers * threads`` does not exceed the number of cores.
+
+Workers are started with the ``spawn`` method: forking a parent that has
+already initialized torch's thread pools can deadlock.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from documents import document_kind
+from pipeline import PipelineResult, decode_source
+
+# Environment variables read by the BLAS/OpenMP runtimes torch links against
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+
+def threads_per_worker(workers, cpu_count=None):
+    """Split the cores evenly between workers, at least one thread each"""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return max(1, cpu_count // workers)
+
+
+def _init_worker(torch_threads, cache_path, cache_size):
+    """Pin torch's thread pools and load the predictor once per worker process"""
+    # THREAD_ENV_VARS come from the parent (see ParallelExtractor): by the
+    # time the initializer runs, unpickling it has already imported numpy
+    import torch
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already fixed once any parallel work has run in this process
+        pass
+
+    import app_advanced
+    if cache_path:
+        app_advanced.configure_ocr_cache(max_entries=cache_size, path=cache_path)
+    app_advanced.get_model()
+
+
+def _extract_shard(shard, event_name_mode, use_cache, fields=None):
+    """Decode and extract one shard of ``(index, source)`` pairs in a worker"""
+    from app_advanced import extract_document, extract_records
+
+    results = {}
+    pages = []
+    decoded = []
+    for index, source in shard:
+        if document_kind(source) is not None:
+            # Multi-page documents stream through OCR in their own small batches
+            try:
+                text, info = extract_document(source, event_name_mode=event_name_mode,
+                                              use_cache=use_cache, fields=fields)
+                results[index] = PipelineResult(index, source, text, info, None)
+            except Exception as e:
+                results[index] = PipelineResult(index, source, "", None, f"Error processing document: {str(e)}")
+            continue
+        try:
+            pages.append(decode_source(source))
+            decoded.append((index, source))
+        except Exception as e:
+            results[index] = PipelineResult(index, source, "", None, f"Error reading image: {str(e)}")
+
+    try:
+        outputs = extract_records(pages, event_name_mode, use_cache, fields)
+        for (index, source), (text, info) in zip(decoded, outputs):
+            results[index] = PipelineResult(index, source, text, info, None)
+    except Exception as e:
+        for index, source in decoded:
+            results[index] = PipelineResult(index, source, "", None, f"Error processing image: {str(e)}")
+
+    return [results[index] for index, _ in shard]
+
+
+class ParallelExtractor:
+    """Extract posters in a pool of worker processes.
+
+    Use as a context manager so the workers (and their loaded predictors)
+    are reused across ``run`` calls::
+
+        with ParallelExtractor(workers=8) as extractor:
+            for result in extractor.run(paths):
+                ...
+
+    Sources must be picklable (file paths or numpy arrays). ``run`` yields
+    one PipelineResult per source, in input order, and keeps at most
+    ``2 * workers`` shards in flight. ``fields`` limits field extraction to
+    those fields (see extract_info).
+    """
+
+    def __init__(self, workers=None, batch_size=8, event_name_mode='text', use_cache=True,
+                 cache_path=None, cache_size=256, torch_threads=None, fields=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.event_name_mode = event_name_mode
+        self.use_cache = use_cache
+        self.fields = fields
+        self.torch_threads = torch_threads or threads_per_worker(self.workers)
+        # The BLAS/OpenMP runtimes read these once, when numpy or torch is
+        # first imported; spawned workers inherit them from this environment
+        for name in THREAD_ENV_VARS:
+            os.environ[name] = str(self.torch_threads)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.torch_threads, cache_path if use_cache else None, cache_size),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def _shards(self, sources):
+        shard = []
+        for item in enumerate(sources):
+            shard.append(item)
+            if len(shard) >= self.batch_size:
+                yield shard
+                shard = []
+        if shard:
+            yield shard
+
+    def run(self, sources):
+        in_flight = []
+        for shard in self._shards(sources):
+            in_flight.append(self.executor.submit(
+                _extract_shard, shard, self.event_name_mode, self.use_cache, self.fields
+            ))
+            # Backpressure: wait for the oldest shard before submitting more
+            if len(in_flight) >= 2 * self.workers:
+                yield from in_flight.pop(0).result()
+        for future in in_flight:
+            yield from future.result()
@@ -0,0 +1,258 @@
+"""Staged extraction pipeline: decode, batched OCR and parsing run concurrently.
+
+Posters flow through three stages connected by bounded queues:
+
+    sources -> decode workers -> OCR stage (batches) -> parse workers -> results
+
+The OCR stage runs on a single thread and groups whatever decoded pages are
+waiting (up to ``batch_size``) into one forward pass. While the model works
+on the next batch, parse workers run the regex extractors on the previous
+one. Every queue is bounded, so a slow stage blocks the stages before it and
+at most a few batches of decoded pixels are held in memory at once.
+
+PDF and multi-page TIFF sources are read by one decode worker page by page
+(see documents.py), so their pages stream through OCR with the same bound
+instead of being rasterized up front; the fields of all pages are merged
+into one result per document.
+"""
+import os
+import queue
+import threading
+from collections import namedtuple
+
+from app_advanced import image_to_array, merge_pages, ocr_entries, parse_entry
+from documents import PageReader, document_kind
+from metrics import instrument, timed
+
+# One finished poster (or multi-page document). fields is a PosterInfo and
+# error None on success; otherwise error is a message, text is empty and
+# fields None.
+PipelineResult = namedtuple('PipelineResult', ['index', 'source', 'text', 'fields', 'error'])
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# How often blocked queue operations check whether the pipeline was closed
+_POLL_INTERVAL = 0.1
+
+
+@instrument('decode')
+def decode_source(source):
+    """Decode an image path, encoded image bytes or an in-memory image into an RGB page array"""
+    if isinstance(source, (str, os.PathLike, bytes)):
+        from doctr.io import DocumentFile
+        return DocumentFile.from_images(source if isinstance(source, bytes) else os.fspath(source))[0]
+    return image_to_array(source)
+
+
+class _Closed(Exception):
+    """Raised inside stage threads once the consumer has stopped reading"""
+
+
+def _merge_parts(index, parts):
+    """One PipelineResult for a source from the results of its pages"""
+    if len(parts) == 1:
+        return parts[0]._replace(index=index)
+    for number, part in enumerate(parts):
+        if part.error is not None:
+            return PipelineResult(index, part.source, "", None, f"Page {number + 1}: {part.error}")
+    text, fields = merge_pages([(part.text, part.fields) for part in parts])
+    return PipelineResult(index, parts[0].source, text, fields, None)
+
+
+class ExtractionPipeline:
+    """Extract many posters with decoding, OCR and parsing overlapped.
+
+    ``run(sources)`` yields one PipelineResult per source, in input order.
+    ``decode`` turns a source into a page array (paths and PIL/numpy images
+    by default); PDF and TIFF sources are always read with a PageReader.
+    ``fields`` limits field extraction to those fields (see extract_info).
+    """
+
+    def __init__(self, batch_size=8, decode_workers=2, parse_workers=2, queue_size=None,
+                 event_name_mode='text', use_cache=True, decode=decode_source, fields=None):
+        self.batch_size = batch_size
+        self.decode_workers = decode_workers
+        self.parse_workers = parse_workers
+        # Room for about two batches between each pair of stages
+        self.queue_size = queue_size or 2 * batch_size
+        self.event_name_mode = event_name_mode
+        self.use_cache = use_cache
+        self.decode = decode
+        self.fields = fields
+
+    def run(self, sources):
+        closed = threading.Event()
+        # The first exception a stage raised, re-raised to the caller of run()
+        failures = []
+        source_queue = queue.Queue(self.queue_size)
+        ocr_queue = queue.Queue(self.queue_size)
+        parse_queue = queue.Queue(self.queue_size)
+        result_queue = queue.Queue(self.queue_size)
+
+        def put(q, item):
+            while True:
+                if closed.is_set():
+                    raise _Closed()
+                try:
+                    q.put(item, timeout=_POLL_INTERVAL)
+                    return
+                except queue.Full:
+                    pass
+
+        def get(q):
+            while True:
+                if closed.is_set():
+                    raise _Closed()
+                try:
+                    return q.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    pass
+
+        def stage(target):
+            def wrapper():
+                try:
+                    target()
+                except _Closed:
+                    pass
+                except BaseException as e:
+                    # Stop every stage; run() raises this in the consumer
+                    failures.append(e)
+                    closed.set()
+            return wrapper
+
+        def feed():
+            # If iterating the sources fails (a missing manifest, say), the
+            # exception stops the pipeline instead of ending the input early
+            for index, source in enumerate(sources):
+                put(source_queue, (index, source))
+            for _ in range(self.decode_workers):
+                put(source_queue, _DONE)
+
+        # Items past the decode stage are keyed by (index, page number, page count)
+        def decode_document(index, source):
+            try:
+                reader = PageReader(source)
+            except Exception as e:
+                put(ocr_queue, ((index, 0, 1), source, None, f"Error reading document: {str(e)}"))
+                return
+            with reader:
+                if not len(reader):
+                    put(ocr_queue, ((index, 0, 1), source, None, "Document has no pages"))
+                    return
+                # The bounded queue keeps rendering just ahead of OCR
+                error = None
+                for number in range(len(reader)):
+                    page = None
+                    if error is None:
+                        try:
+                            with timed('decode'):
+                                page = reader.render(number)
+                        except Exception as e:
+                            error = f"Error reading image: {str(e)}"
+                    put(ocr_queue, ((index, number, len(reader)), source, page, error))
+
+        def decode():
+            while True:
+                item = get(source_queue)
+                if item is _DONE:
+                    put(ocr_queue, _DONE)
+                    return
+                index, source = item
+                if document_kind(source) is not None:
+                    decode_document(index, source)
+                    continue
+                try:
+                    put(ocr_queue, ((index, 0, 1), source, self.decode(source), None))
+                except _Closed:
+                    raise
+                except Exception as e:
+                    put(ocr_queue, ((index, 0, 1), source, None, f"Error reading image: {str(e)}"))
+
+        def recognize():
+            remaining = self.decode_workers
+            while remaining:
+                # Block for the first page, then take whatever else is ready
+                batch = []
+                item = get(ocr_queue)
+                while True:
+                    if item is _DONE:
+                        remaining -= 1
+                    else:
+                        batch.append(item)
+                    if len(batch) >= self.batch_size or not remaining:
+                        break
+                    try:
+                        item = ocr_queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                decoded = [item for item in batch if item[3] is None]
+                outcomes = {}
+                if decoded:
+                    try:
+                        keys, entries = ocr_entries([item[2] for item in decoded], self.use_cache)
+                        for item, key, entry in zip(decoded, keys, entries):
+                            outcomes[item[0]] = (key, entry, None)
+                    except Exception as e:
+                        for item in decoded:
+                            outcomes[item[0]] = (None, None, f"Error processing image: {str(e)}")
+
+                for index, source, page, error in batch:
+                    key, entry, ocr_error = outcomes.get(index, (None, None, error))
+                    put(parse_queue, (index, source, key, entry, ocr_error))
+
+            for _ in range(self.parse_workers):
+                put(parse_queue, _DONE)
+
+        def parse():
+            while True:
+                item = get(parse_queue)
+                if item is _DONE:
+                    put(result_queue, _DONE)
+                    return
+                index, source, key, entry, error = item
+                if error is None:
+                    try:
+                        text, fields = parse_entry(key, entry, self.event_name_mode, self.fields)
+                        result = PipelineResult(index, source, text, fields, None)
+                    except Exception as e:
+                        result = PipelineResult(index, source, "", None, f"Error processing image: {str(e)}")
+                else:
+                    result = PipelineResult(index, source, "", None, error)
+                put(result_queue, result)
+
+        threads = [threading.Thread(target=stage(feed), daemon=True),
+                   threading.Thread(target=stage(recognize), daemon=True)]
+        threads += [threading.Thread(target=stage(decode), daemon=True)
+                    for _ in range(self.decode_workers)]
+        threads += [threading.Thread(target=stage(parse), daemon=True)
+                    for _ in range(self.parse_workers)]
+        for thread in threads:
+            thread.start()
+
+        # Parse workers finish out of order and documents arrive page by
+        # page; hold results until every page of a source is in and its turn
+        pending = {}
+        next_index = 0
+        remaining = self.parse_workers
+        try:
+            while remaining:
+                try:
+                    item = result_queue.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    if failures:
+                        raise failures[0]
+                    continue
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                index, number, count = item.index
+                pending.setdefault(index, [None] * count)[number] = item
+                while next_index in pending and None not in pending[next_index]:
+                    yield _merge_parts(next_index, pending.pop(next_index))
+                    next_index += 1
+            if failures:
+                raise failures[0]
+        finally:
+            closed.set()
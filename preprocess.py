@@ -0,0 +1,188 @@
+"""Image preprocessing ahead of the OCR forward pass.
+
+Phone photos of posters are often 12MP or more. DocTR's detector resizes
+its input anyway, but the full-size page is still decoded, normalized and
+cropped word by word for recognition, which dominates time and memory.
+A ``Preprocessor`` shrinks and cleans the page first:
+
+- ``max_side``: downscale so the longer side is at most this many pixels
+- ``grayscale``: drop color (the page stays H x W x 3 for DocTR)
+- ``normalize_contrast``: stretch the 1st..99th intensity percentiles to 0..255
+- ``crop_borders``: cut away uniform margins around the content
+- ``deskew``: rotate the page so its text lines are level
+
+Every step is off by default. ``benchmarks/preprocess.py`` measures the
+latency and accuracy trade-off of different settings.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Luminance weights (ITU-R BT.601), as used by PIL's "L" mode
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+PreprocessConfig = namedtuple(
+    'PreprocessConfig',
+    ['max_side', 'grayscale', 'normalize_contrast', 'crop_borders', 'deskew'],
+    defaults=[None, False, False, False, False],
+)
+
+
+def luminance(page):
+    """H x W float32 brightness of an H x W x 3 page"""
+    return page[..., :3].astype(np.float32) @ LUMA_WEIGHTS
+
+
+def resize_max_side(page, max_side):
+    """Downscale page so its longer side is at most max_side (never upscales)"""
+    height, width = page.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return page
+    from PIL import Image
+    image = Image.fromarray(page)
+    # Box-reduce by the whole part of the factor first, which is much
+    # cheaper than resampling a 12MP photo, then resize the rest
+    factor = int(1 / scale)
+    if factor >= 2:
+        image = image.reduce(factor)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    if image.size != size:
+        image = image.resize(size, Image.BILINEAR)
+    return np.asarray(image)
+
+
+def to_grayscale(page):
+    """Luminance copied into all three channels"""
+    gray = np.clip(luminance(page), 0, 255).astype(np.uint8)
+    return np.repeat(gray[..., None], 3, axis=-1)
+
+
+def stretch_contrast(page, low_percentile=1, high_percentile=99):
+    """Map the low..high intensity percentiles to the full 0..255 range"""
+    # Percentiles of a strided sample are close enough and much cheaper
+    step = max(1, int(np.sqrt(page.shape[0] * page.shape[1] / 250_000)))
+    low, high = np.percentile(luminance(page[::step, ::step]), [low_percentile, high_percentile])
+    if high - low < 1:
+        return page
+    lut = np.clip((np.arange(256, dtype=np.float32) - low) * (255 / (high - low)), 0, 255)
+    return lut.astype(np.uint8)[page]
+
+
+def background_color(page):
+    """Median color of the outermost rows and columns"""
+    border = np.concatenate([page[0], page[-1], page[:, 0], page[:, -1]])
+    return np.median(border[:, :3], axis=0)
+
+
+def estimate_skew(page, max_angle=10.0, threshold=24, sample_side=800):
+    """Counterclockwise tilt of the text lines in degrees, 0.0 if there is too little ink.
+
+    Ink pixels (those that differ from the border color) of a downsampled
+    copy are projected onto rows at every candidate angle; the row histogram
+    is most peaked (largest sum of squares) when the projection follows the
+    lines. Angles are searched in 1 degree steps, then 0.1 degree steps
+    around the best one.
+    """
+    step = max(1, -(-max(page.shape[:2]) // sample_side))
+    gray = luminance(page[::step, ::step])
+    border = np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])
+    ys, xs = np.nonzero(np.abs(gray - np.median(border)) > threshold)
+    if len(ys) < 100:
+        return 0.0
+    ys = ys.astype(np.float32) - ys.mean()
+    xs = xs.astype(np.float32) - xs.mean()
+    extent = int(np.hypot(gray.shape[0], gray.shape[1])) + 2
+
+    def sharpness(angle):
+        radians = np.deg2rad(angle)
+        rows = (ys * np.cos(radians) - xs * np.sin(radians)).astype(np.int64) + extent // 2
+        counts = np.bincount(rows, minlength=extent).astype(np.float64)
+        return counts @ counts
+
+    coarse = max(np.arange(-max_angle, max_angle + 0.5, 1.0), key=sharpness)
+    fine = max(np.arange(coarse - 1.0, coarse + 1.05, 0.1), key=sharpness)
+    # A line running down to the right has a positive slope in image rows,
+    # which is a clockwise tilt
+    return -float(fine)
+
+
+def deskew(page, min_angle=0.2, max_angle=10.0):
+    """Rotate page so its text lines are level; new corners take the border color"""
+    angle = estimate_skew(page, max_angle)
+    if abs(angle) < min_angle:
+        return page
+    from PIL import Image
+    fill = tuple(int(channel) for channel in background_color(page))
+    image = Image.fromarray(page).rotate(-angle, resample=Image.BILINEAR, expand=True, fillcolor=fill)
+    return np.asarray(image)
+
+
+def content_box(page, threshold=24, margin=0.02):
+    """(top, bottom, left, right) around pixels that differ from the border color.
+
+    The background is taken as the median of the outermost rows and columns;
+    a margin (a fraction of the page size) is kept around the content.
+    Returns None when the page looks blank.
+    """
+    gray = luminance(page)
+    border = np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])
+    content = np.abs(gray - np.median(border)) > threshold
+    rows = np.flatnonzero(content.any(axis=1))
+    cols = np.flatnonzero(content.any(axis=0))
+    if not len(rows) or not len(cols):
+        return None
+    height, width = gray.shape
+    pad_y, pad_x = int(margin * height), int(margin * width)
+    return (max(0, rows[0] - pad_y), min(height, rows[-1] + 1 + pad_y),
+            max(0, cols[0] - pad_x), min(width, cols[-1] + 1 + pad_x))
+
+
+def crop_to_content(page, threshold=24, margin=0.02):
+    box = content_box(page, threshold, margin)
+    if box is None:
+        return page
+    top, bottom, left, right = box
+    return page[top:bottom, left:right]
+
+
+class Preprocessor:
+    """Applies a PreprocessConfig to decoded H x W x 3 uint8 pages"""
+
+    def __init__(self, config=PreprocessConfig()):
+        self.config = config
+
+    @property
+    def enabled(self):
+        return self.config != PreprocessConfig()
+
+    def signature(self):
+        """Short string identifying the settings, for OCR cache namespaces"""
+        if not self.enabled:
+            return ""
+        config = self.config
+        return "|pre:" + ",".join([
+            f"max{config.max_side}" if config.max_side else "",
+            "gray" if config.grayscale else "",
+            "contrast" if config.normalize_contrast else "",
+            "crop" if config.crop_borders else "",
+            "deskew" if config.deskew else "",
+        ])
+
+    def __call__(self, page):
+        config = self.config
+        if not self.enabled:
+            return page
+        # Resize first so every later step works on the small image
+        if config.max_side:
+            page = resize_max_side(page, config.max_side)
+        # Before cropping, which also removes the corners the rotation adds
+        if config.deskew:
+            page = deskew(page)
+        if config.crop_borders:
+            page = crop_to_content(page)
+        if config.grayscale:
+            page = to_grayscale(page)
+        if config.normalize_contrast:
+            page = stretch_contrast(page)
+        return np.ascontiguousarray(page)
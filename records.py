@@ -0,0 +1,275 @@
+"""Compact, typed record of the fields extracted from one poster.
+
+A ``PosterInfo`` keeps single-valued fields as strings (None when nothing
+was found) and multi-valued fields (audiences, phone numbers, emails,
+social links, prices) as tuples, so nothing has to be re-split from a
+joined string later. Every field also has a confidence (the mean OCR
+confidence of the words it was read from, None when unknown) and a
+source span: ``(start, end)`` offsets into the OCR text, or one span per
+item for multi-valued fields, None where the value is not a verbatim
+piece of the text.
+
+Records use ``__slots__`` and tuples, and pack the confidences into one
+byte per field and the spans into one flat integer array, so a record
+takes less memory than the equivalent display dict. Serializers:
+
+- ``to_dict``: the display form, with the original labels, joined
+  multi-valued fields and "Not found" / "Not specified" placeholders
+- ``to_row``: the same values as a tuple in FIELD_NAMES order
+- ``confidence_dict``: the confidences keyed by display label
+- ``to_record`` / ``to_json``: snake_case keys, lists, confidences, spans
+- ``to_state`` / ``from_state``: a compact list for the OCR cache
+
+The display and record serializers take an optional set of record keys
+(see ``field_keys``) for results where only some fields were extracted.
+``truncated`` marks results where an extractor ran out of its time budget;
+it is not part of the serialized forms, as such results are not cached.
+"""
+import json
+from array import array
+from collections import namedtuple
+
+# name: attribute and record key; label: display name and output column;
+# separator: how a multi-valued field is joined for display (None for
+# single-valued fields); missing: the display placeholder for no value
+FieldSpec = namedtuple('FieldSpec', ['name', 'label', 'separator', 'missing'])
+
+FIELDS = (
+    FieldSpec('event_name', "Event Name", None, "Not found"),
+    FieldSpec('date', "Date", None, "Not found"),
+    FieldSpec('time', "Time", None, "Not found"),
+    FieldSpec('venue', "Venue", None, "Not found"),
+    FieldSpec('professions', "Profession/Target Audience", ", ", "Not specified"),
+    FieldSpec('event_type', "Event Type", None, "Not specified"),
+    FieldSpec('phones', "Contact Number", ", ", "Not found"),
+    FieldSpec('emails', "Email", ", ", "Not found"),
+    FieldSpec('social_media', "Social Media", ", ", "Not found"),
+    FieldSpec('prices', "Price", " | ", "Not found"),
+)
+
+# Output columns, in the order they are shown to the user
+FIELD_NAMES = [field.label for field in FIELDS]
+
+# Attribute and record key of every field, in the same order
+FIELD_KEYS = [field.name for field in FIELDS]
+
+MISSING_VALUES = ("Not found", "Not specified")
+
+_NAMES = tuple(FIELD_KEYS)
+_KEYS_BY_LABEL = {field.label: field.name for field in FIELDS}
+_MULTI = tuple(field.separator is not None for field in FIELDS)
+_EMPTY = (None,) * len(FIELDS)
+
+# Confidences are stored in steps of 1/254, with this byte meaning unknown
+_UNKNOWN_CONFIDENCE = 255
+_CONFIDENCE_VALUES = tuple(round(value / 254, 3) for value in range(255)) + (None,)
+
+# json.dumps with options builds a new encoder on every call
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+class PosterInfo:
+    """Fields extracted from one poster, with per-field confidence and source spans"""
+
+    __slots__ = _NAMES + ('_confidence', '_spans', 'truncated')
+
+    def __init__(self, event_name=None, date=None, time=None, venue=None, professions=(),
+                 event_type=None, phones=(), emails=(), social_media=(), prices=(),
+                 confidence=_EMPTY, spans=_EMPTY, truncated=False):
+        self.event_name = event_name
+        self.date = date
+        self.time = time
+        self.venue = venue
+        self.professions = tuple(professions or ())
+        self.event_type = event_type
+        self.phones = tuple(phones or ())
+        self.emails = tuple(emails or ())
+        self.social_media = tuple(social_media or ())
+        self.prices = tuple(prices or ())
+        # Both aligned with FIELDS
+        self._confidence = _pack_confidence(confidence)
+        self._spans = _pack_spans(spans)
+        # Some extractor ran out of time and returned what it had found
+        self.truncated = truncated
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name in _NAMES)
+        return f'PosterInfo({values})'
+
+    def __eq__(self, other):
+        if not isinstance(other, PosterInfo):
+            return NotImplemented
+        return self.to_state() == other.to_state()
+
+    @property
+    def confidence(self):
+        """OCR confidence (0..1, or None) of every field, in FIELDS order"""
+        return tuple(map(_CONFIDENCE_VALUES.__getitem__, self._confidence))
+
+    @property
+    def spans(self):
+        """Source span of every field, in FIELDS order.
+
+        ``(start, end)`` or None for single-valued fields; a tuple with one
+        span (or None) per item for multi-valued fields, None when empty.
+        """
+        spans = []
+        packed = iter(self._spans.tolist())
+        for multi in _MULTI:
+            items = []
+            for _ in range(next(packed)):
+                start, end = next(packed), next(packed)
+                items.append((start, end) if start >= 0 else None)
+            if multi:
+                spans.append(tuple(items) or None)
+            else:
+                spans.append(items[0] if items else None)
+        return tuple(spans)
+
+    def values(self):
+        """Field values in FIELDS order"""
+        return (self.event_name, self.date, self.time, self.venue, self.professions,
+                self.event_type, self.phones, self.emails, self.social_media, self.prices)
+
+    def to_row(self):
+        """Display values (joined, with placeholders) in FIELD_NAMES order"""
+        return tuple(
+            (field.separator.join(value) if field.separator is not None else value) or field.missing
+            for field, value in zip(FIELDS, self.values())
+        )
+
+    def to_dict(self, fields=None):
+        """The display form: ``{label: value}`` as shown to users and written to CSV.
+
+        ``fields`` (record keys, see field_keys) limits it to those fields.
+        """
+        if fields is None:
+            return dict(zip(FIELD_NAMES, self.to_row()))
+        return {label: value for label, name, value in zip(FIELD_NAMES, _NAMES, self.to_row())
+                if name in fields}
+
+    def confidence_dict(self, fields=None):
+        """``{label: confidence}``, to show next to the display form"""
+        return {label: confidence for label, name, confidence in zip(FIELD_NAMES, _NAMES, self.confidence)
+                if fields is None or name in fields}
+
+    def to_record(self, fields=None):
+        """JSON-ready dict with snake_case keys, list-valued fields, confidences and spans"""
+        record = {name: list(value) if multi else value
+                  for name, value, multi in zip(_NAMES, self.values(), _MULTI)
+                  if fields is None or name in fields}
+        record["confidence"] = {name: confidence for name, confidence in zip(_NAMES, self.confidence)
+                                if fields is None or name in fields}
+        record["spans"] = {name: span for name, span in zip(_NAMES, self.spans)
+                           if fields is None or name in fields}
+        return record
+
+    def to_json(self):
+        return _JSON_ENCODER.encode(self.to_record())
+
+    def to_state(self):
+        """Compact JSON-serializable list, the inverse of from_state"""
+        return [list(value) if multi else value
+                for value, multi in zip(self.values(), _MULTI)] + [list(self._confidence), self._spans.tolist()]
+
+    @classmethod
+    def from_state(cls, state):
+        *values, confidence, spans = state
+        info = cls(*values)
+        info._confidence = bytes(confidence)
+        info._spans = array('i', spans)
+        return info
+
+    @classmethod
+    def from_dict(cls, data):
+        """Parse the display form (e.g. results cached before records existed)"""
+        values = []
+        for field in FIELDS:
+            value = data.get(field.label)
+            if not value or value in MISSING_VALUES:
+                value = None
+            if field.separator is not None:
+                value = value.split(field.separator) if value else ()
+            values.append(value)
+        return cls(*values)
+
+    @classmethod
+    def merge(cls, records, offsets=None):
+        """One record for a multi-page document from its per-page records.
+
+        Single-valued fields take the value from the first page that has
+        one; multi-valued fields collect the distinct items of every page,
+        in page order. ``offsets`` gives where each page's text starts in
+        the joined text, so spans stay valid for it.
+        """
+        offsets = offsets or [0] * len(records)
+        values = []
+        confidence = []
+        spans = []
+        for index, multi in enumerate(_MULTI):
+            if not multi:
+                for record, offset in zip(records, offsets):
+                    value = record.values()[index]
+                    if value is not None:
+                        values.append(value)
+                        confidence.append(record.confidence[index])
+                        spans.append(_shift(record.spans[index], offset))
+                        break
+                else:
+                    values.append(None)
+                    confidence.append(None)
+                    spans.append(None)
+                continue
+
+            items = {}
+            scores = []
+            for record, offset in zip(records, offsets):
+                page_items = record.values()[index]
+                page_spans = record.spans[index] or (None,) * len(page_items)
+                for item, span in zip(page_items, page_spans):
+                    items.setdefault(item, _shift(span, offset))
+                if page_items and record.confidence[index] is not None:
+                    scores.append(record.confidence[index])
+            values.append(tuple(items))
+            confidence.append(sum(scores) / len(scores) if scores else None)
+            spans.append(tuple(items.values()) if items else None)
+        return cls(*values, confidence=confidence, spans=spans,
+                   truncated=any(record.truncated for record in records))
+
+
+def field_keys(fields):
+    """Record keys of fields given by record key ("venue") or display label ("Venue"), in FIELDS order"""
+    keys = set()
+    for field in fields:
+        key = _KEYS_BY_LABEL.get(field, field)
+        if key not in _NAMES:
+            raise ValueError(f"Unknown field: {field!r} (choose from {', '.join(_NAMES)})")
+        keys.add(key)
+    return tuple(name for name in _NAMES if name in keys)
+
+
+def _shift(span, offset):
+    if span is None or not offset:
+        return span
+    if isinstance(span[0], int):
+        return (span[0] + offset, span[1] + offset)
+    return tuple(_shift(item, offset) for item in span)
+
+
+def _pack_confidence(confidence):
+    return bytes(_UNKNOWN_CONFIDENCE if value is None else round(min(max(value, 0.0), 1.0) * 254)
+                 for value in confidence)
+
+
+def _pack_spans(spans):
+    """Flatten spans to [count, start, end, start, end, ...] per field; -1 marks a missing span"""
+    packed = array('i')
+    for span, multi in zip(spans, _MULTI):
+        if multi:
+            items = span or ()
+        else:
+            items = (span,) if span is not None else ()
+        packed.append(len(items))
+        for item in items:
+            packed.extend(item if item is not None else (-1, -1))
+    return packed
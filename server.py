@@ -0,0 +1,235 @@
+"""HTTP inference API with dynamic request batching.
+
+    python server.py --port 8000 --max-batch-size 8 --max-wait-ms 10
+    curl --data-binary @poster.png http://localhost:8000/extract
+
+``POST /extract`` takes the encoded image as the request body and returns
+``{"text": ..., "fields": {...}, "confidence": {...}}``, with the mean OCR
+confidence of every field (null where unknown). With
+``?fields=date,time,venue`` only those fields are extracted and returned.
+Concurrent requests are gathered into micro-batches: the batcher waits for
+one request, then up to ``max_wait_ms`` for more (or until
+``max_batch_size`` are waiting), and sends the whole batch through one
+DocTR predictor call. Field extraction
+then runs per request on a thread pool while the next batch is recognized.
+Batch sizes and the queue depth are exported with the stage timings at
+``GET /metrics``.
+
+``create_app`` returns the FastAPI application; tests and in-process callers
+can drive it without a socket through ``fastapi.testclient.TestClient``.
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+import metrics
+from app_advanced import EVENT_NAME_MODES, configure_ocr_cache, ocr_entries, parse_entry
+from pipeline import decode_source
+from records import field_keys
+
+
+class QueueFull(Exception):
+    """Raised when a request arrives while max_queue requests are already waiting"""
+
+
+class MicroBatcher:
+    """Gathers concurrent OCR requests into batches for one predictor call each"""
+
+    def __init__(self, max_batch_size=8, max_wait_ms=10, max_queue=64, use_cache=True):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self.use_cache = use_cache
+        self.queue = None
+        self.task = None
+        # The batch being collected or recognized, failed by stop() if it never finishes
+        self.batch = []
+        # A single thread owns the model, so batches never run concurrently
+        self.ocr_executor = ThreadPoolExecutor(1, thread_name_prefix='ocr')
+
+    async def start(self):
+        self.queue = asyncio.Queue(self.max_queue)
+        self.task = asyncio.create_task(self.worker())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        pending = list(self.batch)
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Server is shutting down"))
+        self.ocr_executor.shutdown(wait=False)
+
+    def record_queue_depth(self):
+        metrics.registry.set_gauge('poster_api_queue_depth', self.queue.qsize())
+
+    async def submit(self, page):
+        """Queue one decoded page and wait for its ``(key, entry)`` OCR result"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((page, future))
+        except asyncio.QueueFull:
+            raise QueueFull() from None
+        self.record_queue_depth()
+        return await future
+
+    async def collect(self):
+        """Wait for one request, then for more until the batch is full or the window closes"""
+        loop = asyncio.get_running_loop()
+        # Kept on self as it grows, so stop() can fail what was already taken
+        batch = self.batch = [await self.queue.get()]
+        closes = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = closes - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.collect()
+            self.record_queue_depth()
+            # Requests whose client has gone away are not recognized
+            batch = [(page, future) for page, future in batch if not future.done()]
+            if not batch:
+                continue
+            metrics.registry.observe_value('poster_api_batch_size', len(batch))
+
+            self.batch = batch
+            try:
+                keys, entries = await loop.run_in_executor(
+                    self.ocr_executor, ocr_entries, [page for page, _ in batch], self.use_cache)
+            except Exception as e:
+                self.batch = []
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batch = []
+            for (_, future), key, entry in zip(batch, keys, entries):
+                if not future.done():
+                    future.set_result((key, entry))
+
+
+def create_app(batcher=None):
+    """Build the API around a MicroBatcher (a default one if none is given)"""
+    if batcher is None:
+        batcher = MicroBatcher()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await batcher.start()
+        try:
+            yield
+        finally:
+            await batcher.stop()
+
+    app = FastAPI(title="Event Poster Extractor", lifespan=lifespan)
+    app.state.batcher = batcher
+
+    @app.post('/extract')
+    async def extract(request: Request, event_name_mode: str = 'text', fields: Optional[str] = None):
+        if event_name_mode not in EVENT_NAME_MODES:
+            raise HTTPException(422, f"event_name_mode must be one of {', '.join(EVENT_NAME_MODES)}")
+        keys = None
+        if fields:
+            try:
+                keys = field_keys(field.strip() for field in fields.split(','))
+            except ValueError as e:
+                raise HTTPException(422, str(e))
+        body = await request.body()
+        if not body:
+            raise HTTPException(400, "Send the poster image as the request body")
+
+        loop = asyncio.get_running_loop()
+        try:
+            page = await loop.run_in_executor(None, decode_source, body)
+        except Exception as e:
+            raise HTTPException(400, f"Error reading image: {str(e)}")
+        try:
+            key, entry = await batcher.submit(page)
+            text, info = await loop.run_in_executor(None, parse_entry, key, entry, event_name_mode, keys)
+        except QueueFull:
+            raise HTTPException(503, "Too many requests queued, retry later")
+        except Exception as e:
+            raise HTTPException(500, f"Error processing image: {str(e)}")
+        return {"text": text, "fields": info.to_dict(keys), "confidence": info.confidence_dict(keys)}
+
+    @app.get('/metrics')
+    async def metrics_endpoint():
+        return PlainTextResponse(metrics.render(), media_type='text/plain; version=0.0.4')
+
+    @app.get('/health')
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve poster extraction over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument(
+        '--max-batch-size', type=int, default=8,
+        help="Most requests recognized in one OCR forward pass (default: 8)"
+    )
+    parser.add_argument(
+        '--max-wait-ms', type=float, default=10,
+        help="How long a batch waits for more requests after the first (default: 10)"
+    )
+    parser.add_argument(
+        '--max-queue', type=int, default=64,
+        help="Requests allowed to wait for OCR before new ones get 503 (default: 64)"
+    )
+    parser.add_argument(
+        '--cache', dest='cache_path',
+        help="SQLite file for OCR results, shared with batch runs and the web app"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="Always run OCR, even for posters seen before"
+    )
+    args = parser.parse_args(argv)
+    if args.max_batch_size < 1 or args.max_queue < 1:
+        parser.error("--max-batch-size and --max-queue must be at least 1")
+    if args.max_wait_ms < 0:
+        parser.error("--max-wait-ms cannot be negative")
+    return args
+
+
+def main(argv=None):
+    import uvicorn
+
+    args = parse_args(argv)
+    if args.cache_path and not args.no_cache:
+        configure_ocr_cache(path=args.cache_path)
+    batcher = MicroBatcher(
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue=args.max_queue,
+        use_cache=not args.no_cache,
+    )
+    uvicorn.run(create_app(batcher), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
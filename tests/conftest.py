@@ -0,0 +1,103 @@
+"""Shared fixtures: a stub OCR predictor, a fresh, isolated OCR cache and
+an empty metrics registry.
+
+The stub stands in for DocTR's ``ocr_predictor``: a page is a small array
+filled with one number k, and reads as ``POSTER_TEXTS[k]``, laid out as
+DocTR would return it (blocks separated by blank lines, one OCR line per
+text line). Every call is recorded, so tests can count forward passes and
+batch sizes.
+"""
+import io
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+import app_advanced
+import metrics
+from ocr_cache import OcrCache
+
+Word = namedtuple('Word', ['value', 'confidence', 'geometry'])
+Line = namedtuple('Line', ['words', 'geometry'])
+Block = namedtuple('Block', ['lines'])
+Page = namedtuple('Page', ['blocks'])
+Result = namedtuple('Result', ['pages'])
+
+POSTER_TEXTS = [
+    "ANNUAL TECH SUMMIT\n\nDate: 18 January 2025\nVenue: Grand Hall, City Convention Center\n\n"
+    "Contact: +1 415 555 0134\nEmail: info@techsummit.org",
+    "JAZZ NIGHT\n\nSaturday May 20th 2025 at 8:00 PM\nVenue: Blue Note Club\n\nTickets: $25",
+    "Online Data Science Workshop\n\nJoin us on Zoom on March 3, 2025\nFor students and researchers\n\n"
+    "Free registration",
+]
+
+
+def make_page(number):
+    """A tiny page the stub predictor reads as POSTER_TEXTS[number]"""
+    return np.full((8, 8, 3), number, dtype=np.uint8)
+
+
+def make_tiff(numbers):
+    """Bytes of a multi-frame TIFF whose frames are make_page(n) for each n"""
+    from PIL import Image
+
+    frames = [Image.fromarray(make_page(number)) for number in numbers]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format='TIFF', save_all=True, append_images=frames[1:])
+    return buffer.getvalue()
+
+
+class StubPredictor:
+    """Deterministic stand-in for the DocTR predictor"""
+
+    def __init__(self, texts=POSTER_TEXTS):
+        self.texts = texts
+        self.batches = []
+
+    @property
+    def calls(self):
+        return len(self.batches)
+
+    def __call__(self, pages):
+        self.batches.append(len(pages))
+        return Result([self.read(page) for page in pages])
+
+    def read(self, page):
+        text = self.texts[int(page[0, 0, 0])]
+        blocks = []
+        top = 0.05
+        for block_text in text.split('\n\n'):
+            lines = []
+            for line in block_text.split('\n'):
+                # The first line of every poster is title-sized
+                height = 0.06 if top == 0.05 else 0.02
+                words = [Word(word, 0.95, ((0.1 + 0.08 * index, top), (0.17 + 0.08 * index, top + height)))
+                         for index, word in enumerate(line.split())]
+                lines.append(Line(words, ((0.1, top), (0.9, top + height))))
+                top += height + 0.01
+            blocks.append(Block(lines))
+        return Page(blocks)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """An empty in-memory OCR cache in place of the module one"""
+    cache = OcrCache(max_entries=16)
+    monkeypatch.setattr(app_advanced, 'ocr_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def predictor(monkeypatch, cache):
+    """The stub predictor, returned by app_advanced.get_model()"""
+    predictor = StubPredictor()
+    monkeypatch.setattr(app_advanced, '_model', predictor)
+    return predictor
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty metrics registry in place of the module one"""
+    registry = metrics.Registry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
@@ -0,0 +1,88 @@
+import pytest
+
+from batch_extract import collect_inputs, detect_format, output_columns, parse_args, result_to_row
+from pipeline import ExtractionPipeline, PipelineResult
+from tests.conftest import make_page
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return str(path)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A directory of posters with a nested folder and a few non-images"""
+    paths = {name: touch(tmp_path / name) for name in
+             ["b.png", "a.JPG", "notes.txt", "brochure.pdf", "nested/c.webp", "nested/deeper/d.tiff",
+              "nested/readme.md"]}
+    return tmp_path, paths
+
+
+def test_directories_are_scanned_flat_or_recursively(tree):
+    root, paths = tree
+    assert list(collect_inputs([str(root)])) == [paths["a.JPG"], paths["b.png"], paths["brochure.pdf"]]
+    assert list(collect_inputs([str(root)], recursive=True)) == [
+        paths["a.JPG"], paths["b.png"], paths["brochure.pdf"], paths["nested/c.webp"],
+        paths["nested/deeper/d.tiff"]]
+
+
+def test_globs_and_manifests(tree):
+    root, paths = tree
+    assert list(collect_inputs([str(root / "**" / "*")])) == sorted(
+        paths[name] for name in ["a.JPG", "b.png", "brochure.pdf", "nested/c.webp", "nested/deeper/d.tiff"])
+    manifest = root / "list.txt"
+    manifest.write_text(f"# posters\nb.png\n\n{paths['nested/c.webp']}\n")
+    assert list(collect_inputs([str(manifest), "single.gif"])) == [
+        paths["b.png"], paths["nested/c.webp"], "single.gif"]
+
+
+@pytest.mark.parametrize("output, requested, expected", [
+    (None, None, 'jsonl'),
+    ("out.CSV", None, 'csv'),
+    ("out.parquet", None, 'parquet'),
+    ("out.txt", None, 'jsonl'),
+    ("out.csv", 'jsonl', 'jsonl'),
+])
+def test_format_follows_the_output_suffix(output, requested, expected):
+    assert detect_format(output, requested) == expected
+
+
+def extract(sources):
+    pipeline = ExtractionPipeline(decode=make_page, use_cache=False)
+    return list(pipeline.run(sources))
+
+
+def test_rows_with_text_and_confidence(predictor):
+    result, = extract([1])
+    row = result_to_row(result)
+    assert row["File"] == 1
+    assert row["Venue"] == "Blue Note Club"
+    assert "Extracted Text" not in row and "Venue Confidence" not in row
+
+    row = result_to_row(result, include_text=True, confidence=True)
+    assert row["Extracted Text"] == result.text
+    assert row["Venue Confidence"] == pytest.approx(0.95, abs=0.01)
+    assert set(row) <= set(output_columns(include_text=True, confidence=True))
+
+    row = result_to_row(result, confidence=True, fields=('venue',))
+    assert set(row) == {"File", "Venue", "Venue Confidence"}
+
+
+def test_failed_posters_become_error_rows():
+    row = result_to_row(PipelineResult(0, "bad.png", "", None, "corrupt image"), include_text=True)
+    assert row == {"File": "bad.png", "Error": "corrupt image"}
+
+
+def test_fields_are_comma_separated_and_keep_the_inputs():
+    args = parse_args(['--fields', 'venue,Date', 'a.png', 'b.png'])
+    assert args.fields == ('date', 'venue')
+    assert args.inputs == ['a.png', 'b.png']
+    assert parse_args(['a.png']).fields is None
+
+
+@pytest.mark.parametrize("fields", ["date,bogus", ","])
+def test_unknown_or_missing_fields_are_rejected(fields):
+    with pytest.raises(SystemExit):
+        parse_args(['--fields', fields, 'a.png'])
@@ -0,0 +1,52 @@
+import numpy as np
+
+from app_advanced import OcrDocument, page_to_document
+from tests.conftest import POSTER_TEXTS, Block, Line, Page, StubPredictor, Word, make_page
+
+
+def test_flattened_text_layout():
+    page = StubPredictor().read(make_page(1))
+    document = page_to_document(page)
+
+    assert document.text == ("JAZZ NIGHT \n\nSaturday May 20th 2025 at 8:00 PM \n"
+                             "Venue: Blue Note Club \n\nTickets: $25 \n\n")
+    for offset, line in zip(document.line_offsets, document.lines):
+        assert document.text[offset:].startswith(line.text)
+    assert [line.block for line in document.lines] == [0, 1, 1, 2]
+
+
+def test_empty_lines_and_blocks():
+    word = Word("Hall", 0.5, ((0.1, 0.1), (0.2, 0.2)))
+    line = ((0.0, 0.1), (0.9, 0.2))
+    page = Page([Block([]), Block([Line([word], line), Line([], line)]), Block([]), Block([Line([word], line)])])
+    document = page_to_document(page)
+
+    assert document.text == "Hall \n\n\nHall \n\n"
+    assert document.line_offsets == [0, 6, 8]
+    assert document.line_confidences.tolist() == [0.5, 0.0, 0.5]
+    assert page_to_document(Page([])).text == ""
+
+
+def test_dict_round_trip():
+    for number in range(len(POSTER_TEXTS)):
+        document = page_to_document(StubPredictor().read(make_page(number)))
+        restored = OcrDocument.from_dict(document.to_dict())
+
+        assert restored.joined == document.joined
+        assert restored.lines == document.lines
+        assert np.array_equal(restored.word_boxes, document.word_boxes)
+        assert np.array_equal(restored.word_offsets, document.word_offsets)
+
+
+def test_masked_text_keeps_offsets():
+    line = ((0.0, 0.1), (0.9, 0.2))
+    words = [Word("Jazz", 0.9, line), Word("XQZV", 0.1, line), Word("Night", 0.9, line)]
+    document = page_to_document(Page([Block([Line(words, line)])]))
+    masked = document.masked_text(0.3)
+
+    assert masked == "Jazz      Night \n\n"
+    assert len(masked) == len(document.text)
+    for word, offset in zip(document.words, document.word_offsets.tolist()):
+        if word != "XQZV":
+            assert masked[offset:offset + len(word)] == word
+    assert document.masked_text(0.05) is document.text
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from documents import PageReader, document_kind
+from tests.conftest import make_page, make_tiff
+
+
+def test_document_kind():
+    assert document_kind(make_tiff([0])) == 'tiff'
+    assert document_kind(b'%PDF-1.7\n') == 'pdf'
+    assert document_kind('brochure.PDF') == 'pdf'
+    assert document_kind('scan.tif') == 'tiff'
+    assert document_kind('poster.png') is None
+    assert document_kind(b'\x89PNG\r\n\x1a\n') is None
+    assert document_kind(make_page(0)) is None
+
+
+def test_tiff_frames_are_read_in_order(tmp_path):
+    data = make_tiff([2, 0, 1])
+    path = tmp_path / 'scan.tiff'
+    path.write_bytes(data)
+
+    for source in (data, path):
+        with PageReader(source) as reader:
+            assert len(reader) == 3
+            pages = list(reader)
+        assert [page[0, 0, 0] for page in pages] == [2, 0, 1]
+        for page in pages:
+            assert page.shape == (8, 8, 3) and page.dtype == np.uint8
+    with PageReader(data) as reader:
+        assert np.array_equal(reader.render(2), make_page(1))
+
+
+def test_other_sources_are_not_documents():
+    with pytest.raises(ValueError):
+        PageReader('poster.png')
+    with pytest.raises(ValueError):
+        PageReader(make_page(0))
@@ -0,0 +1,100 @@
+import pytest
+
+from app_advanced import (
+    FIELD_DEPENDENCIES, VENUE_PATTERNS, analyze_text, calculate_text_prominence, extract_event_name,
+    extract_event_name_from_layout, extract_fields, extract_info, find_professions, iter_chunked,
+    page_to_document, resolve_fields,
+)
+from records import FIELD_KEYS, PosterInfo
+from tests.conftest import POSTER_TEXTS, Block, Line, Page, Word
+
+
+def noisy_document():
+    """A poster whose tall first line and a few words OCR was unsure about"""
+    def line(words, top, height=0.03):
+        return Line([Word(value, confidence, ((0.1 + 0.1 * index, top), (0.18 + 0.1 * index, top + height)))
+                     for index, (value, confidence) in enumerate(words)], ((0.1, top), (0.9, top + height)))
+
+    return page_to_document(Page([
+        Block([line([("XQZV", 0.1), ("LKRTW", 0.2)], 0.05, height=0.1)]),
+        Block([line([("Spring", 0.9), ("Music", 0.9), ("Festival", 0.9)], 0.2)]),
+        Block([line([("For", 0.9), ("doctors", 0.1)], 0.4), line([("Entry", 0.9), ("$", 0.1), ("10", 0.9)], 0.5)]),
+    ]))
+
+
+def test_all_fields_by_default():
+    assert resolve_fields() == tuple(FIELD_KEYS)
+
+
+def test_dependencies_are_added_in_field_order():
+    assert resolve_fields(["event_type", "date"]) == ("date", "venue", "event_type")
+    for key, dependencies in FIELD_DEPENDENCIES.items():
+        resolved = resolve_fields([key])
+        for dependency in dependencies:
+            assert resolved.index(dependency) < resolved.index(key)
+
+
+def test_labels_and_keys_are_both_accepted():
+    assert resolve_fields(["Contact Number", "emails", "emails"]) == ("phones", "emails")
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError, match="bogus"):
+        resolve_fields(["bogus"])
+
+
+@pytest.mark.parametrize("text", POSTER_TEXTS)
+def test_selected_fields_match_a_full_extraction(text):
+    full = extract_info(text)
+    for key in FIELD_KEYS:
+        partial = extract_info(text, fields=[key])
+        assert getattr(partial, key) == getattr(full, key)
+        for other in set(FIELD_KEYS) - set(resolve_fields([key])):
+            assert not getattr(partial, other)
+
+
+def test_extract_fields_only_returns_requested_fields():
+    result = extract_fields(POSTER_TEXTS[1], fields=["date", "Venue"])
+    assert result == {"Date": "Saturday May 20th", "Venue": "Blue Note Club"}
+
+
+def test_results_cut_short_by_the_budget_are_flagged(monkeypatch):
+    assert not extract_info(POSTER_TEXTS[0]).truncated
+    monkeypatch.setattr('app_advanced.EXTRACTOR_BUDGET_MS', 1e-6)
+    info = extract_info(POSTER_TEXTS[0])
+
+    assert info.truncated
+    assert PosterInfo.merge([info, PosterInfo()]).truncated
+    assert not PosterInfo.from_state(info.to_state()).truncated
+
+
+def test_chunked_search_finds_the_same_matches():
+    text = " | ".join(POSTER_TEXTS * 20).replace("\n", " | ")
+    for pattern, _ in VENUE_PATTERNS:
+        expected = [match.span() for match in pattern.finditer(text)]
+        assert [match.span() for match in iter_chunked(pattern, text, chunk_chars=100)] == expected
+
+
+def test_repeated_lines_are_scored_by_their_own_position():
+    lines = ["Jazz Night", "a", "b", "c", "d", "e", "Jazz Night"]
+    scores = calculate_text_prominence(lines, total_lines=30)
+    # Only the position bonus differs: top three lines vs. the top 30%
+    assert scores[0] - scores[-1] == 2
+
+
+def test_low_confidence_lines_are_not_event_name_candidates():
+    document = noisy_document()
+    analysis = analyze_text(document.text, document)
+
+    assert "XQZV LKRTW" not in analysis.confident_lines
+    assert extract_event_name(document.text, analysis) == "Spring Music Festival"
+    assert extract_event_name_from_layout(document, analyze_text(document.text, document)) == "Spring Music Festival"
+
+
+def test_low_confidence_words_add_no_keyword_hits():
+    document = noisy_document()
+    analysis = analyze_text(document.text, document)
+
+    assert find_professions(document.text) == ["Doctor"]
+    assert find_professions(document.text, analysis) == []
+    assert not analysis.keyword_hits.has('currency')
@@ -0,0 +1,14 @@
+import pytest
+
+from app_advanced import extract_info
+from tests.conftest import POSTER_TEXTS
+
+
+@pytest.mark.parametrize("fields", [None, ["event_type"]])
+def test_every_extractor_is_timed_once_per_poster(registry, fields):
+    for text in POSTER_TEXTS:
+        extract_info(text, fields=fields)
+
+    counts = {stage: stats["count"] for stage, stats in registry.snapshot().items()}
+    assert counts["extract_venue"] == len(POSTER_TEXTS)
+    assert set(counts.values()) == {len(POSTER_TEXTS)}
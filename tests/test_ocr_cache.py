@@ -0,0 +1,132 @@
+import numpy as np
+
+from app_advanced import extract_records, ocr_entries, parse_entry
+from ocr_cache import OcrCache, image_key
+from tests.conftest import make_page
+
+
+def test_miss_then_hit():
+    cache = OcrCache(max_entries=4)
+    assert cache.get("a") is None
+    cache.put("a", {"value": 1})
+
+    assert cache.get("a") == {"value": 1}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["memory_entries"]) == (1, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = OcrCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_zero_entries_disables_the_memory_tier():
+    cache = OcrCache(max_entries=0)
+    cache.put("a", 1)
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+def test_sqlite_round_trip(tmp_path):
+    path = str(tmp_path / "ocr.sqlite")
+    value = {"document": {"words": ["Café", "Hall"]}, "fields": {"layout": [None, [1, 2]]}}
+    writer = OcrCache(max_entries=4, path=path)
+    writer.put("key", value)
+    writer.close()
+
+    reader = OcrCache(max_entries=4, path=path)
+    assert reader.get("key") == value
+    assert reader.stats()["disk_hits"] == 1
+    # Now promoted to the memory tier
+    assert reader.get("key") == value
+    assert reader.stats()["memory_hits"] == 1
+    reader.close()
+
+
+def test_image_key_covers_shape_and_namespace():
+    page = make_page(1)
+    assert image_key(page) == image_key(page.copy())
+    assert image_key(page) != image_key(page.reshape(4, 16, 3))
+    assert image_key(page) != image_key(page, "other-model")
+    assert image_key(page) != image_key(make_page(2))
+    assert image_key(np.asfortranarray(page)) == image_key(page)
+
+
+def test_ocr_entries_reuse_cached_results(predictor, cache):
+    pages = [make_page(0), make_page(1), make_page(0)]
+    keys, entries = ocr_entries(pages)
+    # Identical pages in one batch are recognized once
+    assert predictor.batches == [2]
+    assert keys[0] == keys[2]
+    for key, entry in zip(keys, entries):
+        parse_entry(key, entry)
+
+    keys_again, entries_again = ocr_entries(pages)
+    assert predictor.batches == [2]
+    assert keys_again == keys
+    assert entries_again[0]["document"] == entries[0]["document"]
+    assert "text" in entries_again[0]["fields"]
+
+
+def test_ocr_entries_without_cache_always_run_the_model(predictor, cache):
+    ocr_entries([make_page(0)], use_cache=False)
+    ocr_entries([make_page(0)], use_cache=False)
+
+    assert predictor.batches == [1, 1]
+    assert len(cache) == 0
+
+
+def test_selective_extraction_keeps_the_ocr_result(predictor, cache):
+    first = extract_records([make_page(1)], fields=["date"])
+    second = extract_records([make_page(1)], fields=["venue"])
+
+    assert predictor.calls == 1
+    assert first[0][1].date == "Saturday May 20th"
+    assert second[0][1].venue == "Blue Note Club"
+    # The partial results were not cached, a full extraction fills them in
+    (_, entry), = cache.memory.items()
+    assert entry["fields"] == {}
+    _, info = extract_records([make_page(1)])[0]
+    assert predictor.calls == 1
+    assert info.date and info.venue and info.prices
+
+
+def test_selective_extraction_writes_the_ocr_result_to_sqlite(predictor, monkeypatch, tmp_path):
+    path = str(tmp_path / "ocr.sqlite")
+    monkeypatch.setattr('app_advanced.ocr_cache', OcrCache(max_entries=0, path=path))
+    extract_records([make_page(0)], fields=["event_name"])
+    extract_records([make_page(0)], fields=["event_name"])
+
+    assert predictor.calls == 1
+    assert OcrCache(path=path).stats()["disk_entries"] == 1
+
+
+def test_contains_does_not_count_a_lookup():
+    cache = OcrCache(max_entries=2)
+    cache.put("a", 1)
+
+    assert "a" in cache and "b" not in cache
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+def test_results_cut_short_by_the_budget_are_not_cached(predictor, cache, monkeypatch):
+    monkeypatch.setattr('app_advanced.EXTRACTOR_BUDGET_MS', 1e-6)
+    _, info = extract_records([make_page(2)])[0]
+    assert info.truncated
+    (_, entry), = cache.memory.items()
+    assert entry["fields"] == {}
+
+    monkeypatch.setattr('app_advanced.EXTRACTOR_BUDGET_MS', 50)
+    _, info = extract_records([make_page(2)])[0]
+    assert not info.truncated
+    assert predictor.calls == 1
+    (_, entry), = cache.memory.items()
+    assert "text" in entry["fields"]
@@ -0,0 +1,107 @@
+from itertools import product
+from types import SimpleNamespace
+
+import pytest
+
+import app_advanced
+from app_advanced import (
+    OCR_MODES, OCR_PROFILES, configure_ocr_model, configure_preprocessing, ocr_cache_namespace,
+    optimize_predictor, predictor_options,
+)
+
+
+@pytest.fixture(autouse=True)
+def model_settings(monkeypatch):
+    """Restore the module's OCR settings after every test"""
+    for name in ('_model', 'OCR_MODE', 'OCR_PROFILE', 'OCR_DET_BATCH_SIZE', 'OCR_RECO_BATCH_SIZE',
+                 'preprocessor'):
+        monkeypatch.setattr(app_advanced, name, getattr(app_advanced, name))
+    configure_ocr_model()
+    configure_preprocessing()
+
+
+def fake_predictor(torch):
+    """Stands in for ocr_predictor(): a detection and a recognition stage with a model each"""
+    def stage():
+        return SimpleNamespace(model=torch.nn.Sequential(torch.nn.Linear(4, 4)))
+    return SimpleNamespace(det_predictor=stage(), reco_predictor=stage())
+
+
+def test_eager_mode_keeps_the_predictor():
+    predictor = object()
+    assert optimize_predictor(predictor, 'eager') is predictor
+
+
+def test_int8_mode_quantizes_the_dense_layers():
+    torch = pytest.importorskip('torch')
+    predictor = optimize_predictor(fake_predictor(torch), 'int8')
+    for stage in (predictor.det_predictor, predictor.reco_predictor):
+        assert not isinstance(stage.model[0], torch.nn.Linear)
+        assert not stage.model.training
+
+
+def test_unknown_modes_are_rejected():
+    with pytest.raises(ValueError):
+        optimize_predictor(object(), 'fp16')
+    with pytest.raises(ValueError):
+        configure_ocr_model(mode='fp16')
+    assert app_advanced.OCR_MODE == 'eager'
+
+
+def test_every_mode_has_its_own_cache_namespace():
+    namespaces = set()
+    for mode in OCR_MODES:
+        configure_ocr_model(mode=mode)
+        namespaces.add(ocr_cache_namespace())
+    assert len(namespaces) == len(OCR_MODES)
+
+    configure_ocr_model()
+    assert ocr_cache_namespace() == app_advanced.OCR_CACHE_NAMESPACE
+
+
+def test_switching_modes_reloads_the_model():
+    app_advanced._model = object()
+    configure_ocr_model(mode='int8')
+    assert app_advanced._model is None
+
+
+@pytest.mark.parametrize("profile, expected", [
+    ('fast', {'det_arch': 'db_mobilenet_v3_large', 'reco_arch': 'crnn_mobilenet_v3_small'}),
+    ('balanced', {}),
+    ('accurate', {'det_arch': 'db_resnet50', 'reco_arch': 'parseq'}),
+])
+def test_profiles_pick_the_architectures(profile, expected):
+    assert predictor_options(profile) == expected
+
+
+def test_batch_sizes_are_passed_on():
+    assert predictor_options('fast', det_batch_size=4, reco_batch_size=256) == {
+        'det_arch': 'db_mobilenet_v3_large', 'reco_arch': 'crnn_mobilenet_v3_small',
+        'det_bs': 4, 'reco_bs': 256}
+    assert predictor_options('balanced', reco_batch_size=64) == {'reco_bs': 64}
+    # The profile table itself is left alone
+    assert OCR_PROFILES['balanced'] == {}
+
+
+def test_unknown_profiles_are_rejected():
+    with pytest.raises(ValueError):
+        predictor_options('tiny')
+    with pytest.raises(ValueError):
+        configure_ocr_model(profile='tiny')
+    assert app_advanced.OCR_PROFILE == 'balanced'
+
+
+def test_every_profile_mode_and_preprocessing_has_its_own_cache_namespace():
+    namespaces = set()
+    combinations = list(product(OCR_PROFILES, OCR_MODES, [{}, {'grayscale': True}, {'max_side': 1600}]))
+    for profile, mode, preprocessing in combinations:
+        configure_ocr_model(mode=mode, profile=profile)
+        configure_preprocessing(**preprocessing)
+        namespaces.add(ocr_cache_namespace())
+    assert len(namespaces) == len(combinations)
+
+
+def test_batch_sizes_share_the_cache_namespace():
+    namespace = ocr_cache_namespace()
+    configure_ocr_model(det_batch_size=2, reco_batch_size=512)
+    assert ocr_cache_namespace() == namespace
@@ -0,0 +1,47 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import app_advanced
+from parallel import THREAD_ENV_VARS, ParallelExtractor
+from tests.conftest import POSTER_TEXTS, StubPredictor, make_page
+
+
+def use_stub_predictor():
+    """Worker initializer: the stub predictor instead of loading DocTR"""
+    app_advanced._model = StubPredictor()
+
+
+def worker_environment():
+    return {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    for name in THREAD_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    extractor = ParallelExtractor(workers=2, batch_size=3, use_cache=False, torch_threads=1)
+    # Same pool, but workers get the stub predictor rather than torch and DocTR
+    extractor.executor.shutdown()
+    extractor.executor = ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context('spawn'), initializer=use_stub_predictor,
+    )
+    with extractor:
+        yield extractor
+
+
+def test_results_come_back_in_input_order(extractor):
+    sources = [index % len(POSTER_TEXTS) for index in range(17)]
+    results = list(extractor.run(make_page(number) for number in sources))
+
+    assert [result.index for result in results] == list(range(len(sources)))
+    for number, result in zip(sources, results):
+        assert result.error is None
+        assert result.text.split()[:2] == POSTER_TEXTS[number].split()[:2]
+    assert results[1].fields.venue == "Blue Note Club"
+
+
+def test_workers_inherit_the_thread_limits(extractor):
+    assert extractor.executor.submit(worker_environment).result() == dict.fromkeys(THREAD_ENV_VARS, "1")
@@ -0,0 +1,92 @@
+import pytest
+
+from pipeline import ExtractionPipeline
+from records import FIELD_KEYS
+from tests.conftest import POSTER_TEXTS, make_page, make_tiff
+
+
+def decode_number(source):
+    """Sources are poster numbers; negative ones cannot be decoded"""
+    if source < 0:
+        raise ValueError("corrupt image")
+    return make_page(source)
+
+
+def run(sources, **options):
+    options.setdefault('decode', decode_number)
+    return list(ExtractionPipeline(**options).run(sources))
+
+
+def test_results_come_back_in_input_order(predictor):
+    sources = [index % len(POSTER_TEXTS) for index in range(23)]
+    results = run(sources, batch_size=4, decode_workers=3, parse_workers=3, use_cache=False,
+                  event_name_mode='layout')
+
+    assert [result.index for result in results] == list(range(len(sources)))
+    assert [result.source for result in results] == sources
+    for result in results:
+        assert result.error is None
+        assert result.text.split()[:2] == POSTER_TEXTS[result.source].split()[:2]
+    assert results[1].fields.event_name == "JAZZ NIGHT"
+    assert results[1].fields.venue == "Blue Note Club"
+
+
+def test_pages_are_recognized_in_batches(predictor):
+    run([0, 1, 2] * 5, batch_size=4, use_cache=False)
+
+    assert sum(predictor.batches) == 15
+    assert max(predictor.batches) <= 4
+
+
+def test_decode_errors_only_fail_their_source(predictor):
+    results = run([0, -1, 2], use_cache=False)
+
+    assert results[0].error is None and results[2].error is None
+    assert results[1].fields is None
+    assert results[1].error == "Error reading image: corrupt image"
+
+
+def test_predictor_errors_fail_the_batch(predictor, monkeypatch):
+    def broken(pages):
+        raise RuntimeError("out of memory")
+    monkeypatch.setattr('app_advanced._model', broken)
+
+    results = run([0, 1], batch_size=2, use_cache=False)
+
+    assert [result.error for result in results] == ["Error processing image: out of memory"] * 2
+
+
+def test_cached_posters_skip_the_predictor(predictor):
+    first = run([0, 1])
+    calls = predictor.calls
+    second = run([1, 0])
+
+    assert predictor.calls == calls
+    assert [result.fields for result in second] == [first[1].fields, first[0].fields]
+
+
+def test_errors_reading_the_sources_reach_the_caller(predictor):
+    def sources():
+        yield 0
+        yield 1
+        raise FileNotFoundError("manifest.txt")
+
+    results = []
+    with pytest.raises(FileNotFoundError, match="manifest.txt"):
+        for result in ExtractionPipeline(decode=decode_number, use_cache=False).run(sources()):
+            results.append(result)
+    assert all(result.error is None for result in results)
+
+
+def test_document_pages_are_merged_into_one_result(predictor):
+    results = run([1, make_tiff([0, 1, 2]), 2], batch_size=2, use_cache=False)
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert sum(predictor.batches) == 5
+    document = results[1]
+    assert document.error is None
+    assert document.text.split()[:3] == ["ANNUAL", "TECH", "SUMMIT"]
+    assert "JAZZ NIGHT" in document.text and "Free registration" in document.text
+    assert document.fields.emails == ("info@techsummit.org",)
+    start, end = document.fields.spans[FIELD_KEYS.index('venue')]
+    assert document.text[start:end] == document.fields.venue
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from preprocess import PreprocessConfig, Preprocessor, deskew, estimate_skew
+
+
+def text_page(degrees=0.0):
+    """White page with rows of dark word-like boxes, rotated counterclockwise"""
+    image = Image.new('RGB', (600, 800), 'white')
+    draw = ImageDraw.Draw(image)
+    for row in range(15):
+        for column in range(6):
+            x, y = 40 + column * 90, 60 + row * 45
+            draw.rectangle([x, y, x + 60 + (row * column) % 15, y + 18], fill='black')
+    return np.asarray(image.rotate(degrees, resample=Image.BILINEAR, expand=True, fillcolor='white'))
+
+
+@pytest.mark.parametrize("degrees", [-6.0, -1.5, 0.0, 3.0, 8.0])
+def test_skew_is_estimated(degrees):
+    assert estimate_skew(text_page(degrees)) == pytest.approx(degrees, abs=0.25)
+
+
+def test_deskew_levels_the_lines():
+    page = deskew(text_page(4.0))
+    assert abs(estimate_skew(page)) < 0.25
+    # The corners the rotation adds take the background color
+    assert (page[0, 0] == 255).all()
+
+
+def test_level_and_blank_pages_are_left_alone():
+    page = text_page()
+    assert deskew(page) is page
+    blank = np.full((100, 100, 3), 255, dtype=np.uint8)
+    assert estimate_skew(blank) == 0.0
+
+
+def test_deskew_is_part_of_the_signature():
+    assert "deskew" in Preprocessor(PreprocessConfig(deskew=True)).signature()
+    assert Preprocessor(PreprocessConfig(deskew=True)).enabled
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from app_advanced import extract_info, merge_pages
+from records import FIELD_NAMES, PosterInfo, field_keys
+from tests.conftest import POSTER_TEXTS
+
+
+def sample_info():
+    return PosterInfo(
+        event_name="Jazz Night", date="May 20", venue="Blue Note Club",
+        phones=("4155550134", "4155550199"), prices=("$25", "Free"),
+        confidence=(0.9, 0.5, None, 1.0, None, None, 0.75, None, None, 0.2),
+        spans=((0, 10), (11, 17), None, (20, 34), None, None, ((40, 50), None), None, None,
+               ((60, 63), (64, 68))),
+    )
+
+
+def test_state_round_trip():
+    info = sample_info()
+    state = json.loads(json.dumps(info.to_state()))
+    restored = PosterInfo.from_state(state)
+
+    assert restored == info
+    assert restored.values() == info.values()
+    assert restored.spans == info.spans
+    assert restored.confidence == info.confidence
+
+
+def test_confidence_is_stored_to_the_nearest_step():
+    info = PosterInfo(confidence=(0.123456,) + (None,) * 9)
+    assert info.confidence[0] == pytest.approx(0.123456, abs=1 / 254)
+    assert info.confidence[1:] == (None,) * 9
+
+
+def test_display_form():
+    row = sample_info().to_dict()
+
+    assert list(row) == FIELD_NAMES
+    assert row["Contact Number"] == "4155550134, 4155550199"
+    assert row["Price"] == "$25 | Free"
+    assert row["Time"] == "Not found"
+    assert row["Event Type"] == "Not specified"
+    assert PosterInfo.from_dict(row).values() == sample_info().values()
+
+
+def test_record_form_limited_to_fields():
+    record = sample_info().to_record(field_keys(["Venue", "phones"]))
+
+    assert record == {
+        "venue": "Blue Note Club",
+        "phones": ["4155550134", "4155550199"],
+        "confidence": {"venue": 1.0, "phones": 0.748},  # 0.75 in steps of 1/254
+        "spans": {"venue": (20, 34), "phones": ((40, 50), None)},
+    }
+
+
+def test_merge_pages_keeps_first_single_values_and_all_distinct_items():
+    pages = [(text, extract_info(text)) for text in POSTER_TEXTS[:2]]
+    text, info = merge_pages(pages)
+
+    assert text == POSTER_TEXTS[0] + "\n" + POSTER_TEXTS[1]
+    assert info.event_name == pages[0][1].event_name
+    assert info.venue == pages[0][1].venue
+    assert info.prices == pages[1][1].prices
+    assert info.emails == pages[0][1].emails
+
+
+def test_merged_spans_point_into_the_joined_text():
+    pages = [(text, extract_info(text)) for text in POSTER_TEXTS[:2]]
+    text, info = merge_pages(pages)
+
+    # The price only appears on the second page
+    (start, end), = info.spans[-1]
+    assert start > len(POSTER_TEXTS[0])
+    assert text[start:end].lower() == info.prices[0].lower()
+    start, end = info.spans[3]
+    assert text[start:end] == info.venue
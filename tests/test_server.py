@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from server import MicroBatcher, create_app
+from tests.conftest import make_page
+
+
+@pytest.fixture
+def serve(predictor, registry, monkeypatch):
+    """Opens API clients whose request bodies are poster numbers instead of encoded images"""
+    monkeypatch.setattr(server, 'decode_source', lambda body: make_page(int(body)))
+    return lambda **options: TestClient(create_app(MicroBatcher(**options)))
+
+
+@pytest.fixture
+def client(serve):
+    with serve(max_wait_ms=0) as client:
+        yield client
+
+
+def test_extract(client):
+    response = client.post('/extract', content=b"1")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["text"].startswith("JAZZ NIGHT")
+    assert body["fields"]["Venue"] == "Blue Note Club"
+    assert body["confidence"]["Venue"] == pytest.approx(0.95, abs=0.01)
+
+
+def test_extract_selected_fields(client):
+    response = client.post('/extract', content=b"1", params={"fields": "date, Venue"})
+    assert response.status_code == 200
+    assert response.json()["fields"] == {"Date": "Saturday May 20th", "Venue": "Blue Note Club"}
+
+
+@pytest.mark.parametrize("params", [{"event_name_mode": "bogus"}, {"fields": "date,bogus"}])
+def test_bad_parameters_are_rejected(client, predictor, params):
+    response = client.post('/extract', content=b"1", params=params)
+    assert response.status_code == 422
+    assert predictor.calls == 0
+
+
+def test_empty_body_is_rejected(client):
+    assert client.post('/extract', content=b"").status_code == 400
+
+
+def test_concurrent_requests_share_a_batch(serve, predictor):
+    # A long window, so the requests wait for each other until the batch is full
+    with serve(max_batch_size=3, max_wait_ms=5000) as client, ThreadPoolExecutor(3) as pool:
+        responses = list(pool.map(lambda number: client.post('/extract', content=str(number).encode()),
+                                  [0, 1, 2]))
+
+    assert predictor.batches == [3]
+    assert [response.json()["text"].split()[0] for response in responses] == ["ANNUAL", "JAZZ", "Online"]
+
+
+def test_health(client):
+    assert client.get('/health').json() == {"status": "ok"}
+
+
+def test_metrics(client):
+    client.post('/extract', content=b"0")
+    text = client.get('/metrics').text
+
+    assert 'poster_api_batch_size_count 1' in text
+    assert 'stage="extract_venue"' in text
+
+
+def test_stop_fails_the_batch_in_flight(predictor, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(pages):
+        started.set()
+        release.wait(5)
+        return predictor(pages)
+    monkeypatch.setattr('app_advanced._model', blocking)
+
+    async def scenario():
+        batcher = MicroBatcher(max_wait_ms=0)
+        await batcher.start()
+        request = asyncio.ensure_future(batcher.submit(make_page(0)))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        await batcher.stop()
+        with pytest.raises(RuntimeError, match="shutting down"):
+            await asyncio.wait_for(request, 1)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+
+import writers
+from writers import CsvWriter, JsonlWriter, format_csv, open_writer
+
+COLUMNS = ['file', 'event_name', 'prices']
+
+
+def test_jsonl_writes_one_object_per_line():
+    stream = io.StringIO()
+    with JsonlWriter(stream) as writer:
+        writer.write({'file': 'a.png', 'event_name': 'Café Nights'})
+        writer.write({'file': 'b.png', 'prices': 25})
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'file': 'a.png', 'event_name': 'Café Nights'}, {'file': 'b.png', 'prices': 25}]
+    assert 'Café' in lines[0]
+    assert writer.rows == 2
+
+
+def test_csv_quotes_values_and_leaves_missing_columns_empty():
+    stream = io.StringIO()
+    writer = CsvWriter(stream, COLUMNS, lineterminator="\n")
+    writer.write({'file': 'a.png', 'event_name': 'Jazz, "Live"\nNight'})
+    writer.write({'file': 'b.png', 'prices': '$25'})
+
+    assert stream.getvalue() == ('file,event_name,prices\n'
+                                 'a.png,"Jazz, ""Live""\nNight",\n'
+                                 'b.png,,$25\n')
+
+
+def test_format_csv_renders_the_header_without_rows():
+    assert format_csv([], COLUMNS) == "file,event_name,prices\n"
+    assert format_csv([{'file': 'a.png'}], COLUMNS) == "file,event_name,prices\na.png,,\n"
+
+
+def test_sync_every_fsyncs_once_per_batch(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(writers.os, 'fsync', synced.append)
+    with open_writer(tmp_path / 'out.jsonl', 'jsonl', COLUMNS, sync_every=3) as writer:
+        for number in range(7):
+            writer.write({'file': f'{number}.png'})
+        assert len(synced) == 2
+
+    # close() syncs the last, partial batch
+    assert len(synced) == 3
+    assert len((tmp_path / 'out.jsonl').read_text().splitlines()) == 7
+
+
+def test_unknown_formats_are_rejected():
+    with pytest.raises(ValueError):
+        open_writer(None, 'xml', COLUMNS)
+    with pytest.raises(ValueError):
+        open_writer(None, 'parquet', COLUMNS)
+
+
+def test_parquet_sync_writes_the_buffered_row_group(tmp_path, monkeypatch):
+    pq = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(writers.os, 'fsync', lambda fd: None)
+    path = tmp_path / 'out.parquet'
+    with open_writer(path, 'parquet', COLUMNS, sync_every=2) as writer:
+        for number in range(5):
+            writer.write({'file': f'{number}.png', 'prices': number})
+        assert writer.buffered == 1
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column('file').to_pylist() == [f'{number}.png' for number in range(5)]
+    assert table.column('prices').to_pylist() == [str(number) for number in range(5)]
+    assert table.column('event_name').to_pylist() == [None] * 5
@@ -0,0 +1,163 @@
+"""Streaming row writers for extraction results.
+
+Rows (one dict per poster) are appended to a JSONL, CSV or Parquet sink as
+they arrive, so a bulk run can export any number of posters without holding
+them in memory. JSONL and CSV rows go straight to the stream; Parquet rows
+are buffered per row group and written with pyarrow, which is only needed
+(and only imported) for Parquet output.
+
+With ``sync_every`` set, every that many rows the sink is flushed and
+fsynced (for Parquet, after writing the rows so far as a row group), so a
+crash loses at most one batch of finished rows without paying an fsync per
+row.
+"""
+import csv
+import io
+import json
+import os
+
+FORMATS = ('jsonl', 'csv', 'parquet')
+
+
+class RowWriter:
+    """Base class for streaming sinks: counts rows and syncs in batches"""
+
+    def __init__(self, stream, sync_every=0, close_stream=False):
+        self.stream = stream
+        self.sync_every = sync_every
+        self.close_stream = close_stream
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, row):
+        self.write_row(row)
+        self.rows += 1
+        if self.sync_every and self.rows % self.sync_every == 0:
+            self.sync()
+
+    def write_row(self, row):
+        raise NotImplementedError
+
+    def flush(self):
+        self.stream.flush()
+
+    def sync(self):
+        """Flush and, if the sink is a real file, fsync it"""
+        self.flush()
+        try:
+            os.fsync(self.stream.fileno())
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # Pipes, terminals and in-memory buffers have nothing to sync
+            pass
+
+    def close(self):
+        if self.sync_every:
+            self.sync()
+        else:
+            self.flush()
+        if self.close_stream:
+            self.stream.close()
+
+
+class JsonlWriter(RowWriter):
+    """Write one JSON object per line"""
+
+    def write_row(self, row):
+        self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+class CsvWriter(RowWriter):
+    """Write rows as CSV with a fixed header; missing columns are left empty"""
+
+    def __init__(self, stream, columns, sync_every=0, close_stream=False, **csv_options):
+        super().__init__(stream, sync_every, close_stream)
+        self.writer = csv.DictWriter(stream, fieldnames=columns, restval="", **csv_options)
+        self.writer.writeheader()
+
+    def write_row(self, row):
+        self.writer.writerow(row)
+
+
+class ParquetWriter(RowWriter):
+    """Write rows to a Parquet file, one row group per row_group_size rows.
+
+    Every column is stored as a nullable string (numbers are written with
+    str). Only the current row group is held in memory.
+    """
+
+    def __init__(self, stream, columns, sync_every=0, close_stream=False, row_group_size=10000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from None
+        super().__init__(stream, sync_every, close_stream)
+        self.pa = pa
+        self.columns = list(columns)
+        self.row_group_size = row_group_size
+        self.schema = pa.schema([(column, pa.string()) for column in self.columns])
+        self.writer = pq.ParquetWriter(stream, self.schema)
+        self.buffer = {column: [] for column in self.columns}
+        self.buffered = 0
+
+    def write_row(self, row):
+        for column in self.columns:
+            value = row.get(column)
+            self.buffer[column].append(value if value is None or isinstance(value, str) else str(value))
+        self.buffered += 1
+        if self.buffered >= self.row_group_size:
+            self.write_row_group()
+
+    def write_row_group(self):
+        if not self.buffered:
+            return
+        table = self.pa.Table.from_pydict(self.buffer, schema=self.schema)
+        self.writer.write_table(table)
+        self.buffer = {column: [] for column in self.columns}
+        self.buffered = 0
+
+    def flush(self):
+        # Rows reach the file a row group at a time; a partial group would
+        # end up as a tiny row group, so it waits for sync() or close()
+        self.stream.flush()
+
+    def sync(self):
+        """Write the buffered rows as a row group, then flush and fsync"""
+        self.write_row_group()
+        super().sync()
+
+    def close(self):
+        self.write_row_group()
+        self.writer.close()
+        super().close()
+
+
+def open_writer(path, output_format, columns, sync_every=0, stream=None):
+    """Create the writer for output_format, writing to path (or stream)"""
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}")
+    if output_format == 'parquet':
+        if path is None:
+            raise ValueError("Parquet output needs an output file")
+        return ParquetWriter(open(path, 'wb'), columns, sync_every, close_stream=True)
+
+    close_stream = path is not None
+    if close_stream:
+        stream = open(path, 'w', encoding='utf-8', newline='')
+    if output_format == 'csv':
+        return CsvWriter(stream, columns, sync_every, close_stream)
+    return JsonlWriter(stream, sync_every, close_stream)
+
+
+def format_csv(rows, columns):
+    """Render a few rows as a CSV string (header included)"""
+    buffer = io.StringIO()
+    writer = CsvWriter(buffer, columns, lineterminator="\n")
+    for row in rows:
+        writer.write(row)
+    return buffer.getvalue()